@@ -0,0 +1,70 @@
+import asyncio
+from logging.config import fileConfig
+
+from sqlalchemy import pool
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from alembic import context
+
+from app.database import Base, SQLALCHEMY_DATABASE_URL, SCHEMA_VERSION, connect_args
+# Import models to register them with SQLAlchemy
+from app.models import user, volunteer_task, applications, skill, password_reset, platform_counter  # noqa: F401
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+# The app checks this constant on startup (SCHEMA_STARTUP_MODE=check)
+head = context.script.get_current_head()
+if head != SCHEMA_VERSION:
+    raise RuntimeError(
+        f"app.database.SCHEMA_VERSION is {SCHEMA_VERSION!r} but the newest migration is {head!r}; "
+        "update SCHEMA_VERSION together with the migration."
+    )
+
+
+def run_migrations_offline() -> None:
+    """Emit the migration SQL to stdout instead of running it"""
+    context.configure(
+        url=SQLALCHEMY_DATABASE_URL,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def do_run_migrations(connection: Connection) -> None:
+    context.configure(connection=connection, target_metadata=target_metadata)
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def run_async_migrations() -> None:
+    connectable = create_async_engine(
+        SQLALCHEMY_DATABASE_URL,
+        poolclass=pool.NullPool,
+        connect_args=connect_args,
+    )
+
+    async with connectable.connect() as connection:
+        await connection.run_sync(do_run_migrations)
+
+    await connectable.dispose()
+
+
+def run_migrations_online() -> None:
+    asyncio.run(run_async_migrations())
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,117 @@
+"""Initial schema (tables as created by Base.metadata.create_all)
+
+Existing databases that were bootstrapped by create_all already have
+these tables; mark them with `alembic stamp 0001_initial_schema`
+instead of running this revision.
+
+Revision ID: 0001_initial_schema
+Revises:
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001_initial_schema'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+roles = postgresql.ENUM('volunteer', 'ngo', 'admin', name='roles', create_type=False)
+application_status = postgresql.ENUM('pending', 'accepted', 'rejected', name='application_status', create_type=False)
+otptype = postgresql.ENUM('signup', 'password_reset', name='otptype', create_type=False)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    roles.create(bind, checkfirst=True)
+    application_status.create(bind, checkfirst=True)
+    otptype.create(bind, checkfirst=True)
+
+    op.create_table(
+        'users',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('full_name', sa.String(), nullable=False),
+        sa.Column('email', sa.String(), nullable=False),
+        sa.Column('password_hash', sa.String(), nullable=False),
+        sa.Column('role', roles, nullable=False),
+        sa.Column('location', sa.String(), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index('ix_users_email', 'users', ['email'], unique=True)
+
+    op.create_table(
+        'skills',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('name', sa.String(), nullable=False, unique=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+    )
+
+    op.create_table(
+        'volunteer_skills',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('skill_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+    )
+
+    op.create_table(
+        'volunteer_tasks',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('title', sa.String(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=False),
+        sa.Column('location', sa.String(), nullable=True),
+        sa.Column('skills_required', postgresql.ARRAY(sa.String()), nullable=True),
+        sa.Column('posted_by_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('users.id'), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index('ix_volunteer_tasks_id', 'volunteer_tasks', ['id'])
+
+    op.create_table(
+        'applications',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('task_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('volunteer_tasks.id'), nullable=False),
+        sa.Column('volunteer_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('users.id'), nullable=False),
+        sa.Column('status', application_status, nullable=True),
+        sa.Column('applied_at', sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index('ix_applications_id', 'applications', ['id'])
+
+    op.create_table(
+        'password_reset_otps',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('email', sa.String(), nullable=False),
+        sa.Column('otp_code', sa.String(6), nullable=False),
+        sa.Column('otp_type', otptype, nullable=False),
+        sa.Column('is_used', sa.Boolean(), nullable=True),
+        sa.Column('is_verified', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('used_at', sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index('ix_password_reset_otps_email', 'password_reset_otps', ['email'])
+    op.create_index('ix_password_reset_otps_id', 'password_reset_otps', ['id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('password_reset_otps')
+    op.drop_table('applications')
+    op.drop_table('volunteer_tasks')
+    op.drop_table('volunteer_skills')
+    op.drop_table('skills')
+    op.drop_table('users')
+    bind = op.get_bind()
+    otptype.drop(bind, checkfirst=True)
+    application_status.drop(bind, checkfirst=True)
+    roles.drop(bind, checkfirst=True)
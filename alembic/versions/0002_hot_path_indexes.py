@@ -0,0 +1,108 @@
+"""Hot-path indexes and constraints for the listing endpoints
+
+- applications: unique (task_id, volunteer_id), plus indexes for the
+  volunteer, per-task status and admin listings
+- volunteer_skills: foreign keys, unique (user_id, skill_id), skill_id index
+- volunteer_tasks: posted_by_id, (is_active, created_at) and a partial
+  index on (created_at, id) WHERE is_active for the public feed
+- users: created_at for the admin user listing
+
+Duplicate applications and orphaned/duplicate volunteer_skills rows are
+removed first so the new constraints can be created.
+
+Revision ID: 0002_hot_path_indexes
+Revises: 0001_initial_schema
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002_hot_path_indexes'
+down_revision: Union[str, Sequence[str], None] = '0001_initial_schema'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keep the earliest application per (task, volunteer)
+    op.execute("""
+        DELETE FROM applications
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT id, row_number() OVER (
+                    PARTITION BY task_id, volunteer_id
+                    ORDER BY applied_at NULLS LAST, id
+                ) AS rn
+                FROM applications
+            ) ranked
+            WHERE rn > 1
+        )
+    """)
+    op.create_unique_constraint('uq_applications_task_volunteer', 'applications', ['task_id', 'volunteer_id'])
+    op.create_index('ix_applications_volunteer_id_applied_at', 'applications', ['volunteer_id', 'applied_at'])
+    op.create_index('ix_applications_task_id_status', 'applications', ['task_id', 'status'])
+    op.create_index('ix_applications_applied_at', 'applications', ['applied_at'])
+
+    # volunteer_skills had no foreign keys, so orphans and duplicates may exist
+    op.execute("""
+        DELETE FROM volunteer_skills vs
+        WHERE NOT EXISTS (SELECT 1 FROM users u WHERE u.id = vs.user_id)
+           OR NOT EXISTS (SELECT 1 FROM skills s WHERE s.id = vs.skill_id)
+    """)
+    op.execute("""
+        DELETE FROM volunteer_skills
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT id, row_number() OVER (
+                    PARTITION BY user_id, skill_id
+                    ORDER BY created_at NULLS LAST, id
+                ) AS rn
+                FROM volunteer_skills
+            ) ranked
+            WHERE rn > 1
+        )
+    """)
+    op.create_foreign_key(
+        'volunteer_skills_user_id_fkey', 'volunteer_skills', 'users',
+        ['user_id'], ['id'], ondelete='CASCADE'
+    )
+    op.create_foreign_key(
+        'volunteer_skills_skill_id_fkey', 'volunteer_skills', 'skills',
+        ['skill_id'], ['id'], ondelete='CASCADE'
+    )
+    op.create_unique_constraint('uq_volunteer_skills_user_skill', 'volunteer_skills', ['user_id', 'skill_id'])
+    op.create_index('ix_volunteer_skills_skill_id', 'volunteer_skills', ['skill_id'])
+
+    op.create_index('ix_volunteer_tasks_posted_by_id_created_at', 'volunteer_tasks', ['posted_by_id', 'created_at'])
+    op.create_index('ix_volunteer_tasks_is_active_created_at', 'volunteer_tasks', ['is_active', 'created_at'])
+    op.create_index(
+        'ix_volunteer_tasks_active_feed', 'volunteer_tasks', ['created_at', 'id'],
+        postgresql_where=sa.text('is_active')
+    )
+
+    op.create_index('ix_users_created_at', 'users', ['created_at'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_users_created_at', table_name='users')
+
+    op.drop_index('ix_volunteer_tasks_active_feed', table_name='volunteer_tasks')
+    op.drop_index('ix_volunteer_tasks_is_active_created_at', table_name='volunteer_tasks')
+    op.drop_index('ix_volunteer_tasks_posted_by_id_created_at', table_name='volunteer_tasks')
+
+    op.drop_index('ix_volunteer_skills_skill_id', table_name='volunteer_skills')
+    op.drop_constraint('uq_volunteer_skills_user_skill', 'volunteer_skills', type_='unique')
+    op.drop_constraint('volunteer_skills_skill_id_fkey', 'volunteer_skills', type_='foreignkey')
+    op.drop_constraint('volunteer_skills_user_id_fkey', 'volunteer_skills', type_='foreignkey')
+
+    op.drop_index('ix_applications_applied_at', table_name='applications')
+    op.drop_index('ix_applications_task_id_status', table_name='applications')
+    op.drop_index('ix_applications_volunteer_id_applied_at', table_name='applications')
+    op.drop_constraint('uq_applications_task_volunteer', 'applications', type_='unique')
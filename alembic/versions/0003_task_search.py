@@ -0,0 +1,51 @@
+"""Full-text search over volunteer tasks
+
+Adds a stored generated tsvector column over title (weight A),
+description (B) and skills_required (C) with a GIN index.
+array_to_string is only STABLE, so an IMMUTABLE wrapper is needed
+for the generated column expression.
+
+Revision ID: 0003_task_search
+Revises: 0002_hot_path_indexes
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003_task_search'
+down_revision: Union[str, Sequence[str], None] = '0002_hot_path_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("""
+        CREATE OR REPLACE FUNCTION dovol_skills_text(skills text[]) RETURNS text
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE
+        AS $$ SELECT coalesce(array_to_string(skills, ' '), '') $$
+    """)
+    op.execute("""
+        ALTER TABLE volunteer_tasks ADD COLUMN search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(description, '')), 'B') ||
+            setweight(to_tsvector('english', dovol_skills_text(skills_required)), 'C')
+        ) STORED
+    """)
+    op.create_index(
+        'ix_volunteer_tasks_search_vector', 'volunteer_tasks', ['search_vector'],
+        postgresql_using='gin'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_volunteer_tasks_search_vector', table_name='volunteer_tasks')
+    op.drop_column('volunteer_tasks', 'search_vector')
+    op.execute("DROP FUNCTION IF EXISTS dovol_skills_text(text[])")
@@ -0,0 +1,73 @@
+"""Indexed skill filtering over volunteer_tasks.skills_required
+
+Registers task skills missing from the skills catalog, rewrites existing
+skills_required entries to the catalog spelling (matching
+case-insensitively, with spaces, '-' and '_' treated alike, duplicates
+dropped) and adds a GIN index on the array for the && / @> filters
+used by GET /tasks?skills=.
+
+Revision ID: 0004_task_skill_filter
+Revises: 0003_task_search
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004_task_skill_filter'
+down_revision: Union[str, Sequence[str], None] = '0003_task_search'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(r"""
+        INSERT INTO skills (id, name, created_at)
+        SELECT gen_random_uuid(), min(trim(regexp_replace(u.skill, '\s+', ' ', 'g'))), now()
+        FROM volunteer_tasks t
+        CROSS JOIN LATERAL unnest(t.skills_required) AS u(skill)
+        WHERE NOT EXISTS (
+            SELECT 1 FROM skills
+            WHERE lower(trim(regexp_replace(name, '[\s_-]+', ' ', 'g')))
+                = lower(trim(regexp_replace(u.skill, '[\s_-]+', ' ', 'g')))
+        )
+        AND trim(u.skill) <> ''
+        GROUP BY lower(trim(regexp_replace(u.skill, '[\s_-]+', ' ', 'g')))
+        ON CONFLICT (name) DO NOTHING
+    """)
+    op.execute(r"""
+        UPDATE volunteer_tasks t
+        SET skills_required = normalized.skills
+        FROM (
+            SELECT id, array_agg(name ORDER BY first_ord) AS skills
+            FROM (
+                SELECT t2.id, s.name, min(u.ord) AS first_ord
+                FROM volunteer_tasks t2
+                CROSS JOIN LATERAL unnest(t2.skills_required) WITH ORDINALITY AS u(skill, ord)
+                CROSS JOIN LATERAL (
+                    SELECT name FROM skills
+                    WHERE lower(trim(regexp_replace(name, '[\s_-]+', ' ', 'g')))
+                        = lower(trim(regexp_replace(u.skill, '[\s_-]+', ' ', 'g')))
+                    ORDER BY name
+                    LIMIT 1
+                ) s
+                GROUP BY t2.id, s.name
+            ) matched
+            GROUP BY id
+        ) normalized
+        WHERE t.id = normalized.id AND t.skills_required IS DISTINCT FROM normalized.skills
+    """)
+    op.create_index(
+        'ix_volunteer_tasks_skills_required', 'volunteer_tasks', ['skills_required'],
+        postgresql_using='gin', postgresql_where=sa.text('is_active')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_volunteer_tasks_skills_required', table_name='volunteer_tasks')
@@ -0,0 +1,35 @@
+"""Row version for volunteer tasks
+
+Adds volunteer_tasks.version, incremented by the ORM on every update
+(mapper version_id_col). It is the basis of the strong ETags served by
+GET /tasks and GET /tasks/{task_id}.
+
+Revision ID: 0005_task_version
+Revises: 0004_task_skill_filter
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005_task_version'
+down_revision: Union[str, Sequence[str], None] = '0004_task_skill_filter'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'volunteer_tasks',
+        sa.Column('version', sa.Integer(), nullable=False, server_default=sa.text('1'))
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('volunteer_tasks', 'version')
@@ -0,0 +1,33 @@
+"""Keyset index for the per-task applicant listing
+
+GET /applications/task/{task_id} pages applicants newest first on
+(applied_at, id) within a task.
+
+Revision ID: 0006_applicant_listing
+Revises: 0005_task_version
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006_applicant_listing'
+down_revision: Union[str, Sequence[str], None] = '0005_task_version'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_applications_task_id_applied_at', 'applications', ['task_id', 'applied_at', 'id']
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_applications_task_id_applied_at', table_name='applications')
@@ -0,0 +1,59 @@
+"""Task capacity and accepted-volunteer counter
+
+Adds volunteer_tasks.max_volunteers (optional) and accepted_count, kept in
+step with accepted applications by the status change statement in
+app/services/task_capacity.py. CHECK constraints keep the counter within
+the capacity. Existing tasks are backfilled from their accepted applications.
+
+Revision ID: 0007_task_capacity
+Revises: 0006_applicant_listing
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007_task_capacity'
+down_revision: Union[str, Sequence[str], None] = '0006_applicant_listing'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('volunteer_tasks', sa.Column('max_volunteers', sa.Integer(), nullable=True))
+    op.add_column(
+        'volunteer_tasks',
+        sa.Column('accepted_count', sa.Integer(), nullable=False, server_default=sa.text('0'))
+    )
+    op.execute("""
+        UPDATE volunteer_tasks t
+        SET accepted_count = a.accepted
+        FROM (
+            SELECT task_id, count(*) AS accepted
+            FROM applications
+            WHERE status = 'accepted'
+            GROUP BY task_id
+        ) a
+        WHERE a.task_id = t.id
+    """)
+    op.create_check_constraint(
+        'ck_volunteer_tasks_accepted_count',
+        'volunteer_tasks',
+        'accepted_count >= 0 AND (max_volunteers IS NULL OR accepted_count <= max_volunteers)',
+    )
+    op.create_check_constraint(
+        'ck_volunteer_tasks_max_volunteers', 'volunteer_tasks', 'max_volunteers IS NULL OR max_volunteers > 0'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('ck_volunteer_tasks_max_volunteers', 'volunteer_tasks', type_='check')
+    op.drop_constraint('ck_volunteer_tasks_accepted_count', 'volunteer_tasks', type_='check')
+    op.drop_column('volunteer_tasks', 'accepted_count')
+    op.drop_column('volunteer_tasks', 'max_volunteers')
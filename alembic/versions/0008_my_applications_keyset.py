@@ -0,0 +1,38 @@
+"""Keyset index for the volunteer's own application listing
+
+GET /applications/me pages a volunteer's applications newest first on
+(applied_at, id); the id column is added to
+ix_applications_volunteer_id_applied_at so the index covers the tie-break.
+
+Revision ID: 0008_my_applications_keyset
+Revises: 0007_task_capacity
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008_my_applications_keyset'
+down_revision: Union[str, Sequence[str], None] = '0007_task_capacity'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_index('ix_applications_volunteer_id_applied_at', table_name='applications')
+    op.create_index(
+        'ix_applications_volunteer_id_applied_at', 'applications', ['volunteer_id', 'applied_at', 'id']
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_applications_volunteer_id_applied_at', table_name='applications')
+    op.create_index(
+        'ix_applications_volunteer_id_applied_at', 'applications', ['volunteer_id', 'applied_at']
+    )
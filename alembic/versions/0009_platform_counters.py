@@ -0,0 +1,96 @@
+"""Incrementally maintained platform counters
+
+Adds platform_counters (name, shard, value): the dashboard totals - users
+per role, tasks and active tasks, applications per status - spread over 16
+shard rows per name. Statement-level triggers on users, volunteer_tasks and
+applications add every write's net change to the transaction's shard, in
+the same transaction, so GET /admin/dashboard/stats and /admin/system/health
+read a fixed number of rows instead of counting the tables. The counters
+are backfilled into shard 0 after the triggers exist (creating a trigger
+blocks writes to its table until this migration commits).
+
+Revision ID: 0009_platform_counters
+Revises: 0008_my_applications_keyset
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009_platform_counters'
+down_revision: Union[str, Sequence[str], None] = '0008_my_applications_keyset'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COUNTED_TABLES = {
+    "users": "ARRAY['total_users', 'total_' || r.role || 's']",
+    "volunteer_tasks": "array_remove(ARRAY['total_tasks', CASE WHEN r.is_active THEN 'active_tasks' END], NULL)",
+    "applications": "array_remove(ARRAY['total_applications', r.status || '_applications'], NULL)",
+}
+TRANSITIONS = {
+    "insert": "NEW TABLE AS new_rows",
+    "update": "OLD TABLE AS old_rows NEW TABLE AS new_rows",
+    "delete": "OLD TABLE AS old_rows",
+}
+COUNTER_UPSERT = """
+        INSERT INTO platform_counters AS c (name, shard, value)
+        SELECT name, txid_current() % 16, sum(delta)
+        FROM ({changes}) AS changes, unnest(names) AS name
+        GROUP BY name HAVING sum(delta) <> 0
+        ORDER BY name
+        ON CONFLICT (name, shard) DO UPDATE SET value = c.value + excluded.value;"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'platform_counters',
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('shard', sa.SmallInteger(), nullable=False),
+        sa.Column('value', sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint('name', 'shard'),
+    )
+    for table, names in COUNTED_TABLES.items():
+        inserted = f"SELECT {names} AS names, 1 AS delta FROM new_rows r"
+        deleted = f"SELECT {names} AS names, -1 AS delta FROM old_rows r"
+        op.execute(f"""
+            CREATE OR REPLACE FUNCTION dovol_count_{table}() RETURNS trigger
+            LANGUAGE plpgsql AS $$
+            BEGIN
+                IF TG_OP = 'INSERT' THEN{COUNTER_UPSERT.format(changes=inserted)}
+                ELSIF TG_OP = 'DELETE' THEN{COUNTER_UPSERT.format(changes=deleted)}
+                ELSE{COUNTER_UPSERT.format(changes=f"{inserted} UNION ALL {deleted}")}
+                END IF;
+                RETURN NULL;
+            END $$
+        """)
+        for operation, referencing in TRANSITIONS.items():
+            op.execute(
+                f"CREATE TRIGGER {table}_platform_counters_{operation} AFTER {operation.upper()} ON {table} "
+                f"REFERENCING {referencing} FOR EACH STATEMENT EXECUTE FUNCTION dovol_count_{table}()"
+            )
+    op.execute("""
+        INSERT INTO platform_counters (name, shard, value)
+        SELECT name, 0, value FROM (
+            SELECT 'total_users' AS name, count(*) AS value FROM users
+            UNION ALL SELECT 'total_' || role || 's', count(*) FROM users GROUP BY role
+            UNION ALL SELECT 'total_tasks', count(*) FROM volunteer_tasks
+            UNION ALL SELECT 'active_tasks', count(*) FROM volunteer_tasks WHERE is_active
+            UNION ALL SELECT 'total_applications', count(*) FROM applications
+            UNION ALL SELECT status || '_applications', count(*) FROM applications
+                WHERE status IS NOT NULL GROUP BY status
+        ) counts
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in COUNTED_TABLES:
+        for operation in TRANSITIONS:
+            op.execute(f"DROP TRIGGER IF EXISTS {table}_platform_counters_{operation} ON {table}")
+        op.execute(f"DROP FUNCTION IF EXISTS dovol_count_{table}()")
+    op.drop_table('platform_counters')
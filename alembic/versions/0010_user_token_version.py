@@ -0,0 +1,33 @@
+"""Token revocation point on users
+
+Adds users.token_version. Access and refresh tokens carry the version they
+were issued at as the `ver` claim; the admin status, role and delete
+endpoints bump it in their UPDATE ... RETURNING, so every worker rejects
+the older tokens once its short version cache expires.
+
+Revision ID: 0010_user_token_version
+Revises: 0009_platform_counters
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0010_user_token_version'
+down_revision: Union[str, Sequence[str], None] = '0009_platform_counters'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('token_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'token_version')
@@ -0,0 +1,41 @@
+"""volunteer_tasks.created_at NOT NULL
+
+GET /tasks pages active tasks on (created_at, id); a NULL created_at can't
+be compared with a cursor, so such tasks were skipped or repeated and a page
+ending on one failed to build its cursor. Rows without a created_at get
+their updated_at (or now()) and the column becomes NOT NULL with a now()
+default.
+
+Revision ID: 0011_task_created_at_not_null
+Revises: 0010_user_token_version
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0011_task_created_at_not_null'
+down_revision: Union[str, Sequence[str], None] = '0010_user_token_version'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("UPDATE volunteer_tasks SET created_at = coalesce(updated_at, now()) WHERE created_at IS NULL")
+    op.alter_column(
+        'volunteer_tasks', 'created_at',
+        existing_type=sa.DateTime(timezone=True), nullable=False, server_default=sa.text('now()'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column(
+        'volunteer_tasks', 'created_at',
+        existing_type=sa.DateTime(timezone=True), nullable=True, server_default=None,
+    )
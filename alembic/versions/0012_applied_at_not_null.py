@@ -0,0 +1,40 @@
+"""applications.applied_at NOT NULL
+
+The applicant listing and GET /applications/me page on (applied_at, id),
+which breaks on a NULL applied_at the same way the task feed did. Rows
+without one get the migration time and the column becomes NOT NULL with a
+now() default.
+
+Revision ID: 0012_applied_at_not_null
+Revises: 0011_task_created_at_not_null
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0012_applied_at_not_null'
+down_revision: Union[str, Sequence[str], None] = '0011_task_created_at_not_null'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("UPDATE applications SET applied_at = now() WHERE applied_at IS NULL")
+    op.alter_column(
+        'applications', 'applied_at',
+        existing_type=sa.DateTime(timezone=True), nullable=False, server_default=sa.text('now()'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column(
+        'applications', 'applied_at',
+        existing_type=sa.DateTime(timezone=True), nullable=True, server_default=None,
+    )
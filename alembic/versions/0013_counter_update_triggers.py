@@ -0,0 +1,105 @@
+"""Row-level platform counter UPDATE triggers
+
+0009's statement-level AFTER UPDATE triggers fired on every UPDATE of users,
+volunteer_tasks and applications, building OLD/NEW transition tables of
+whole rows (description, search_vector) even when no counted column
+changed - e.g. the accepted_count and version bumps on the accept path.
+They are replaced by row-level AFTER UPDATE OF <column> triggers with a
+WHEN (OLD.<column> IS DISTINCT FROM NEW.<column>) clause calling
+dovol_count_<table>_update(), so only role, is_active and status changes
+touch the counters. The INSERT/DELETE functions lose their UPDATE branch.
+
+Revision ID: 0013_counter_update_triggers
+Revises: 0012_applied_at_not_null
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0013_counter_update_triggers'
+down_revision: Union[str, Sequence[str], None] = '0012_applied_at_not_null'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COUNTED_TABLES = {
+    "users": ("role", "ARRAY['total_users', 'total_' || {row}.role || 's']"),
+    "volunteer_tasks": (
+        "is_active", "array_remove(ARRAY['total_tasks', CASE WHEN {row}.is_active THEN 'active_tasks' END], NULL)",
+    ),
+    "applications": (
+        "status", "array_remove(ARRAY['total_applications', {row}.status || '_applications'], NULL)",
+    ),
+}
+COUNTER_UPSERT = """
+        INSERT INTO platform_counters AS c (name, shard, value)
+        SELECT name, txid_current() % 16, sum(delta)
+        FROM ({changes}) AS changes, unnest(names) AS name
+        GROUP BY name HAVING sum(delta) <> 0
+        ORDER BY name
+        ON CONFLICT (name, shard) DO UPDATE SET value = c.value + excluded.value;"""
+
+
+def counter_function(table: str, names: str, update_branch: bool) -> str:
+    inserted = f"SELECT {names.format(row='r')} AS names, 1 AS delta FROM new_rows r"
+    deleted = f"SELECT {names.format(row='r')} AS names, -1 AS delta FROM old_rows r"
+    if update_branch:
+        branches = (
+            f"IF TG_OP = 'INSERT' THEN{COUNTER_UPSERT.format(changes=inserted)}\n"
+            f"                ELSIF TG_OP = 'DELETE' THEN{COUNTER_UPSERT.format(changes=deleted)}\n"
+            f"                ELSE{COUNTER_UPSERT.format(changes=f'{inserted} UNION ALL {deleted}')}"
+        )
+    else:
+        branches = (
+            f"IF TG_OP = 'INSERT' THEN{COUNTER_UPSERT.format(changes=inserted)}\n"
+            f"                ELSE{COUNTER_UPSERT.format(changes=deleted)}"
+        )
+    return f"""
+            CREATE OR REPLACE FUNCTION dovol_count_{table}() RETURNS trigger
+            LANGUAGE plpgsql AS $$
+            BEGIN
+                {branches}
+                END IF;
+                RETURN NULL;
+            END $$
+        """
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, (column, names) in COUNTED_TABLES.items():
+        changes = (
+            f"SELECT {names.format(row='OLD')} AS names, -1 AS delta "
+            f"UNION ALL SELECT {names.format(row='NEW')}, 1"
+        )
+        op.execute(f"""
+            CREATE OR REPLACE FUNCTION dovol_count_{table}_update() RETURNS trigger
+            LANGUAGE plpgsql AS $$
+            BEGIN{COUNTER_UPSERT.format(changes=changes)}
+                RETURN NULL;
+            END $$
+        """)
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_platform_counters_update ON {table}")
+        op.execute(
+            f"CREATE TRIGGER {table}_platform_counters_{column} AFTER UPDATE OF {column} ON {table} "
+            f"FOR EACH ROW WHEN (OLD.{column} IS DISTINCT FROM NEW.{column}) "
+            f"EXECUTE FUNCTION dovol_count_{table}_update()"
+        )
+        op.execute(counter_function(table, names, update_branch=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, (column, names) in COUNTED_TABLES.items():
+        op.execute(counter_function(table, names, update_branch=True))
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_platform_counters_{column} ON {table}")
+        op.execute(
+            f"CREATE TRIGGER {table}_platform_counters_update AFTER UPDATE ON {table} "
+            f"REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows "
+            f"FOR EACH STATEMENT EXECUTE FUNCTION dovol_count_{table}()"
+        )
+        op.execute(f"DROP FUNCTION IF EXISTS dovol_count_{table}_update()")
@@ -1,6 +1,12 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
 import bcrypt
+from fastapi import HTTPException, status
+from ..config import settings
+from ..services.metrics import LatencyStats
 
-def hash_password(password: str) -> str:
+def hash_password_sync(password: str) -> str:
     """Hash a password using bcrypt"""
     # Convert password to bytes
     password_bytes = password.encode('utf-8')
@@ -10,10 +16,71 @@ def hash_password(password: str) -> str:
     # Return as string
     return hashed.decode('utf-8')
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+def verify_password_sync(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash"""
     # Convert to bytes
     password_bytes = plain_password.encode('utf-8')
     hashed_bytes = hashed_password.encode('utf-8')
     # Verify
-    return bcrypt.checkpw(password_bytes, hashed_bytes)
\ No newline at end of file
+    return bcrypt.checkpw(password_bytes, hashed_bytes)
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a bounded thread pool so it never blocks the event loop.
+    bcrypt releases the GIL while hashing, so threads scale across cores.
+    Once `max_pending` operations are queued or running, new ones are shed with 503.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self.rejected = 0
+        self.latency = {"hash": LatencyStats(), "verify": LatencyStats()}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bcrypt")
+
+    async def run(self, operation: str, func, *args):
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy, please try again shortly",
+                headers={"Retry-After": "1"}
+            )
+
+        self.pending += 1
+        started = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+        finally:
+            self.pending -= 1
+            self.latency[operation].record(time.perf_counter() - started)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict:
+        return {
+            "max_workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "rejected": self.rejected,
+            "hash": self.latency["hash"].stats(),
+            "verify": self.latency["verify"].stats(),
+        }
+
+
+password_hasher = PasswordHasher(
+    max_workers=settings.password_hash_workers,
+    max_pending=settings.password_hash_max_pending,
+)
+
+async def hash_password(password: str) -> str:
+    """Hash a password off the event loop"""
+    return await password_hasher.run("hash", hash_password_sync, password)
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password off the event loop"""
+    return await password_hasher.run("verify", verify_password_sync, plain_password, hashed_password)
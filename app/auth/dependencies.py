@@ -1,42 +1,78 @@
+from dataclasses import dataclass
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
-from jose import jwt, JWTError
+from jose import JWTError
 from ..database import get_db
-from ..models.user import User
+from ..models.user import User, Roles
 from ..config import settings
+from .jwt_handler import decode_access_token
+from .revocation import is_token_revoked
+from .user_cache import cache_user, get_cached_user
 from sqlalchemy.future import select
 from uuid import UUID
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/users/login")
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)):
+@dataclass(frozen=True)
+class TokenUser:
+    """Identity resolved from signed access-token claims, without a database lookup"""
+    id: UUID
+    role: Roles
+    is_active: bool
+
+async def get_token_claims(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)) -> dict:
     try:
-        payload = jwt.decode(token, settings.secret_key, algorithms=["HS256"])
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise HTTPException(status_code=401, detail="Invalid token")
+        payload = decode_access_token(token)
     except JWTError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
+    if payload.get("sub") is None or payload.get("type") != "access":
+        raise HTTPException(status_code=401, detail="Invalid token")
+    if await is_token_revoked(db, payload):
+        raise HTTPException(status_code=401, detail="Token has been revoked")
+    return payload
+
+async def get_token_user(claims: dict = Depends(get_token_claims)) -> TokenUser:
+    try:
+        return TokenUser(
+            id=UUID(claims["sub"]),
+            role=Roles(claims["role"]),
+            is_active=bool(claims["active"]),
+        )
+    except (KeyError, ValueError):
+        raise HTTPException(status_code=401, detail="Invalid token")
+
+async def get_current_user(claims: dict = Depends(get_token_claims), db: AsyncSession = Depends(get_db)):
+    user_id: str = claims["sub"]
+
+    cached_user = get_cached_user(user_id)
+    if cached_user is not None:
+        return cached_user
+
     result = await db.execute(select(User).where(User.id == UUID(user_id)))
     user = result.scalar_one_or_none()
     if user is None:
         raise HTTPException(status_code=401, detail="User not found")
+    cache_user(user)
     return user
 
 def require_roles(*roles):
-    async def role_checker(current_user = Depends(get_current_user)):
+    async def role_checker(current_user: TokenUser = Depends(get_token_user)):
+        if not current_user.is_active:
+            raise HTTPException(status_code=403, detail="Account is deactivated")
         if current_user.role.value not in roles:
             raise HTTPException(status_code=403, detail="Insufficient permissions")
         return current_user
     return role_checker
 
-async def require_admin(current_user = Depends(get_current_user)):
+async def require_admin(current_user: TokenUser = Depends(get_token_user)):
     """Dependency to ensure only admin users can access a route"""
+    if not current_user.is_active:
+        raise HTTPException(status_code=403, detail="Account is deactivated")
     if current_user.role.value != "admin":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, 
             detail="Admin access required"
         )
-    return current_user
\ No newline at end of file
+    return current_user
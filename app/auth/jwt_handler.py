@@ -1,12 +1,68 @@
+import hashlib
+import time
 from datetime import datetime, timedelta
 from jose import jwt
 from ..config import settings
-def create_access_token(data: dict):
+from ..services.cache import TTLCache
+
+# Claims of tokens whose signature has already been verified, keyed by SHA-256 of the token
+verified_token_cache = TTLCache(
+    max_size=settings.jwt_cache_max_size,
+    ttl_seconds=settings.access_token_expire_days * 24 * 3600,
+)
+
+def create_access_token(data: dict, expires_delta: timedelta | None = None):
     to_encode = data.copy()
-    expire = datetime.utcnow() + timedelta(days=settings.access_token_expire_days)
+    expire = datetime.utcnow() + (expires_delta or timedelta(minutes=settings.access_token_expire_minutes))
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm="HS256")
     return encoded_jwt
 
+def create_token_pair(user) -> dict:
+    """
+    Issue a short-lived access token carrying the user's role and active state,
+    plus a refresh token that lives for `access_token_expire_days`. Both carry
+    the user's token_version as `ver`, so revoking bumps it past them.
+    """
+    version = user.token_version or 0
+    access_token = create_access_token({
+        "sub": str(user.id),
+        "type": "access",
+        "role": user.role.value,
+        "active": bool(user.is_active),
+        "ver": version,
+    })
+    refresh_token = create_access_token(
+        {"sub": str(user.id), "type": "refresh", "ver": version},
+        expires_delta=timedelta(days=settings.access_token_expire_days),
+    )
+    return {
+        "access_token": access_token,
+        "refresh_token": refresh_token,
+        "token_type": "bearer",
+        "expires_in": settings.access_token_expire_minutes * 60,
+    }
+
+def decode_access_token_uncached(token: str):
+    return jwt.decode(token, settings.secret_key, algorithms=["HS256"])
+
 def decode_access_token(token: str):
-    return jwt.decode(token, settings.secret_key, algorithms=["HS256"])
\ No newline at end of file
+    """
+    Decode and verify a token, reusing the claims of tokens verified before.
+    Cached entries expire together with the token's `exp` claim.
+    Raises JWTError for invalid or expired tokens.
+    """
+    key = hashlib.sha256(token.encode('utf-8')).digest()
+    claims = verified_token_cache.get(key)
+    if claims is not None:
+        return dict(claims)
+
+    claims = decode_access_token_uncached(token)
+    exp = claims.get("exp")
+    if exp is not None:
+        remaining = exp - time.time()
+        if remaining > 0:
+            verified_token_cache.set(key, claims, ttl_seconds=remaining)
+    else:
+        verified_token_cache.set(key, claims)
+    return dict(claims)
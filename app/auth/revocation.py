@@ -0,0 +1,37 @@
+from typing import Optional
+from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from ..config import settings
+from ..models.user import User
+from ..services.cache import TTLCache
+
+# users.token_version by user id. The column is the revocation point shared by
+# every worker; this per-worker copy only saves the lookup, so another
+# worker's revocation takes effect here within token_version_cache_ttl_seconds.
+token_version_cache = TTLCache(
+    max_size=settings.user_cache_max_size,
+    ttl_seconds=settings.token_version_cache_ttl_seconds,
+)
+
+def revoke_tokens_values() -> dict:
+    """UPDATE values that revoke every token issued to the user so far"""
+    return {"token_version": User.token_version + 1}
+
+def remember_token_version(user_id: UUID | str, version: int):
+    """Record a version read or written by this worker (e.g. by UPDATE ... RETURNING)"""
+    token_version_cache.set(str(user_id), version)
+
+async def current_token_version(db: AsyncSession, user_id: UUID | str) -> Optional[int]:
+    """The user's token version, or None if the user no longer exists"""
+    version = token_version_cache.get(str(user_id))
+    if version is None:
+        result = await db.execute(select(User.token_version).where(User.id == UUID(str(user_id))))
+        version = result.scalar_one_or_none()
+        if version is not None:
+            remember_token_version(user_id, version)
+    return version
+
+async def is_token_revoked(db: AsyncSession, claims: dict) -> bool:
+    version = await current_token_version(db, claims["sub"])
+    return version is None or claims.get("ver", 0) < version
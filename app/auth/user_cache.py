@@ -0,0 +1,34 @@
+from typing import Optional
+from uuid import UUID
+from sqlalchemy.orm import make_transient_to_detached
+from ..models.user import User
+from ..services.cache import TTLCache
+from ..config import settings
+
+# Resolved User rows keyed by the JWT `sub` (the user id as a string)
+user_cache = TTLCache(
+    max_size=settings.user_cache_max_size,
+    ttl_seconds=settings.user_cache_ttl_seconds,
+)
+
+_USER_COLUMNS = [column.key for column in User.__table__.columns]
+
+def cache_user(user: User):
+    """Store a snapshot of the user's column values"""
+    user_cache.set(str(user.id), {key: getattr(user, key) for key in _USER_COLUMNS})
+
+def get_cached_user(user_id: str) -> Optional[User]:
+    """
+    Build a detached User from the cached snapshot.
+    A fresh instance is returned on every hit so requests never share ORM state.
+    """
+    values = user_cache.get(user_id)
+    if values is None:
+        return None
+    user = User(**values)
+    make_transient_to_detached(user)
+    return user
+
+def invalidate_user(user_id: UUID | str):
+    """Drop the cached row after the user has been modified"""
+    user_cache.invalidate(str(user_id))
@@ -1,3 +1,4 @@
+from typing import Literal
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -7,9 +8,18 @@ class Settings(BaseSettings):
     database_name: str
     database_username: str
     database_ssl: bool = False
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+
+    # Startup: "create_all" (create missing tables), "check" (verify the
+    # Alembic schema version only) or "skip"; any other value fails at startup
+    schema_startup_mode: Literal["create_all", "check", "skip"] = "create_all"
+    # Connections to open before the worker accepts traffic (0 disables)
+    db_pool_warmup_connections: int = 0
     secret_key: str
     algorithm: str
-    access_token_expire_days: int
+    access_token_expire_days: int  # lifetime of refresh tokens
+    access_token_expire_minutes: int = 15
     
     # Email/SMTP settings for password reset
     smtp_host: str = "smtp.gmail.com"
@@ -17,6 +27,51 @@ class Settings(BaseSettings):
     smtp_username: str = ""
     smtp_password: str = ""
     smtp_from_email: str = ""
+
+    # Authenticated-user cache used by get_current_user
+    user_cache_ttl_seconds: int = 60
+    user_cache_max_size: int = 10000
+    # Per-worker copy of users.token_version checked against the `ver` claim;
+    # a revocation by another worker applies here after at most this long
+    token_version_cache_ttl_seconds: int = 30
+
+    # bcrypt thread pool used by login, signup and password reset
+    password_hash_workers: int = 4
+    password_hash_max_pending: int = 64
+
+    # Verified-JWT cache used by decode_access_token
+    jwt_cache_max_size: int = 10000
+
+    # Serialized GET /tasks and GET /tasks/{task_id} responses (per worker)
+    task_response_cache_ttl_seconds: int = 30
+    task_response_cache_max_size: int = 2000
+
+    # POST /tasks/bulk: rows validated and copied per chunk, rows per upload,
+    # row errors listed in the report, and bytes per line (or multi-line CSV
+    # record) buffered while streaming
+    bulk_import_chunk_size: int = 500
+    bulk_import_max_rows: int = 10000
+    bulk_import_max_errors: int = 100
+    bulk_import_max_line_bytes: int = 64 * 1024
+
+    # GET /tasks/recommended: full rebuild interval of the per-worker skill
+    # index, and the age at which the recency boost halves
+    recommendation_refresh_seconds: int = 300
+    recommendation_half_life_days: float = 7.0
+
+    # Application events over SSE: LISTEN on PostgreSQL (one connection per
+    # worker), events queued per subscriber before it is told to resync, and
+    # the keep-alive interval of idle streams
+    notifications_enabled: bool = True
+    notification_queue_size: int = 100
+    notification_heartbeat_seconds: int = 15
+
+    # GET /skills/catalog: background reload interval of the per-worker
+    # skill catalog (names registered by the worker itself show up at once)
+    skill_catalog_refresh_seconds: int = 300
+
+    # GET /admin/dashboard/stats: lifetime of the per-worker counts snapshot
+    dashboard_stats_ttl_seconds: int = 10
     
     class Config:
         env_file = ".env"  # Updated path to .env
@@ -1,3 +1,6 @@
+import asyncio
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
@@ -23,6 +26,8 @@ engine = create_async_engine(
     SQLALCHEMY_DATABASE_URL,
     pool_pre_ping=True,
     pool_recycle=1800,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
     echo=True,
     future=True,
     connect_args=connect_args,
@@ -35,4 +40,44 @@ Base = declarative_base()
 # Dependency function to get a database session.
 async def get_db():
     async with AsyncSessionLocal() as db:  # Ensures proper session management
-        yield db  # Yield the session for use in a request
\ No newline at end of file
+        yield db  # Yield the session for use in a request
+
+# Alembic head revision this code expects. alembic/env.py refuses to run
+# when it does not match the newest migration, so bump it with every migration.
+SCHEMA_VERSION = "0013_counter_update_triggers"
+
+async def check_schema_version():
+    """
+    Compare the single alembic_version row with the migration head.
+    Raises RuntimeError when the database has not been migrated.
+    """
+    expected = SCHEMA_VERSION
+    async with engine.connect() as conn:
+        try:
+            result = await conn.execute(text("SELECT version_num FROM alembic_version"))
+            current = result.scalar()
+        except DBAPIError:
+            current = None
+
+    if current != expected:
+        raise RuntimeError(
+            f"Database schema is at {current or 'no version'}, expected {expected}. "
+            "Run `alembic upgrade head` before starting the app."
+        )
+    return current
+
+async def warm_up_pool(connections: int) -> int:
+    """Open up to `connections` pooled connections so the first requests don't pay for connecting"""
+    connections = min(connections, settings.db_pool_size)
+    if connections <= 0:
+        return 0
+
+    async def open_connection():
+        conn = await engine.connect()
+        await conn.execute(text("SELECT 1"))
+        return conn
+
+    opened = await asyncio.gather(*(open_connection() for _ in range(connections)))
+    for conn in opened:
+        await conn.close()  # returns the connection to the pool
+    return len(opened)
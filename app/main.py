@@ -1,20 +1,69 @@
-from fastapi import FastAPI
+import time
+_import_started = time.perf_counter()
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm.exc import StaleDataError
 from .routers import user, skills, task, application, admin
-from .database import engine, Base
+from .config import settings
+from .database import engine, Base, check_schema_version, warm_up_pool
+from .auth.auth import password_hasher
+from .services.notifications import notification_hub
+from .services.skill_catalog import skill_catalog
 from contextlib import asynccontextmanager
 from fastapi.middleware.cors import CORSMiddleware
 # Import models to register them with SQLAlchemy
-from .models import user as user_model, volunteer_task, applications, skill, password_reset
+from .models import user as user_model, volunteer_task, applications, skill, password_reset, platform_counter
+
+IMPORT_SECONDS = time.perf_counter() - _import_started
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all,checkfirst=True)
+    db_started = time.perf_counter()
+    if settings.schema_startup_mode == "create_all":
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all,checkfirst=True)
+    elif settings.schema_startup_mode == "check":
+        await check_schema_version()
+    db_check_seconds = time.perf_counter() - db_started
+
+    warmup_started = time.perf_counter()
+    warmed_connections = await warm_up_pool(settings.db_pool_warmup_connections)
+    warmup_seconds = time.perf_counter() - warmup_started
+
+    catalog_started = time.perf_counter()
+    try:
+        await skill_catalog.refresh()
+    except (OSError, SQLAlchemyError) as e:
+        # GET /skills/catalog loads it on first use instead
+        print(f"Skill catalog not loaded at startup: {e}")
+    catalog_seconds = time.perf_counter() - catalog_started
+
+    app.state.startup_report = {
+        "schema_startup_mode": settings.schema_startup_mode,
+        "import_ms": round(IMPORT_SECONDS * 1000, 1),
+        "db_check_ms": round(db_check_seconds * 1000, 1),
+        "pool_warmup_ms": round(warmup_seconds * 1000, 1),
+        "warmed_connections": warmed_connections,
+        "skill_catalog_ms": round(catalog_seconds * 1000, 1),
+    }
+    print(f"Startup report: {app.state.startup_report}")
+
+    if settings.notifications_enabled:
+        notification_hub.start()
+
     yield  # This allows the app to run
-    # You can add cleanup tasks after `yield` if needed
+    await notification_hub.stop()
+    password_hasher.shutdown()
 
 app = FastAPI(lifespan=lifespan)
 
+# Versioned rows (volunteer_tasks.version) that changed between load and update
+@app.exception_handler(StaleDataError)
+async def stale_data_handler(request: Request, exc: StaleDataError):
+    return JSONResponse(status_code=409, content={"detail": "The resource was modified concurrently, please retry"})
+
 origins = [
     "http://localhost",
     "http://localhost:3000",
@@ -38,4 +87,4 @@ app.include_router(user.router)
 app.include_router(task.router)
 app.include_router(application.router)
 app.include_router(skills.router)
-app.include_router(admin.router)
\ No newline at end of file
+app.include_router(admin.router)
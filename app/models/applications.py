@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime, timezone
-from sqlalchemy import Column, String, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, String, DateTime, ForeignKey, Enum, Index, UniqueConstraint, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from ..database import Base
@@ -13,12 +13,23 @@ class ApplicationStatus(enum.Enum):
 
 class Application(Base):
     __tablename__ = "applications"
+    __table_args__ = (
+        UniqueConstraint("task_id", "volunteer_id", name="uq_applications_task_volunteer"),
+        # A volunteer's applications, newest first (keyset on applied_at, id)
+        Index("ix_applications_volunteer_id_applied_at", "volunteer_id", "applied_at", "id"),
+        Index("ix_applications_task_id_status", "task_id", "status"),
+        # Applicant listing per task, newest first (keyset on applied_at, id)
+        Index("ix_applications_task_id_applied_at", "task_id", "applied_at", "id"),
+        Index("ix_applications_applied_at", "applied_at"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     task_id = Column(UUID(as_uuid=True), ForeignKey("volunteer_tasks.id"), nullable=False)
     volunteer_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     status = Column(Enum(ApplicationStatus, name="application_status"), default=ApplicationStatus.pending)
-    applied_at = Column(DateTime(timezone=True), default=datetime.now(timezone.utc))
+    # Keyset column of the application listings, so never NULL
+    applied_at = Column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc),
+                        server_default=text("now()"))
 
     task = relationship("VolunteerTask")
     volunteer = relationship("User")
\ No newline at end of file
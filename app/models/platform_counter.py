@@ -0,0 +1,135 @@
+from sqlalchemy import Column, String, SmallInteger, BigInteger, DDL, event
+from ..database import Base
+
+# Rows per counter. Every transaction adds its deltas to the shard picked by
+# its transaction id, so concurrent signups/applications rarely wait on the
+# same row; readers sum the shards.
+COUNTER_SHARDS = 16
+
+# Per counted table: the column deciding which counters a row contributes to,
+# and those counter names as SQL over a row ({row} is r, OLD or NEW); the
+# names match the DashboardStats fields.
+COUNTED_TABLES = {
+    "users": ("role", "ARRAY['total_users', 'total_' || {row}.role || 's']"),
+    "volunteer_tasks": (
+        "is_active", "array_remove(ARRAY['total_tasks', CASE WHEN {row}.is_active THEN 'active_tasks' END], NULL)",
+    ),
+    "applications": (
+        "status", "array_remove(ARRAY['total_applications', {row}.status || '_applications'], NULL)",
+    ),
+}
+
+class PlatformCounter(Base):
+    __tablename__ = "platform_counters"
+
+    name = Column(String, primary_key=True)      # e.g. "total_users", "pending_applications"
+    shard = Column(SmallInteger, primary_key=True)
+    value = Column(BigInteger, nullable=False, default=0)
+
+# Statement-level AFTER INSERT/DELETE triggers net the transition tables into
+# one delta per counter name and add it to the transaction's shard, in the
+# same transaction as the write. Updates only change a counter when the
+# counted column changes, so they use a row-level AFTER UPDATE OF <column>
+# trigger with a WHEN clause: other updates (accepted_count and version
+# bumps, text edits) never call a function or build transition tables.
+# alembic/versions/0009_platform_counters.py and 0013_counter_update_triggers.py
+# create the same functions and triggers.
+_COUNTER_UPSERT = """
+        INSERT INTO platform_counters AS c (name, shard, value)
+        SELECT name, txid_current() % {shards}, sum(delta)
+        FROM ({changes}) AS changes, unnest(names) AS name
+        GROUP BY name HAVING sum(delta) <> 0
+        ORDER BY name
+        ON CONFLICT (name, shard) DO UPDATE SET value = c.value + excluded.value;"""
+
+def _names(table: str, row: str) -> str:
+    return COUNTED_TABLES[table][1].format(row=row)
+
+def counter_function_sql(table: str) -> str:
+    """CREATE FUNCTION dovol_count_<table>() for the INSERT and DELETE triggers of `table`"""
+    inserted = f"SELECT {_names(table, 'r')} AS names, 1 AS delta FROM new_rows r"
+    deleted = f"SELECT {_names(table, 'r')} AS names, -1 AS delta FROM old_rows r"
+    return f"""
+CREATE OR REPLACE FUNCTION dovol_count_{table}() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN{_COUNTER_UPSERT.format(shards=COUNTER_SHARDS, changes=inserted)}
+    ELSE{_COUNTER_UPSERT.format(shards=COUNTER_SHARDS, changes=deleted)}
+    END IF;
+    RETURN NULL;
+END $$
+"""
+
+def counter_update_function_sql(table: str) -> str:
+    """CREATE FUNCTION dovol_count_<table>_update() for the row-level UPDATE trigger of `table`"""
+    changes = f"SELECT {_names(table, 'OLD')} AS names, -1 AS delta UNION ALL SELECT {_names(table, 'NEW')}, 1"
+    return f"""
+CREATE OR REPLACE FUNCTION dovol_count_{table}_update() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN{_COUNTER_UPSERT.format(shards=COUNTER_SHARDS, changes=changes)}
+    RETURN NULL;
+END $$
+"""
+
+def counter_trigger_sql(table: str) -> list:
+    """CREATE TRIGGER statements keeping platform_counters in step with `table`"""
+    column = COUNTED_TABLES[table][0]
+    return [
+        f"CREATE TRIGGER {table}_platform_counters_insert AFTER INSERT ON {table} "
+        f"REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION dovol_count_{table}()",
+        f"CREATE TRIGGER {table}_platform_counters_delete AFTER DELETE ON {table} "
+        f"REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION dovol_count_{table}()",
+        f"CREATE TRIGGER {table}_platform_counters_{column} AFTER UPDATE OF {column} ON {table} "
+        f"FOR EACH ROW WHEN (OLD.{column} IS DISTINCT FROM NEW.{column}) "
+        f"EXECUTE FUNCTION dovol_count_{table}_update()",
+    ]
+
+def counter_backfill_sql(table: str) -> str:
+    """Add the counters of the rows already in `table` (run when its triggers are installed)"""
+    return f"""
+INSERT INTO platform_counters AS c (name, shard, value)
+SELECT name, 0, count(*) FROM {table} r, unnest({_names(table, 'r')}) AS name
+GROUP BY name
+ON CONFLICT (name, shard) DO UPDATE SET value = c.value + excluded.value"""
+
+def counter_install_sql(table: str) -> str:
+    """
+    For create_all: install the functions and triggers of `table` and
+    backfill its counters, unless its UPDATE trigger already exists. An
+    advisory lock serializes workers booting together; once installed, a
+    boot only reads pg_trigger and takes no lock on `table`.
+    """
+    column = COUNTED_TABLES[table][0]
+    statements = [
+        counter_function_sql(table),
+        counter_update_function_sql(table),
+        # Statement-level UPDATE trigger of earlier versions
+        f"DROP TRIGGER IF EXISTS {table}_platform_counters_update ON {table}",
+    ]
+    body = ";\n".join(statement.strip() for statement in statements)
+    triggers = ";\n".join(counter_trigger_sql(table)[:2])
+    return f"""
+DO $install$
+BEGIN
+    PERFORM pg_advisory_xact_lock(hashtext('dovol_platform_counters'));
+    IF NOT EXISTS (
+        SELECT FROM pg_trigger
+        WHERE tgrelid = '{table}'::regclass AND tgname = '{table}_platform_counters_{column}'
+    ) THEN
+        {body};
+        IF NOT EXISTS (
+            SELECT FROM pg_trigger
+            WHERE tgrelid = '{table}'::regclass AND tgname = '{table}_platform_counters_insert'
+        ) THEN
+            {triggers};
+            {counter_backfill_sql(table).strip()};
+        END IF;
+        {counter_trigger_sql(table)[2]};
+    END IF;
+END $install$
+"""
+
+# For create_all, once every table exists (including tables created before
+# the counters). DDL applies %-formatting.
+for _table in COUNTED_TABLES:
+    event.listen(Base.metadata, "after_create", DDL(counter_install_sql(_table).replace("%", "%%")))
@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime,timezone
 import pytz
-from sqlalchemy import Column, String, Boolean, Enum, DateTime
+from sqlalchemy import Column, String, Boolean, Enum, DateTime, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from ..database import Base
 ist = pytz.timezone("Asia/Kolkata")
@@ -16,8 +16,12 @@ class Skill(Base):
 
 class VolunteerSkill(Base):
     __tablename__ = "volunteer_skills"
+    __table_args__ = (
+        UniqueConstraint("user_id", "skill_id", name="uq_volunteer_skills_user_skill"),
+        Index("ix_volunteer_skills_skill_id", "skill_id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, unique=True)
-    user_id = Column(UUID(as_uuid=True), nullable=False)   # FK to users.id
-    skill_id = Column(UUID(as_uuid=True), nullable=False)  # FK to skills.id
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    skill_id = Column(UUID(as_uuid=True), ForeignKey("skills.id", ondelete="CASCADE"), nullable=False)
     created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(ist))
\ No newline at end of file
@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime,timezone
-from sqlalchemy import Column, String, Boolean, Enum, DateTime
+from sqlalchemy import Column, String, Boolean, Enum, DateTime, Integer
 from sqlalchemy.dialects.postgresql import UUID
 from ..database import Base
 import enum
@@ -22,6 +22,8 @@ class User(Base):
     role = Column(Enum(Roles), nullable=False)
     location = Column(String, nullable=True)
     is_active = Column(Boolean, default=True)
-    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(ist))
+    # Bumped whenever the user's tokens are revoked; tokens carry it as `ver`
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(ist), index=True)
     updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(ist), onupdate=lambda: datetime.now(ist))
     
\ No newline at end of file
@@ -1,12 +1,35 @@
 import uuid
 from datetime import datetime, timezone
-from sqlalchemy import Column, String, DateTime, Boolean, ForeignKey, Text, ARRAY
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, DateTime, Boolean, Integer, ForeignKey, Text, Index, Computed, DDL, event, text, CheckConstraint
+from sqlalchemy.dialects.postgresql import UUID, ARRAY, TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from ..database import Base
 
+# Weighted document for full-text search: title > description > skills
+TASK_SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B') || "
+    "setweight(to_tsvector('english', dovol_skills_text(skills_required)), 'C')"
+)
+
 class VolunteerTask(Base):
     __tablename__ = "volunteer_tasks"
+    __table_args__ = (
+        Index("ix_volunteer_tasks_posted_by_id_created_at", "posted_by_id", "created_at"),
+        Index("ix_volunteer_tasks_is_active_created_at", "is_active", "created_at"),
+        # Public feed: only active tasks, newest first
+        Index("ix_volunteer_tasks_active_feed", "created_at", "id", postgresql_where=text("is_active")),
+        Index("ix_volunteer_tasks_search_vector", "search_vector", postgresql_using="gin"),
+        # Skill filters (&& / @>) on the public feed
+        Index("ix_volunteer_tasks_skills_required", "skills_required",
+              postgresql_using="gin", postgresql_where=text("is_active")),
+        # Accepted volunteers never exceed the task's capacity (see services/task_capacity.py)
+        CheckConstraint(
+            "accepted_count >= 0 AND (max_volunteers IS NULL OR accepted_count <= max_volunteers)",
+            name="ck_volunteer_tasks_accepted_count",
+        ),
+        CheckConstraint("max_volunteers IS NULL OR max_volunteers > 0", name="ck_volunteer_tasks_max_volunteers"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     title = Column(String, nullable=False)
@@ -15,7 +38,30 @@ class VolunteerTask(Base):
     skills_required = Column(ARRAY(String), nullable=True)  # list of required skills
     posted_by_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     is_active = Column(Boolean, default=True)
-    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    # Optional capacity; accepted_count is maintained on application status changes
+    max_volunteers = Column(Integer, nullable=True)
+    accepted_count = Column(Integer, nullable=False, server_default=text("0"))
+    # Keyset column of the public feed (routers/task.py:task_feed_query), so never NULL
+    created_at = Column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc),
+                        server_default=text("now()"))
     updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc),
                         onupdate=lambda: datetime.now(timezone.utc))
-    posted_by = relationship("User")  # link to the NGO who posted
\ No newline at end of file
+    # Bumped by the ORM on every UPDATE (see __mapper_args__); used for ETags
+    version = Column(Integer, nullable=False, server_default=text("1"))
+    # Maintained by PostgreSQL; deferred so regular task queries don't load it
+    search_vector = deferred(Column(TSVECTOR, Computed(TASK_SEARCH_VECTOR_SQL, persisted=True)))
+    posted_by = relationship("User")  # link to the NGO who posted
+
+    __mapper_args__ = {"version_id_col": version}
+
+# array_to_string is not IMMUTABLE, so the generated column needs this wrapper.
+# Created here for create_all; alembic/versions/0003_task_search.py does the same.
+event.listen(
+    VolunteerTask.__table__,
+    "before_create",
+    DDL(
+        "CREATE OR REPLACE FUNCTION dovol_skills_text(skills text[]) RETURNS text "
+        "LANGUAGE sql IMMUTABLE PARALLEL SAFE "
+        "AS $$ SELECT coalesce(array_to_string(skills, ' '), '') $$"
+    ),
+)
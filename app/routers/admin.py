@@ -1,16 +1,31 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Path
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import func, and_, or_, desc
+from sqlalchemy import func, and_, or_, desc, update, true
 from typing import List, Optional
 from uuid import UUID
 from datetime import datetime, timedelta
 
+from ..config import settings
 from ..database import get_db
 from ..auth.dependencies import require_admin
+from ..auth.user_cache import invalidate_user, user_cache
+from ..auth.auth import password_hasher
+from ..auth.jwt_handler import verified_token_cache
+from ..auth.revocation import remember_token_version, revoke_tokens_values
 from ..models.user import User, Roles
 from ..models.volunteer_task import VolunteerTask
 from ..models.applications import Application, ApplicationStatus
+from ..services.task_search import highlight, search_match, search_rank
+from ..services.recommendations import task_skill_index
+from ..services.skill_catalog import skill_catalog
+from ..services import response_cache
+from ..services.cache import SnapshotCache
+from ..services.platform_counters import read_counters, reconcile_counters
+from ..services.export import export_rows
+from ..services.task_capacity import application_status_statement
+from ..services.notifications import notification_hub
 from ..schemas.admin import (
     DashboardStats,
     UserListItem,
@@ -21,80 +36,32 @@ from ..schemas.admin import (
     TaskStatusUpdate,
     ApplicationListAdmin,
     ApplicationStatusUpdate,
-    SystemHealth
+    SystemHealth,
+    CounterReconciliation
 )
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
 # ==================== Dashboard Statistics ====================
 
+dashboard_stats_snapshot = SnapshotCache(ttl_seconds=settings.dashboard_stats_ttl_seconds)
+
 @router.get("/dashboard/stats", response_model=DashboardStats)
 async def get_dashboard_stats(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_admin)
 ):
-    """Get comprehensive dashboard statistics for admin"""
-    
-    # Count total users
-    total_users_result = await db.execute(select(func.count(User.id)))
-    total_users = total_users_result.scalar()
-    
-    # Count users by role
-    volunteers_result = await db.execute(
-        select(func.count(User.id)).where(User.role == Roles.volunteer)
-    )
-    total_volunteers = volunteers_result.scalar()
-    
-    ngos_result = await db.execute(
-        select(func.count(User.id)).where(User.role == Roles.ngo)
-    )
-    total_ngos = ngos_result.scalar()
-    
-    admins_result = await db.execute(
-        select(func.count(User.id)).where(User.role == Roles.admin)
-    )
-    total_admins = admins_result.scalar()
-    
-    # Count tasks
-    total_tasks_result = await db.execute(select(func.count(VolunteerTask.id)))
-    total_tasks = total_tasks_result.scalar()
-    
-    active_tasks_result = await db.execute(
-        select(func.count(VolunteerTask.id)).where(VolunteerTask.is_active == True)
-    )
-    active_tasks = active_tasks_result.scalar()
-    
-    # Count applications
-    total_applications_result = await db.execute(select(func.count(Application.id)))
-    total_applications = total_applications_result.scalar()
-    
-    pending_apps_result = await db.execute(
-        select(func.count(Application.id)).where(Application.status == ApplicationStatus.pending)
-    )
-    pending_applications = pending_apps_result.scalar()
-    
-    accepted_apps_result = await db.execute(
-        select(func.count(Application.id)).where(Application.status == ApplicationStatus.accepted)
-    )
-    accepted_applications = accepted_apps_result.scalar()
-    
-    rejected_apps_result = await db.execute(
-        select(func.count(Application.id)).where(Application.status == ApplicationStatus.rejected)
-    )
-    rejected_applications = rejected_apps_result.scalar()
-    
-    return DashboardStats(
-        total_users=total_users,
-        total_volunteers=total_volunteers,
-        total_ngos=total_ngos,
-        total_admins=total_admins,
-        total_tasks=total_tasks,
-        active_tasks=active_tasks,
-        total_applications=total_applications,
-        pending_applications=pending_applications,
-        accepted_applications=accepted_applications,
-        rejected_applications=rejected_applications
-    )
+    """
+    Get comprehensive dashboard statistics for admin, read from the
+    platform_counters rows. The counts are a snapshot shared by all admins on
+    this worker and reread at most once per dashboard_stats_ttl_seconds;
+    snapshot_age_seconds says how old it is.
+    """
+    async def load():
+        return await read_counters(db)
+
+    counts, age = await dashboard_stats_snapshot.get(load)
+    return DashboardStats(**counts, snapshot_age_seconds=round(age, 3))
 
 # ==================== User Management ====================
 
@@ -167,19 +134,21 @@ async def update_user_status(
 ):
     """Activate or deactivate a user account"""
     
-    result = await db.execute(select(User).where(User.id == user_id))
+    # Prevent admin from deactivating themselves
+    if user_id == current_user.id:
+        raise HTTPException(status_code=400, detail="Cannot modify your own status")
+    
+    result = await db.execute(
+        update(User).where(User.id == user_id).values(is_active=status_update.is_active, **revoke_tokens_values()).returning(User)
+    )
     user = result.scalar_one_or_none()
     
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    # Prevent admin from deactivating themselves
-    if user.id == current_user.id:
-        raise HTTPException(status_code=400, detail="Cannot modify your own status")
-    
-    user.is_active = status_update.is_active
     await db.commit()
-    await db.refresh(user)
+    invalidate_user(user.id)
+    remember_token_version(user.id, user.token_version)
     
     return user
 
@@ -192,19 +161,21 @@ async def update_user_role(
 ):
     """Change a user's role"""
     
-    result = await db.execute(select(User).where(User.id == user_id))
+    # Prevent admin from changing their own role
+    if user_id == current_user.id:
+        raise HTTPException(status_code=400, detail="Cannot modify your own role")
+    
+    result = await db.execute(
+        update(User).where(User.id == user_id).values(role=role_update.role, **revoke_tokens_values()).returning(User)
+    )
     user = result.scalar_one_or_none()
     
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    # Prevent admin from changing their own role
-    if user.id == current_user.id:
-        raise HTTPException(status_code=400, detail="Cannot modify your own role")
-    
-    user.role = role_update.role
     await db.commit()
-    await db.refresh(user)
+    invalidate_user(user.id)
+    remember_token_version(user.id, user.token_version)
     
     return user
 
@@ -216,79 +187,132 @@ async def delete_user(
 ):
     """Delete a user account (soft delete by deactivating)"""
     
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
-    
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
     # Prevent admin from deleting themselves
-    if user.id == current_user.id:
+    if user_id == current_user.id:
         raise HTTPException(status_code=400, detail="Cannot delete your own account")
     
     # Soft delete by deactivating
-    user.is_active = False
+    result = await db.execute(
+        update(User).where(User.id == user_id).values(is_active=False, **revoke_tokens_values())
+        .returning(User.token_version)
+    )
+    token_version = result.scalar_one_or_none()
+    if token_version is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    
     await db.commit()
+    invalidate_user(user_id)
+    remember_token_version(user_id, token_version)
     
     return None
 
 # ==================== Task Management ====================
 
+def application_counts():
+    """
+    LATERAL aggregate of a task's applications, total and per status, served
+    by the applications indexes leading with task_id. Correlates to the
+    enclosing VolunteerTask row.
+    """
+    return (
+        select(
+            func.count().label("application_count"),
+            func.count().filter(Application.status == ApplicationStatus.pending).label("pending_applications"),
+            func.count().filter(Application.status == ApplicationStatus.accepted).label("accepted_applications"),
+            func.count().filter(Application.status == ApplicationStatus.rejected).label("rejected_applications"),
+        )
+        .where(Application.task_id == VolunteerTask.id)
+        .lateral("application_counts")
+    )
+
+
+def admin_task_listing_query(
+    skip: int = 0,
+    limit: int = 50,
+    is_active: Optional[bool] = None,
+    search: Optional[str] = None,
+    sort: Optional[str] = None,
+):
+    """
+    One page of tasks with their application counts per status, in one
+    statement. The page is picked first in a subquery - best full-text
+    matches first when searching, most applications first for
+    sort=applications (a grouped LEFT JOIN counting every task's
+    applications), newest first otherwise - and only its rows get the
+    application_counts() aggregate and, when searching, the costly
+    ts_headline snippet.
+    """
+    page_columns = [VolunteerTask.id]
+    if search:
+        rank = search_rank(search).label("rank")
+        page_columns.append(rank)
+    if sort == "applications":
+        totals = (
+            select(Application.task_id, func.count().label("application_count"))
+            .group_by(Application.task_id)
+            .subquery("totals")
+        )
+        total = func.coalesce(totals.c.application_count, 0).label("application_count")
+        page_columns.append(total)
+    page = select(*page_columns)
+    if sort == "applications":
+        page = page.outerjoin(totals, totals.c.task_id == VolunteerTask.id)
+    if search:
+        page = page.where(search_match(search))
+    if is_active is not None:
+        page = page.where(VolunteerTask.is_active == is_active)
+    if sort == "applications":
+        page = page.order_by(total.desc(), desc(VolunteerTask.created_at), desc(VolunteerTask.id))
+    elif search:
+        page = page.order_by(rank.desc(), VolunteerTask.id)
+    else:
+        page = page.order_by(desc(VolunteerTask.created_at), desc(VolunteerTask.id))
+    page = page.offset(skip).limit(limit).subquery("page")
+
+    counts = application_counts()
+    columns = [
+        VolunteerTask.id,
+        VolunteerTask.title,
+        VolunteerTask.description,
+        VolunteerTask.location,
+        VolunteerTask.skills_required,
+        VolunteerTask.posted_by_id,
+        VolunteerTask.is_active,
+        VolunteerTask.created_at,
+        *counts.c,
+    ]
+    if search:
+        columns.append(highlight(VolunteerTask.description, search).label("snippet"))
+    query = (
+        select(*columns)
+        .join(page, page.c.id == VolunteerTask.id)
+        .join(counts, true())
+    )
+    if sort == "applications":
+        return query.order_by(page.c.application_count.desc(), desc(VolunteerTask.created_at), desc(VolunteerTask.id))
+    if search:
+        return query.order_by(page.c.rank.desc(), VolunteerTask.id)
+    return query.order_by(desc(VolunteerTask.created_at), desc(VolunteerTask.id))
+
+
 @router.get("/tasks", response_model=List[TaskListAdmin])
 async def get_all_tasks(
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
     is_active: Optional[bool] = None,
     search: Optional[str] = None,
+    sort: Optional[str] = Query(
+        None, pattern="^applications$", description="applications: most applications first"
+    ),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_admin)
 ):
-    """Get all volunteer tasks with optional filtering"""
-    
-    query = select(VolunteerTask)
-    
-    # Apply filters
-    filters = []
-    if is_active is not None:
-        filters.append(VolunteerTask.is_active == is_active)
-    
-    if search:
-        search_filter = or_(
-            VolunteerTask.title.ilike(f"%{search}%"),
-            VolunteerTask.description.ilike(f"%{search}%")
-        )
-        filters.append(search_filter)
-    
-    if filters:
-        query = query.where(and_(*filters))
-    
-    query = query.order_by(desc(VolunteerTask.created_at)).offset(skip).limit(limit)
-    
-    result = await db.execute(query)
-    tasks = result.scalars().all()
-    
-    # Get application count for each task
-    tasks_with_counts = []
-    for task in tasks:
-        app_count_result = await db.execute(
-            select(func.count(Application.id)).where(Application.task_id == task.id)
-        )
-        app_count = app_count_result.scalar()
-        
-        task_dict = {
-            "id": task.id,
-            "title": task.title,
-            "description": task.description,
-            "location": task.location,
-            "skills_required": task.skills_required,
-            "posted_by_id": task.posted_by_id,
-            "is_active": task.is_active,
-            "created_at": task.created_at,
-            "application_count": app_count
-        }
-        tasks_with_counts.append(TaskListAdmin(**task_dict))
-    
-    return tasks_with_counts
+    """
+    Get all volunteer tasks with optional filtering, newest first (best
+    matches first when searching), with application counts per status
+    """
+    result = await db.execute(admin_task_listing_query(skip, limit, is_active, search, sort))
+    return [TaskListAdmin.model_validate(row, from_attributes=True) for row in result]
 
 @router.get("/tasks/{task_id}")
 async def get_task_details(
@@ -332,14 +356,20 @@ async def update_task_status(
 ):
     """Activate or deactivate a task"""
     
-    result = await db.execute(select(VolunteerTask).where(VolunteerTask.id == task_id))
+    result = await db.execute(
+        update(VolunteerTask)
+        .where(VolunteerTask.id == task_id)
+        .values(is_active=status_update.is_active, version=VolunteerTask.version + 1)
+        .returning(VolunteerTask)
+    )
     task = result.scalar_one_or_none()
     
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    task.is_active = status_update.is_active
     await db.commit()
+    task_skill_index.upsert_task(task)
+    response_cache.invalidate_task(task_id)
     
     return status_update
 
@@ -351,15 +381,19 @@ async def delete_task(
 ):
     """Delete a task (soft delete by deactivating)"""
     
-    result = await db.execute(select(VolunteerTask).where(VolunteerTask.id == task_id))
-    task = result.scalar_one_or_none()
-    
-    if not task:
+    # Soft delete
+    result = await db.execute(
+        update(VolunteerTask)
+        .where(VolunteerTask.id == task_id)
+        .values(is_active=False, version=VolunteerTask.version + 1)
+        .returning(VolunteerTask.id)
+    )
+    if result.scalar_one_or_none() is None:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    # Soft delete
-    task.is_active = False
     await db.commit()
+    task_skill_index.remove_task(task_id)
+    response_cache.invalidate_task(task_id)
     
     return None
 
@@ -431,15 +465,19 @@ async def update_application_status(
 ):
     """Update application status (approve/reject)"""
     
-    result = await db.execute(select(Application).where(Application.id == application_id))
-    application = result.scalar_one_or_none()
+    result = await db.execute(
+        application_status_statement(status_update.status, owned=False), {"application_id": application_id}
+    )
+    application = result.one_or_none()
     
     if not application:
         raise HTTPException(status_code=404, detail="Application not found")
+    if application.id is None:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="Task has no free volunteer slots")
     
-    application.status = status_update.status
     await db.commit()
-    await db.refresh(application)
+    response_cache.invalidate_task(application.task_id)
     
     return {
         "message": "Application status updated successfully",
@@ -457,20 +495,10 @@ async def get_system_health(
     """Get system health status"""
     
     try:
-        # Test database connection
-        await db.execute(select(func.count(User.id)))
+        # Users, tasks and applications from the counters (also tests the connection)
+        counts = await read_counters(db)
         database_connected = True
-        
-        # Count total records across all tables
-        users_count = await db.execute(select(func.count(User.id)))
-        tasks_count = await db.execute(select(func.count(VolunteerTask.id)))
-        apps_count = await db.execute(select(func.count(Application.id)))
-        
-        total_records = (
-            users_count.scalar() + 
-            tasks_count.scalar() + 
-            apps_count.scalar()
-        )
+        total_records = counts["total_users"] + counts["total_tasks"] + counts["total_applications"]
         
     except Exception as e:
         database_connected = False
@@ -482,6 +510,49 @@ async def get_system_health(
         uptime="System running"  # You can implement actual uptime tracking
     )
 
+@router.post("/system/counters/reconcile", response_model=CounterReconciliation)
+async def reconcile_platform_counters(
+    repair: bool = Query(False, description="Rewrite drifted counters from the recount"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_admin)
+):
+    """Recount users, tasks and applications and report how far the platform counters have drifted"""
+    return await reconcile_counters(db, repair=repair)
+
+@router.get("/system/metrics")
+async def get_system_metrics(request: Request, current_user: User = Depends(require_admin)):
+    """Get startup timings, in-process caches, dashboard snapshot, recommendation index, skill catalog, notification and password hashing counters for this worker"""
+    return {
+        "startup": getattr(request.app.state, "startup_report", None),
+        "user_cache": user_cache.stats(),
+        "jwt_cache": verified_token_cache.stats(),
+        "recommendation_index": task_skill_index.stats(),
+        "skill_catalog": skill_catalog.stats(),
+        "dashboard_stats": dashboard_stats_snapshot.stats(),
+        "task_response_cache": response_cache.stats(),
+        "notifications": notification_hub.stats(),
+        "password_hashing": password_hasher.stats()
+    }
+
+# ==================== Data Export ====================
+
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+@router.get("/export/{table}")
+async def export_table(
+    table: str = Path(..., pattern="^(tasks|users|applications)$"),
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    gzip: bool = False,
+    current_user: User = Depends(require_admin)
+):
+    """Stream every row of a table as NDJSON or CSV (optionally gzipped) without paging"""
+    filename = f"{table}.{format}" + (".gz" if gzip else "")
+    return StreamingResponse(
+        export_rows(table, format, compress=gzip),
+        media_type="application/gzip" if gzip else EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
 # ==================== Recent Activity ====================
 
 @router.get("/activity/recent")
@@ -1,15 +1,98 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy import update, delete, func, literal, true, desc, tuple_
+from sqlalchemy.dialects.postgresql import insert, aggregate_order_by
+import uuid
+from typing import Optional
 from uuid import UUID
-from ..schemas.application import ApplicationCreate, ApplicationRead
+from ..schemas.application import (
+    ApplicationCreate,
+    ApplicationRead,
+    ApplicantPage,
+    ApplicationTaskSummary,
+    MyApplicationRead,
+    MyApplicationPage,
+    ApplicationBulkStatusUpdate,
+    ApplicationBulkStatusResult,
+)
 from ..models.applications import Application, ApplicationStatus
 from ..models.volunteer_task import VolunteerTask
+from ..models.user import User, Roles
+from ..models.skill import Skill, VolunteerSkill
 from ..database import get_db
 from ..auth.dependencies import require_roles
+from ..services.pagination import encode_cursor, decode_cursor
+from ..services.task_capacity import (
+    status_change_statement,
+    application_status_statement,
+    release_slot_statement,
+)
+from ..services.response_cache import invalidate_task, body_etag, conditional_response
+from ..services.notifications import (
+    notification_hub,
+    application_event_column,
+    application_event_statement,
+    event_stream,
+    task_topic,
+    volunteer_topic,
+)
+from ..config import settings
+from .task import parse_csv_param
 
 router = APIRouter(prefix="/applications", tags=["applications"])
 
+# Relations GET /applications/task/{task_id} can embed with ?include=
+APPLICANT_INCLUDES = {"volunteer", "skills"}
+
+
+def apply_statement(task_id: UUID, volunteer_id: UUID):
+    """
+    Apply in one round trip:
+        WITH task AS (SELECT id, accepted_count >= max_volunteers AS full
+                      FROM volunteer_tasks WHERE id = :task AND is_active),
+             inserted AS (INSERT INTO applications ... SELECT ... FROM task WHERE NOT full
+                          ON CONFLICT (task_id, volunteer_id) DO NOTHING RETURNING ...)
+        SELECT (SELECT count(*) FROM task) AS task_found, (SELECT full FROM task) AS task_full,
+               inserted.*, pg_notify(...) FROM (SELECT 1) LEFT JOIN inserted
+    task_found = 0 means missing/inactive task, task_full that every slot is
+    taken; otherwise a NULL id means the volunteer already applied. A new
+    application is announced on the notification channel when the
+    transaction commits.
+    """
+    task = (
+        select(
+            VolunteerTask.id,
+            func.coalesce(VolunteerTask.accepted_count >= VolunteerTask.max_volunteers, False).label("full"),
+        )
+        .where(VolunteerTask.id == task_id, VolunteerTask.is_active == True)
+        .cte("task")
+    )
+    columns = ["id", "task_id", "volunteer_id", "status", "applied_at"]
+    inserted = (
+        insert(Application)
+        .from_select(
+            columns,
+            select(
+                literal(uuid.uuid4(), Application.id.type),
+                task.c.id,
+                literal(volunteer_id, Application.volunteer_id.type),
+                literal(ApplicationStatus.pending, Application.status.type),
+                func.now(),
+            ).where(task.c.full == False),
+        )
+        .on_conflict_do_nothing(constraint="uq_applications_task_volunteer")
+        .returning(*[Application.__table__.c[name] for name in columns])
+        .cte("inserted")
+    )
+    task_found = select(func.count()).select_from(task).scalar_subquery().label("task_found")
+    task_full = select(task.c.full).scalar_subquery().label("task_full")
+    anchor = select(literal(1).label("one")).subquery()
+    return select(
+        task_found, task_full, *inserted.c, application_event_column("application.created", inserted.c)
+    ).select_from(anchor.outerjoin(inserted, true()))
+
 
 # Apply for a task (Volunteer only)
 @router.post("/", response_model=ApplicationRead)
@@ -18,74 +101,307 @@ async def apply_for_task(
     current_user=Depends(require_roles("volunteer")),
     db: AsyncSession = Depends(get_db)
 ):
-    # Ensure volunteer_id is always the current user
-    application.volunteer_id = current_user.id
+    # volunteer_id is always the current user
+    try:
+        result = await db.execute(apply_statement(application.task_id, current_user.id))
+        row = result.one()
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(status_code=500, detail=f"Database error: {e}")
 
-    # Check if task exists
-    task_result = await db.execute(select(VolunteerTask).where(VolunteerTask.id == application.task_id))
-    task = task_result.scalar_one_or_none()
-    if not task:
+    if not row.task_found:
         raise HTTPException(status_code=404, detail="Task not found")
+    if row.task_full:
+        raise HTTPException(status_code=409, detail="Task has no free volunteer slots")
+    if row.id is None:
+        raise HTTPException(status_code=400, detail="Already applied for this task")
+    return {
+        "id": row.id,
+        "task_id": row.task_id,
+        "volunteer_id": row.volunteer_id,
+        "status": row.status,
+        "applied_at": row.applied_at,
+    }
 
-    # Check if already applied
-    existing_result = await db.execute(
-        select(Application).where(
-            Application.task_id == application.task_id,
-            Application.volunteer_id == current_user.id
-        )
+
+def event_stream_response(request: Request, topics) -> StreamingResponse:
+    subscription = notification_hub.subscribe(topics)
+    return StreamingResponse(
+        event_stream(request, subscription, settings.notification_heartbeat_seconds),
+        media_type="text/event-stream",
+        # X-Accel-Buffering: stop nginx from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
-    existing = existing_result.scalar_one_or_none()
-    if existing:
-        raise HTTPException(status_code=400, detail="Already applied for this task")
 
-    # Create new application
-    new_application = Application(
-        task_id=application.task_id,
-        volunteer_id=current_user.id
+
+# Live status changes of the caller's applications as server-sent events (Volunteer only)
+@router.get("/me/events")
+async def my_application_events(request: Request, current_user=Depends(require_roles("volunteer"))):
+    return event_stream_response(request, [volunteer_topic(current_user.id)])
+
+
+# Live applications and status changes for a task as server-sent events (NGO that posted the task)
+@router.get("/task/{task_id}/events")
+async def task_application_events(
+    task_id: UUID,
+    request: Request,
+    current_user=Depends(require_roles("ngo")),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Streams application.created, application.status_changed and
+    application.deleted events. A resync event means events were dropped
+    (slow client or listener reconnect): refetch GET /applications/task/{task_id}.
+    """
+    posted_by_id = await db.scalar(select(VolunteerTask.posted_by_id).where(VolunteerTask.id == task_id))
+    if posted_by_id is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    if posted_by_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized to view applications for this task")
+    return event_stream_response(request, [task_topic(task_id)])
+
+
+def my_applications_query(
+    volunteer_id: UUID,
+    cursor=None,
+    limit: int = 20,
+    status: Optional[ApplicationStatus] = None,
+):
+    """
+    The volunteer's applications with their task's title, location, state and
+    poster name, newest first, keyset-paginated on (applied_at, id) over
+    ix_applications_volunteer_id_applied_at. One extra row is fetched to tell
+    whether another page exists.
+    """
+    query = (
+        select(
+            Application,
+            VolunteerTask.title,
+            VolunteerTask.location,
+            VolunteerTask.is_active,
+            User.full_name.label("posted_by_name"),
+        )
+        .join(VolunteerTask, VolunteerTask.id == Application.task_id)
+        .join(User, User.id == VolunteerTask.posted_by_id)
+        .where(Application.volunteer_id == volunteer_id)
     )
-    db.add(new_application)
-    try:
-        await db.commit()
-    except Exception as e:
-        await db.rollback()
-        raise HTTPException(status_code=500, detail=f"Database error: {e}")
-    await db.refresh(new_application)
-    return new_application
+    if status is not None:
+        query = query.where(Application.status == status)
+    if cursor:
+        applied_at, application_id = cursor
+        query = query.where(tuple_(Application.applied_at, Application.id) < tuple_(applied_at, application_id))
+    return query.order_by(desc(Application.applied_at), desc(Application.id)).limit(limit + 1)
 
 
-# Get all applications for volunteer (Volunteer only)
-@router.get("/me", response_model=list[ApplicationRead])
+# Get the volunteer's applications with task summaries, one page at a time (Volunteer only)
+# Supports If-None-Match: an unchanged page is answered with 304
+@router.get("/me", response_model=MyApplicationPage)
 async def get_my_applications(
+    request: Request,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    status: Optional[ApplicationStatus] = None,
     current_user=Depends(require_roles("volunteer")),
     db: AsyncSession = Depends(get_db)
 ):
+    query = my_applications_query(current_user.id, decode_cursor(cursor), limit, status)
     try:
-        result = await db.execute(select(Application).where(Application.volunteer_id == current_user.id))
-        return result.scalars().all()
+        result = await db.execute(query)
+        rows = result.all()
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Database error: {e}")
 
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1].Application
+        next_cursor = encode_cursor(last.applied_at, last.id)
 
-# Get all applications for a task (NGO only)
-@router.get("/task/{task_id}", response_model=list[ApplicationRead])
+    page = MyApplicationPage(
+        items=[
+            MyApplicationRead(
+                id=row.Application.id,
+                task_id=row.Application.task_id,
+                volunteer_id=row.Application.volunteer_id,
+                status=row.Application.status,
+                applied_at=row.Application.applied_at,
+                task=ApplicationTaskSummary(
+                    id=row.Application.task_id,
+                    title=row.title,
+                    location=row.location,
+                    is_active=row.is_active,
+                    posted_by_name=row.posted_by_name,
+                ),
+            )
+            for row in rows
+        ],
+        next_cursor=next_cursor,
+    )
+    body = page.model_dump_json().encode()
+    return conditional_response(request, body_etag("my-applications", body), body)
+
+
+def applicant_listing_query(
+    task_id: UUID,
+    posted_by_id: UUID,
+    cursor=None,
+    limit: int = 20,
+    status: Optional[ApplicationStatus] = None,
+    include: frozenset = frozenset(),
+):
+    """
+    Applicants of one task, newest first, keyset-paginated on (applied_at, id)
+    and served by ix_applications_task_id_applied_at. The join on
+    volunteer_tasks restricts rows to the caller's task, so ownership costs no
+    extra round trip. include adds the volunteer's profile (join on users)
+    and their skill names (array_agg over volunteer_skills/skills) to the
+    same statement. One extra row is fetched to tell whether another page exists.
+    """
+    columns = [Application]
+    if "volunteer" in include:
+        columns += [User.full_name, User.email, User.location]
+    if "skills" in include:
+        skills = (
+            select(func.array_agg(aggregate_order_by(Skill.name, Skill.name)))
+            .select_from(VolunteerSkill)
+            .join(Skill, Skill.id == VolunteerSkill.skill_id)
+            .where(VolunteerSkill.user_id == Application.volunteer_id)
+            .scalar_subquery()
+        )
+        columns.append(skills.label("skills"))
+    query = (
+        select(*columns)
+        .join(VolunteerTask, VolunteerTask.id == Application.task_id)
+        .where(Application.task_id == task_id, VolunteerTask.posted_by_id == posted_by_id)
+    )
+    if "volunteer" in include:
+        query = query.join(User, User.id == Application.volunteer_id)
+    if status is not None:
+        query = query.where(Application.status == status)
+    if cursor:
+        applied_at, application_id = cursor
+        query = query.where(tuple_(Application.applied_at, Application.id) < tuple_(applied_at, application_id))
+    return query.order_by(desc(Application.applied_at), desc(Application.id)).limit(limit + 1)
+
+
+# Get the applicants of a task, one page at a time (NGO that posted the task)
+@router.get("/task/{task_id}", response_model=ApplicantPage)
 async def get_applications_for_task(
     task_id: UUID,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    status: Optional[ApplicationStatus] = None,
+    include: Optional[str] = Query(None, description="Comma-separated: volunteer, skills"),
     current_user=Depends(require_roles("ngo")),
     db: AsyncSession = Depends(get_db)
 ):
-    # Check if task exists
-    task_result = await db.execute(select(VolunteerTask).where(VolunteerTask.id == task_id))
-    task = task_result.scalar_one_or_none()
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
+    includes = frozenset(parse_csv_param(include))
+    unknown = includes - APPLICANT_INCLUDES
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown include: {', '.join(sorted(unknown))}")
+
+    query = applicant_listing_query(task_id, current_user.id, decode_cursor(cursor), limit, status, includes)
     try:
-        result = await db.execute(select(Application).where(Application.task_id == task_id))
-        return result.scalars().all()
+        result = await db.execute(query)
+        rows = result.all()
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Database error: {e}")
 
+    if not rows and cursor is None:
+        # Empty first page: tell an empty task from a missing or someone else's task
+        posted_by_id = await db.scalar(select(VolunteerTask.posted_by_id).where(VolunteerTask.id == task_id))
+        if posted_by_id is None:
+            raise HTTPException(status_code=404, detail="Task not found")
+        if posted_by_id != current_user.id:
+            raise HTTPException(status_code=403, detail="Not authorized to view applications for this task")
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1].Application
+        next_cursor = encode_cursor(last.applied_at, last.id)
+
+    items = []
+    for row in rows:
+        application = row.Application
+        item = {
+            "id": application.id,
+            "task_id": application.task_id,
+            "volunteer_id": application.volunteer_id,
+            "status": application.status,
+            "applied_at": application.applied_at,
+        }
+        if "volunteer" in includes:
+            item["volunteer"] = {
+                "id": application.volunteer_id,
+                "full_name": row.full_name,
+                "email": row.email,
+                "location": row.location,
+            }
+        if "skills" in includes:
+            item["skills"] = row.skills or []
+        items.append(item)
+    return {"items": items, "next_cursor": next_cursor}
+
+
+# Accept/reject many applications at once (NGO that posted the tasks)
+@router.patch("/bulk-status", response_model=ApplicationBulkStatusResult)
+async def bulk_update_application_status(
+    bulk_update: ApplicationBulkStatusUpdate,
+    current_user=Depends(require_roles("ngo")),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    One set-based status change restricted to the caller's tasks (see
+    status_change_statement). Accepting grants the tasks' free slots oldest
+    application first; the rest are reported as full. Ids that were not
+    matched are looked up afterwards to report them as not_found or forbidden.
+    """
+    criteria = [VolunteerTask.posted_by_id == current_user.id]
+    if bulk_update.application_ids is not None:
+        requested = list(dict.fromkeys(bulk_update.application_ids))
+        criteria.append(Application.id.in_(requested))
+    else:
+        criteria.append(Application.task_id == bulk_update.task_id)
+        if bulk_update.current_status is not None:
+            criteria.append(Application.status == bulk_update.current_status)
 
-# Update application status (NGO only)
+    result = await db.execute(status_change_statement(criteria, bulk_update.status))
+    rows = result.all()
+    results = {row.target_id: "updated" if row.id is not None else "full" for row in rows}
+    updated = sum(1 for outcome in results.values() if outcome == "updated")
+
+    if bulk_update.application_ids is not None:
+        missing = [application_id for application_id in requested if application_id not in results]
+        if missing:
+            existing = await db.execute(select(Application.id).where(Application.id.in_(missing)))
+            existing_ids = set(existing.scalars().all())
+            for application_id in missing:
+                results[application_id] = "forbidden" if application_id in existing_ids else "not_found"
+        items = [{"id": application_id, "result": results[application_id]} for application_id in requested]
+    else:
+        if not rows:
+            posted_by_id = await db.scalar(
+                select(VolunteerTask.posted_by_id).where(VolunteerTask.id == bulk_update.task_id)
+            )
+            if posted_by_id is None:
+                raise HTTPException(status_code=404, detail="Task not found")
+            if posted_by_id != current_user.id:
+                raise HTTPException(status_code=403, detail="Not authorized to update applications for this task")
+        items = [{"id": application_id, "result": outcome} for application_id, outcome in results.items()]
+
+    try:
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(status_code=500, detail=f"Database error: {e}")
+    for task_id in {row.target_task_id for row in rows if row.id is not None}:
+        invalidate_task(task_id)
+    return {"status": bulk_update.status, "updated": updated, "results": items}
+
+
+# Update application status (NGO that posted the task) in one statement
 @router.patch("/{application_id}/status", response_model=ApplicationRead)
 async def update_application_status(
     application_id: UUID,
@@ -93,20 +409,35 @@ async def update_application_status(
     current_user=Depends(require_roles("ngo")),
     db: AsyncSession = Depends(get_db)
 ):
-    # Check if application exists
-    result = await db.execute(select(Application).where(Application.id == application_id))
-    application = result.scalar_one_or_none()
-    if not application:
-        raise HTTPException(status_code=404, detail="Application not found")
+    """Accepting takes one of the task's free slots (409 when it is full); un-accepting releases it"""
+    result = await db.execute(
+        application_status_statement(status, owned=True),
+        {"application_id": application_id, "owner_id": current_user.id},
+    )
+    row = result.one_or_none()
+    if row is None:
+        # No row matched: tell a missing application from someone else's task
+        exists = await db.scalar(select(Application.id).where(Application.id == application_id))
+        if exists is None:
+            raise HTTPException(status_code=404, detail="Application not found")
+        raise HTTPException(status_code=403, detail="Not authorized to update this application")
+    if row.id is None:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="Task has no free volunteer slots")
 
-    application.status = status
     try:
         await db.commit()
     except Exception as e:
         await db.rollback()
         raise HTTPException(status_code=500, detail=f"Database error: {e}")
-    await db.refresh(application)
-    return application
+    invalidate_task(row.task_id)
+    return {
+        "id": row.id,
+        "task_id": row.task_id,
+        "volunteer_id": row.volunteer_id,
+        "status": row.status,
+        "applied_at": row.applied_at,
+    }
 
 
 @router.delete("/{application_id}", response_model=dict)
@@ -122,21 +453,30 @@ async def delete_application(
         raise HTTPException(status_code=404, detail="Application not found")
 
     # Check permissions
-    if current_user.role == "volunteer" and application.volunteer_id != current_user.id:
+    if current_user.role == Roles.volunteer and application.volunteer_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to delete this application")
-    if current_user.role == "ngo":
+    if current_user.role == Roles.ngo:
         # Optional: check that NGO owns the task
         task_result = await db.execute(select(VolunteerTask).where(VolunteerTask.id == application.task_id))
         task = task_result.scalar_one_or_none()
         if not task or task.posted_by_id != current_user.id:
             raise HTTPException(status_code=403, detail="Not authorized to delete this application")
 
-    # Delete the application
+    # Delete the application; the row lock taken by DELETE makes the returned status current
     try:
-        await db.delete(application)
+        result = await db.execute(
+            delete(Application).where(Application.id == application_id).returning(Application.status)
+        )
+        deleted_status = result.scalar_one_or_none()
+        if deleted_status == ApplicationStatus.accepted:
+            await db.execute(release_slot_statement(application.task_id))
+        if deleted_status is not None:
+            await db.execute(application_event_statement("application.deleted", application))
         await db.commit()
     except Exception as e:
         await db.rollback()
         raise HTTPException(status_code=500, detail=f"Database error: {e}")
+    if deleted_status == ApplicationStatus.accepted:
+        invalidate_task(application.task_id)
 
     return {"detail": "Application deleted successfully"}
\ No newline at end of file
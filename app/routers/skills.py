@@ -1,13 +1,14 @@
 # app/routers/skills.py
 import uuid
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from ..database import get_db
 from ..models.user import User, Roles
 from ..models.skill import Skill, VolunteerSkill
-from ..schemas.skill import SkillList, SkillRead
-from ..auth.dependencies import get_current_user  # JWT dependency
+from ..schemas.skill import SkillList, SkillRead, SkillSuggestion
+from ..services.skill_catalog import save_volunteer_skills, skill_catalog
+from ..auth.dependencies import TokenUser, get_current_user, get_token_user  # JWT dependencies
 
 router = APIRouter(prefix="/skills", tags=["Skills"])
 
@@ -19,25 +20,8 @@ async def add_skills_to_user(skill_list: SkillList,
     if current_user.role != Roles.volunteer:
         raise HTTPException(status_code=400, detail="Only volunteers can have skills")
 
-    for skill_name in skill_list.skills:
-        # check if skill exists
-        skill_result = await db.execute(select(Skill).where(Skill.name == skill_name))
-        skill = skill_result.scalars().first()
-        if not skill:
-            skill = Skill(name=skill_name)
-            db.add(skill)
-            await db.flush()
-
-        # check if already linked
-        vs_result = await db.execute(
-            select(VolunteerSkill).where(
-                VolunteerSkill.user_id == current_user.id,
-                VolunteerSkill.skill_id == skill.id
-            )
-        )
-        if not vs_result.scalars().first():
-            db.add(VolunteerSkill(user_id=current_user.id, skill_id=skill.id))
-
+    # One statement registers unknown names, one links the skills not linked yet
+    await save_volunteer_skills(db, current_user.id, skill_list.skills)
     await db.commit()
     return {"message": "Skills added successfully"}
 
@@ -58,18 +42,35 @@ async def get_user_skills(db: AsyncSession = Depends(get_db),
     return skills
 
 
+# READ (Catalog autocomplete)
+@router.get("/catalog", response_model=list[SkillSuggestion])
+async def suggest_skills(prefix: str = Query("", max_length=100),
+                         limit: int = Query(10, ge=1, le=50),
+                         current_user: TokenUser = Depends(get_token_user)):
+    """
+    Existing skill names for a typed prefix, so clients pick a catalog
+    spelling instead of creating near-duplicates. Served from this worker's
+    in-memory catalog (case, spaces, '-' and '_' are ignored, and one typo
+    is tolerated); the database is only read when the catalog is first loaded.
+    Authenticated callers only; the caller comes from the token claims, so
+    no user row is loaded.
+    """
+    await skill_catalog.ensure_loaded()
+    return [SkillSuggestion(name=name, volunteer_count=count) for name, count in skill_catalog.suggest(prefix, limit)]
+
 # UPDATE (Replace skills)
 @router.put("/")
 async def update_user_skills(skill_list: SkillList, 
                              db: AsyncSession = Depends(get_db),
                              current_user: User = Depends(get_current_user)):
-    # delete old links
-    await db.execute(
-        f"DELETE FROM volunteer_skills WHERE user_id = '{current_user.id}'"
-    )
+    if current_user.role != Roles.volunteer:
+        raise HTTPException(status_code=400, detail="Only volunteers can have skills")
+
+    # Only the difference is written: links outside the new set are deleted,
+    # missing ones inserted, all in the same transaction
+    await save_volunteer_skills(db, current_user.id, skill_list.skills, replace=True)
     await db.commit()
-    # add new ones
-    return await add_skills_to_user(skill_list, db, current_user)
+    return {"message": "Skills added successfully"}
 
 # DELETE (Remove single skill)
 @router.delete("/{skill_id}")
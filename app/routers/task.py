@@ -1,8 +1,32 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from ..schemas.task import TaskCreate, TaskRead
+from sqlalchemy import desc, func, tuple_, update
+from sqlalchemy.exc import IntegrityError
+from typing import List, Optional
+from ..schemas.task import TaskCreate, TaskRead, TaskPage, TaskSearchResult, TaskRecommendation, BulkTaskImportResult
 from ..models.volunteer_task import VolunteerTask
+from ..models.user import Roles
+from ..models.skill import Skill, VolunteerSkill
+from ..models.applications import Application
 from ..database import get_db
+from ..services.pagination import encode_cursor, decode_cursor
+from ..services.task_search import task_search_query
+from ..services.skill_catalog import canonicalize_skills, register_skill_names
+from ..services.recommendations import task_skill_index
+from ..services.task_import import COPY_COLUMNS, TaskImport, iter_lines, csv_records, ndjson_records
+from ..services.response_cache import (
+    task_response_cache,
+    feed_response_cache,
+    feed_cache_key,
+    current_version,
+    cache_task_response,
+    invalidate_task,
+    invalidate_feed,
+    task_etag,
+    feed_etag,
+    conditional_response,
+)
+from ..config import settings
 from sqlalchemy.future import select
 from uuid import UUID
 from ..auth.dependencies import require_roles,get_current_user
@@ -16,74 +40,280 @@ async def create_task(task: TaskCreate, current_user=Depends(require_roles("ngo"
         title=task.title,
         description=task.description,
         location=task.location,
-        skills_required=task.skills_required,
+        skills_required=await canonicalize_skills(db, task.skills_required, register=True),
+        max_volunteers=task.max_volunteers,
         posted_by_id=current_user.id
     )
     db.add(new_task)
     await db.commit()
     await db.refresh(new_task)
+    task_skill_index.upsert_task(new_task)
+    invalidate_task(new_task.id)
     return new_task
 
-# Get all active tasks (any authenticated user)
-@router.get("/", response_model=list[TaskRead])
-async def get_tasks(current_user=Depends(get_current_user), db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(VolunteerTask).where(VolunteerTask.is_active == True))
-    tasks = result.scalars().all()
-    return tasks
+BULK_IMPORT_PARSERS = {
+    "text/csv": csv_records,
+    "application/x-ndjson": ndjson_records,
+    "application/ndjson": ndjson_records,
+    "application/jsonl": ndjson_records,
+}
 
-# Get task by ID (any authenticated user)
+# Create many tasks from a streamed CSV or NDJSON body (NGO only)
+@router.post("/bulk", response_model=BulkTaskImportResult)
+async def bulk_create_tasks(request: Request, current_user=Depends(require_roles("ngo")), db: AsyncSession = Depends(get_db)):
+    """
+    CSV needs a header row with title and description (location,
+    skills_required and max_volunteers optional; skills separated by ';' or
+    '|'). NDJSON takes one TaskCreate object per line. Valid rows are stored
+    in one transaction; invalid ones are listed in the report.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    parse_records = BULK_IMPORT_PARSERS.get(content_type)
+    if parse_records is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Content-Type must be one of: {', '.join(BULK_IMPORT_PARSERS)}",
+        )
+
+    importer = TaskImport(db, current_user.id, max_errors=settings.bulk_import_max_errors)
+    chunk = []
+    try:
+        async for record in parse_records(iter_lines(request.stream())):
+            if importer.received + len(chunk) >= settings.bulk_import_max_rows:
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail=f"At most {settings.bulk_import_max_rows} rows per upload",
+                )
+            chunk.append(record)
+            if len(chunk) >= settings.bulk_import_chunk_size:
+                await importer.add_chunk(chunk)
+                chunk = []
+        if chunk:
+            await importer.add_chunk(chunk)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    await db.commit()
+
+    for record in importer.inserted:
+        task = dict(zip(COPY_COLUMNS, record))
+        task_skill_index.upsert(task["id"], task["is_active"], task["skills_required"], task["location"], task["created_at"])
+    invalidate_feed()
+    return importer.report()
+
+def parse_csv_param(value: Optional[str]) -> List[str]:
+    """Split a comma-separated query parameter, dropping empty entries"""
+    if not value:
+        return []
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+def task_feed_query(
+    cursor=None,
+    limit: int = 20,
+    location: Optional[str] = None,
+    skills: Optional[List[str]] = None,
+    match_all: bool = False,
+):
+    """
+    Active tasks, newest first, keyset-paginated on (created_at, id).
+    Served by the partial index ix_volunteer_tasks_active_feed; one extra row
+    is fetched to tell whether another page exists. Skill filters use the GIN
+    index on skills_required (&& for any, @> for all).
+    """
+    query = select(VolunteerTask).where(VolunteerTask.is_active == True)
+    if location:
+        query = query.where(func.lower(VolunteerTask.location) == location.strip().lower())
+    if skills:
+        if match_all:
+            query = query.where(VolunteerTask.skills_required.contains(skills))
+        else:
+            query = query.where(VolunteerTask.skills_required.overlap(skills))
+    if cursor:
+        created_at, task_id = cursor
+        query = query.where(tuple_(VolunteerTask.created_at, VolunteerTask.id) < tuple_(created_at, task_id))
+    return query.order_by(desc(VolunteerTask.created_at), desc(VolunteerTask.id)).limit(limit + 1)
+
+# Get active tasks, one page at a time (any authenticated user)
+# Supports If-None-Match; pages are served from the response cache until a task changes
+@router.get("/", response_model=TaskPage)
+async def get_tasks(
+    request: Request,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    location: Optional[str] = None,
+    skills: Optional[str] = Query(None, description="Comma-separated skill names"),
+    match: str = Query("any", pattern="^(any|all)$", description="Require any or all of the skills"),
+    current_user=Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    skill_params = parse_csv_param(skills)
+    cache_key = feed_cache_key(
+        cursor, limit, (location or "").strip().lower(), tuple(skill_params), match
+    )
+    cached = feed_response_cache.get(cache_key)
+    if cached is None:
+        skill_names = await canonicalize_skills(db, skill_params)
+        query = task_feed_query(decode_cursor(cursor), limit, location, skill_names, match == "all")
+        result = await db.execute(query)
+        tasks = result.scalars().all()
+
+        next_cursor = None
+        if len(tasks) > limit:
+            tasks = tasks[:limit]
+            next_cursor = encode_cursor(tasks[-1].created_at, tasks[-1].id)
+        page = TaskPage(
+            items=[TaskRead.model_validate(task, from_attributes=True) for task in tasks],
+            next_cursor=next_cursor,
+        )
+        cached = (feed_etag(tasks, next_cursor), page.model_dump_json().encode())
+        feed_response_cache.set(cache_key, cached)
+    return conditional_response(request, *cached)
+
+# Full-text search over active tasks, best matches first (any authenticated user)
+@router.get("/search", response_model=list[TaskSearchResult])
+async def search_tasks(
+    q: str = Query(..., min_length=1, max_length=200),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=50),
+    current_user=Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    result = await db.execute(task_search_query(q, skip, limit))
+    return [
+        {
+            **TaskRead.model_validate(task, from_attributes=True).model_dump(),
+            "rank": rank,
+            "title_highlight": title_highlight,
+            "snippet": snippet,
+        }
+        for task, rank, title_highlight, snippet in result.all()
+    ]
+
+# Active tasks ranked by overlap with the caller's skills (any authenticated user)
+@router.get("/recommended", response_model=list[TaskRecommendation])
+async def get_recommended_tasks(
+    limit: int = Query(20, ge=1, le=50),
+    recency_weight: float = Query(0.0, ge=0, description="Boost for new tasks; halves every RECOMMENDATION_HALF_LIFE_DAYS"),
+    location_weight: float = Query(0.0, ge=0, description="Boost for tasks in the caller's location"),
+    current_user=Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    skills_result = await db.execute(
+        select(Skill.name).join(VolunteerSkill, VolunteerSkill.skill_id == Skill.id)
+        .where(VolunteerSkill.user_id == current_user.id)
+    )
+    skill_names = skills_result.scalars().all()
+    if not skill_names:
+        return []
+
+    applied_result = await db.execute(
+        select(Application.task_id).where(Application.volunteer_id == current_user.id)
+    )
+    await task_skill_index.ensure_fresh(db)
+    ranked = task_skill_index.rank(
+        skill_names,
+        limit=limit,
+        location=current_user.location,
+        recency_weight=recency_weight,
+        location_weight=location_weight,
+        half_life_days=settings.recommendation_half_life_days,
+        exclude=set(applied_result.scalars().all()),
+    )
+    if not ranked:
+        return []
+
+    # The index may lag changes made by other workers, so re-check is_active
+    tasks_result = await db.execute(
+        select(VolunteerTask).where(
+            VolunteerTask.id.in_([task_id for task_id, _, _ in ranked]),
+            VolunteerTask.is_active == True,
+        )
+    )
+    tasks = {task.id: task for task in tasks_result.scalars().all()}
+    return [
+        {
+            **TaskRead.model_validate(tasks[task_id], from_attributes=True).model_dump(),
+            "score": round(score, 4),
+            "matched_skills": matched_skills,
+        }
+        for task_id, score, matched_skills in ranked
+        if task_id in tasks
+    ]
+
+# Get task by ID (any authenticated user); supports If-None-Match
 @router.get("/{task_id}", response_model=TaskRead)
-async def get_task(task_id: UUID, current_user=Depends(get_current_user), db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(VolunteerTask).where(VolunteerTask.id == task_id))
-    task = result.scalar_one_or_none()
-    if not task:
+async def get_task(task_id: UUID, request: Request, current_user=Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+    cached = task_response_cache.get(task_id)
+    if cached is None:
+        read_version = current_version()
+        result = await db.execute(select(VolunteerTask).where(VolunteerTask.id == task_id))
+        task = result.scalar_one_or_none()
+        if not task:
+            raise HTTPException(status_code=404, detail="Task not found")
+        cached = (task_etag(task), TaskRead.model_validate(task, from_attributes=True).model_dump_json().encode())
+        cache_task_response(task_id, cached, read_version)
+    return conditional_response(request, *cached)
+
+def owned_task_filter(task_id: UUID, current_user):
+    """WHERE clause for writes: the task itself, restricted to its poster unless the caller is an admin"""
+    criteria = [VolunteerTask.id == task_id]
+    if current_user.role != Roles.admin:
+        criteria.append(VolunteerTask.posted_by_id == current_user.id)
+    return criteria
+
+async def raise_task_not_writable(db: AsyncSession, task_id: UUID, action: str):
+    """The guarded write matched no row: 404 if the task is missing, otherwise 403"""
+    exists = await db.scalar(select(VolunteerTask.id).where(VolunteerTask.id == task_id))
+    if exists is None:
         raise HTTPException(status_code=404, detail="Task not found")
-    return task
+    raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=f"Not authorized to {action} this task")
 
-# Update task (NGO owner or admin)
+# Update task (NGO owner or admin) with a single UPDATE ... RETURNING
 @router.put("/{task_id}", response_model=TaskRead)
-async def update_task(task_id: UUID, task_update: TaskCreate, current_user=Depends(get_current_user), db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(VolunteerTask).where(VolunteerTask.id == task_id))
+async def update_task(task_id: UUID, task_update: TaskCreate, current_user=Depends(require_roles("ngo", "admin")), db: AsyncSession = Depends(get_db)):
+    # New skill names are only registered once the guarded UPDATE has matched the task
+    skills_required = await canonicalize_skills(db, task_update.skills_required)
+    try:
+        result = await db.execute(
+            update(VolunteerTask)
+            .where(*owned_task_filter(task_id, current_user))
+            .values(
+                title=task_update.title,
+                description=task_update.description,
+                location=task_update.location,
+                skills_required=skills_required,
+                max_volunteers=task_update.max_volunteers,
+                version=VolunteerTask.version + 1,
+            )
+            .returning(VolunteerTask)
+        )
+    except IntegrityError:
+        # ck_volunteer_tasks_accepted_count: capacity below the volunteers already accepted
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="max_volunteers is below the number of accepted volunteers")
     task = result.scalar_one_or_none()
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
+    if task is None:
+        await raise_task_not_writable(db, task_id, "update")
+    await register_skill_names(db, skills_required)
 
-    # Permission: NGO who posted the task or admin can update
-    if (getattr(current_user, "role", None) != "admin") and (task.posted_by_id != current_user.id):
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to update this task")
-
-    # Update allowed fields
-    task.title = task_update.title # type: ignore
-    task.description = task_update.description # type: ignore
-    task.location = task_update.location # type: ignore
-    task.skills_required = task_update.skills_required # type: ignore
-    # if your TaskCreate includes start_date/end_date/status, update them too:
-    if hasattr(task_update, "start_date"):
-        task.start_date = getattr(task_update, "start_date", task.start_date)
-    if hasattr(task_update, "end_date"):
-        task.end_date = getattr(task_update, "end_date", task.end_date)
-    if hasattr(task_update, "status"):
-        task.status = getattr(task_update, "status", task.status)
-
-    db.add(task)
     await db.commit()
-    await db.refresh(task)
+    task_skill_index.upsert_task(task)
+    invalidate_task(task.id)
     return task
 
 # Delete task (soft delete by default) - NGO owner or admin
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_task(task_id: UUID, current_user=Depends(get_current_user), db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(VolunteerTask).where(VolunteerTask.id == task_id))
-    task = result.scalar_one_or_none()
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
-
-    # Permission: NGO who posted the task or admin can delete
-    if (getattr(current_user, "role", None) != "admin") and (task.posted_by_id != current_user.id):
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to delete this task")
-
+async def delete_task(task_id: UUID, current_user=Depends(require_roles("ngo", "admin")), db: AsyncSession = Depends(get_db)):
     # Soft delete: mark as inactive
-    task.is_active = False
-    db.add(task)
+    result = await db.execute(
+        update(VolunteerTask)
+        .where(*owned_task_filter(task_id, current_user))
+        .values(is_active=False, version=VolunteerTask.version + 1)
+        .returning(VolunteerTask.id)
+    )
+    if result.scalar_one_or_none() is None:
+        await raise_task_not_writable(db, task_id, "delete")
+
     await db.commit()
+    task_skill_index.remove_task(task_id)
+    invalidate_task(task_id)
     return None
@@ -3,16 +3,21 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from ..schemas.user import (
     UserCreate, UserRead, UserLogin, UserUpdate, 
     ForgotPasswordRequest, VerifyOTPRequest, ResetPasswordRequest,
-    SignupOTPRequest, SignupVerifyOTP
+    SignupOTPRequest, SignupVerifyOTP, RefreshTokenRequest
 )
 from ..models.user import User
 from ..models.password_reset import PasswordResetOTP, OTPType
 from fastapi.security import OAuth2PasswordRequestForm
 from ..database import get_db
 from ..auth.auth import hash_password, verify_password
-from ..auth.jwt_handler import create_access_token
+from ..auth.jwt_handler import create_token_pair, decode_access_token
+from ..auth.revocation import is_token_revoked, remember_token_version, revoke_tokens_values
+from jose import JWTError
+from uuid import UUID
 from sqlalchemy.future import select
+from sqlalchemy import update
 from ..auth.dependencies import get_current_user, require_roles
+from ..auth.user_cache import invalidate_user
 from ..services.email_service_ssl import generate_otp, get_otp_expiration, send_otp_email, send_signup_otp_email, is_otp_expired
 from datetime import datetime, timezone
 router = APIRouter(prefix="/users", tags=["users"])
@@ -117,7 +122,7 @@ async def verify_signup_otp(
     new_user = User(
         full_name=request.full_name,
         email=request.email,
-        password_hash=hash_password(request.password),
+        password_hash=await hash_password(request.password),
         role=request.role,
         location=request.location
     )
@@ -141,18 +146,38 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSessi
     result = await db.execute(select(User).where(User.email == form_data.username))
     user = result.scalar_one_or_none()
     
-    if not user or not verify_password(form_data.password, user.password_hash):
+    if not user or not await verify_password(form_data.password, user.password_hash):
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
-    token = create_access_token({"sub": str(user.id)})
-    return {"access_token": token, "token_type": "bearer"}
+    return create_token_pair(user)
+
+# Exchange a refresh token for a new access/refresh token pair
+@router.post("/token/refresh")
+async def refresh_token(request: RefreshTokenRequest, db: AsyncSession = Depends(get_db)):
+    try:
+        claims = decode_access_token(request.refresh_token)
+    except JWTError:
+        raise HTTPException(status_code=401, detail="Invalid refresh token")
+
+    if claims.get("type") != "refresh" or claims.get("sub") is None:
+        raise HTTPException(status_code=401, detail="Invalid refresh token")
+    if await is_token_revoked(db, claims):
+        raise HTTPException(status_code=401, detail="Token has been revoked")
+
+    # Reload the user so the new access token carries the current role and status
+    result = await db.execute(select(User).where(User.id == UUID(claims["sub"])))
+    user = result.scalar_one_or_none()
+    if not user or not user.is_active:
+        raise HTTPException(status_code=401, detail="Invalid refresh token")
+
+    return create_token_pair(user)
 
 # Get current user profile
 @router.get("/me", response_model=UserRead)
 async def get_profile(current_user=Depends(get_current_user)):
     return current_user
 
-# Update current user profile
+# Update current user profile with a single UPDATE ... RETURNING
 @router.patch("/me", response_model=UserRead)
 async def update_profile(
     user_update: UserUpdate,
@@ -160,14 +185,23 @@ async def update_profile(
     db: AsyncSession = Depends(get_db)
 ):
     # Update only provided fields
+    changes = {}
     if user_update.full_name is not None:
-        current_user.full_name = user_update.full_name
+        changes["full_name"] = user_update.full_name
     if user_update.location is not None:
-        current_user.location = user_update.location
-    
+        changes["location"] = user_update.location
+    if not changes:
+        return current_user
+
+    result = await db.execute(
+        update(User).where(User.id == current_user.id).values(**changes).returning(User)
+    )
+    user = result.scalar_one_or_none()
+    if user is None:
+        raise HTTPException(status_code=404, detail="User not found")
     await db.commit()
-    await db.refresh(current_user)
-    return current_user
+    invalidate_user(user.id)
+    return user
 
 # ==================== Password Reset Endpoints ====================
 
@@ -301,9 +335,16 @@ async def reset_password(
             detail="OTP has expired. Please request a new one."
         )
     
-    # Get user
-    user_result = await db.execute(select(User).where(User.email == request.email))
-    user = user_result.scalar_one_or_none()
+    # Update the password and revoke every token issued before the reset
+    # (refresh tokens included) in one UPDATE ... RETURNING
+    password_hash = await hash_password(request.new_password)
+    result = await db.execute(
+        update(User)
+        .where(User.email == request.email)
+        .values(password_hash=password_hash, **revoke_tokens_values())
+        .returning(User.id, User.token_version)
+    )
+    user = result.one_or_none()
     
     if not user:
         raise HTTPException(
@@ -311,14 +352,13 @@ async def reset_password(
             detail="User not found"
         )
     
-    # Update user password
-    user.password_hash = hash_password(request.new_password)
-    
     # Mark OTP as used
     otp_record.is_used = True
     otp_record.used_at = datetime.now(timezone.utc)
     
     await db.commit()
+    invalidate_user(user.id)
+    remember_token_version(user.id, user.token_version)
     
     return {
         "message": "Password has been reset successfully",
@@ -17,6 +17,8 @@ class DashboardStats(BaseModel):
     pending_applications: int
     accepted_applications: int
     rejected_applications: int
+    # Seconds since the counts were taken (they are cached per worker)
+    snapshot_age_seconds: float = 0.0
 
 # User Management Schemas
 class UserListItem(BaseModel):
@@ -61,6 +63,10 @@ class TaskListAdmin(BaseModel):
     is_active: bool
     created_at: datetime
     application_count: int = 0
+    pending_applications: int = 0
+    accepted_applications: int = 0
+    rejected_applications: int = 0
+    snippet: Optional[str] = None  # highlighted description match when searching (HTML-escaped, <mark>)
 
     class Config:
         orm_mode = True
@@ -97,3 +103,15 @@ class SystemHealth(BaseModel):
     database_connected: bool
     total_records: int
     uptime: str
+
+# Platform Counter Reconciliation Schemas
+class CounterDrift(BaseModel):
+    name: str
+    counted: int  # platform_counters
+    actual: int   # recounted from the source table
+    drift: int    # counted - actual
+
+class CounterReconciliation(BaseModel):
+    counters: List[CounterDrift]
+    drifted: int
+    repaired: bool
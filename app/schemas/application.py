@@ -1,6 +1,7 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
 from uuid import UUID
 from datetime import datetime
+from typing import List, Literal, Optional
 from ..models.applications import ApplicationStatus
 
 # Schema for creating an application
@@ -17,4 +18,64 @@ class ApplicationRead(BaseModel):
     applied_at: datetime
 
     class Config:
-        orm_mode = True
\ No newline at end of file
+        orm_mode = True
+
+# Applicant profile embedded with ?include=volunteer
+class ApplicantVolunteer(BaseModel):
+    id: UUID
+    full_name: str
+    email: str
+    location: Optional[str] = None
+
+# Application on the NGO's applicant listing; volunteer/skills are only set when included
+class ApplicantRead(ApplicationRead):
+    volunteer: Optional[ApplicantVolunteer] = None
+    skills: Optional[List[str]] = None
+
+# One page of applicants; pass next_cursor back to get the following page
+class ApplicantPage(BaseModel):
+    items: List[ApplicantRead]
+    next_cursor: Optional[str] = None
+
+# Task fields shown next to each of the volunteer's own applications
+class ApplicationTaskSummary(BaseModel):
+    id: UUID
+    title: str
+    location: Optional[str] = None
+    is_active: bool
+    posted_by_name: str
+
+# An application on GET /applications/me with its task summary
+class MyApplicationRead(ApplicationRead):
+    task: ApplicationTaskSummary
+
+# One page of the volunteer's applications; pass next_cursor back to get the following page
+class MyApplicationPage(BaseModel):
+    items: List[MyApplicationRead]
+    next_cursor: Optional[str] = None
+
+# Bulk review: either explicit application ids, or every application of a task
+# (optionally only those currently in `current_status`)
+class ApplicationBulkStatusUpdate(BaseModel):
+    status: ApplicationStatus
+    application_ids: Optional[List[UUID]] = Field(None, min_length=1, max_length=1000)
+    task_id: Optional[UUID] = None
+    current_status: Optional[ApplicationStatus] = None
+
+    @model_validator(mode="after")
+    def one_selector(self):
+        if (self.application_ids is None) == (self.task_id is None):
+            raise ValueError("Provide either application_ids or task_id")
+        if self.current_status is not None and self.task_id is None:
+            raise ValueError("current_status can only be used with task_id")
+        return self
+
+class ApplicationBulkStatusItem(BaseModel):
+    id: UUID
+    # full: accepting was refused because the task had no free slot left
+    result: Literal["updated", "full", "not_found", "forbidden"]
+
+class ApplicationBulkStatusResult(BaseModel):
+    status: ApplicationStatus
+    updated: int
+    results: List[ApplicationBulkStatusItem]
@@ -11,4 +11,8 @@ class SkillRead(BaseModel):
     name: str
 
     class Config:
-        orm_mode = True
\ No newline at end of file
+        orm_mode = True
+
+class SkillSuggestion(BaseModel):
+    name: str
+    volunteer_count: int
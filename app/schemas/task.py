@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from uuid import UUID
 from typing import Optional, List
 from datetime import datetime
@@ -9,6 +9,7 @@ class TaskCreate(BaseModel):
     description: str
     location: Optional[str] = None
     skills_required: Optional[List[str]] = None
+    max_volunteers: Optional[int] = Field(None, ge=1, description="Volunteers needed; no limit if omitted")
 
 # Schema for reading task data
 class TaskRead(BaseModel):
@@ -19,8 +20,41 @@ class TaskRead(BaseModel):
     skills_required: Optional[List[str]]
     posted_by_id: UUID
     is_active: bool
+    max_volunteers: Optional[int] = None
+    accepted_count: int = 0
     created_at: datetime
     updated_at: datetime
 
     class Config:
-        orm_mode = True
\ No newline at end of file
+        orm_mode = True
+
+# One page of the task feed; pass next_cursor back to get the following page
+class TaskPage(BaseModel):
+    items: List[TaskRead]
+    next_cursor: Optional[str] = None
+
+
+# Full-text search hit with its relevance and highlighted fragments: HTML-escaped text with <mark>...</mark>
+class TaskSearchResult(TaskRead):
+    rank: float
+    title_highlight: str
+    snippet: str
+
+
+# Recommended task with its ranking score and how many of the caller's skills it needs
+class TaskRecommendation(TaskRead):
+    score: float
+    matched_skills: int
+
+
+# A rejected row of a bulk import (row numbers start at 1, after any CSV header)
+class BulkTaskRowError(BaseModel):
+    row: int
+    error: str
+
+# Outcome of POST /tasks/bulk; errors lists at most BULK_IMPORT_MAX_ERRORS rows
+class BulkTaskImportResult(BaseModel):
+    received: int
+    inserted: int
+    failed: int
+    errors: List[BulkTaskRowError]
@@ -47,6 +47,9 @@ class UserLogin(BaseModel):
     email: str
     password: str
 
+class RefreshTokenRequest(BaseModel):
+    refresh_token: str
+
 # Password Reset Schemas
 class ForgotPasswordRequest(BaseModel):
     email: EmailStr
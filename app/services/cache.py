@@ -0,0 +1,120 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """
+    Small in-process LRU cache whose entries expire after `ttl_seconds`.
+    Not shared between workers - every uvicorn process keeps its own copy.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value or None if missing/expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None):
+        """Store a value, evicting the least recently used entry when full"""
+        if self.max_size <= 0:
+            return
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable):
+        """Drop a single entry (no-op if it is not cached)"""
+        if self._entries.pop(key, None) is not None:
+            self.invalidations += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+class SnapshotCache:
+    """
+    One in-process value recomputed at most once per `ttl_seconds`. Callers
+    that find it expired queue on a lock behind the single refresh in flight
+    and reuse its result, so a burst of requests runs the loader once.
+    Not shared between workers - every uvicorn process keeps its own copy.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._value: Any = None
+        self._loaded_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self.hits = 0
+        self.loads = 0
+        self.coalesced = 0
+
+    def _age(self) -> Optional[float]:
+        return None if self._loaded_at is None else time.monotonic() - self._loaded_at
+
+    async def get(self, load: Callable[[], Awaitable[Any]]) -> Tuple[Any, float]:
+        """(value, age in seconds); `load` runs only when the snapshot is missing or expired"""
+        age = self._age()
+        if age is not None and age < self.ttl_seconds:
+            self.hits += 1
+            return self._value, age
+        async with self._lock:
+            # Another caller may have refreshed it while we waited for the lock
+            age = self._age()
+            if age is not None and age < self.ttl_seconds:
+                self.coalesced += 1
+                return self._value, age
+            self._value = await load()
+            self._loaded_at = time.monotonic()
+            self.loads += 1
+            return self._value, 0.0
+
+    def invalidate(self):
+        self._loaded_at = None
+
+    def stats(self) -> dict:
+        age = self._age()
+        return {
+            "ttl_seconds": self.ttl_seconds,
+            "age_seconds": round(age, 1) if age is not None else None,
+            "hits": self.hits,
+            "loads": self.loads,
+            "coalesced": self.coalesced,
+        }
@@ -0,0 +1,35 @@
+from collections import deque
+
+
+class LatencyStats:
+    """Rolling latency summary over the most recent samples (seconds in, milliseconds out)"""
+
+    def __init__(self, window: int = 1024):
+        self._samples = deque(maxlen=window)
+        self.count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def record(self, seconds: float):
+        self._samples.append(seconds)
+        self.count += 1
+        self.total_seconds += seconds
+        if seconds > self.max_seconds:
+            self.max_seconds = seconds
+
+    def _percentile(self, ordered: list, fraction: float) -> float:
+        index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+        return ordered[index]
+
+    def stats(self) -> dict:
+        ordered = sorted(self._samples)
+        if not ordered:
+            return {"count": 0, "avg_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total_seconds / self.count * 1000, 3),
+            "p50_ms": round(self._percentile(ordered, 0.50) * 1000, 3),
+            "p95_ms": round(self._percentile(ordered, 0.95) * 1000, 3),
+            "p99_ms": round(self._percentile(ordered, 0.99) * 1000, 3),
+            "max_ms": round(self.max_seconds * 1000, 3),
+        }
@@ -0,0 +1,239 @@
+import asyncio
+import json
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set
+import asyncpg
+from sqlalchemy import Text, case, cast, func, literal
+from sqlalchemy.future import select
+from ..config import settings
+from ..database import ssl_context
+
+# NOTIFY channel carrying application events; payload is the JSON object
+# built by application_event_column / application_event_statement
+APPLICATION_CHANNEL = "dovol_applications"
+
+# Sent instead of the events a subscriber missed (queue overflow or listener
+# reconnect); clients should refetch GET /applications/task/{task_id}
+RESYNC_EVENT = {"type": "resync"}
+
+# Seconds between listener reconnect attempts (doubles up to the maximum)
+_RECONNECT_DELAY = 1.0
+_RECONNECT_MAX_DELAY = 30.0
+
+
+def task_topic(task_id) -> str:
+    return f"task:{task_id}"
+
+
+def volunteer_topic(volunteer_id) -> str:
+    return f"volunteer:{volunteer_id}"
+
+
+def _payload(event_type: str, columns):
+    return func.json_build_object(
+        "type", literal(event_type),
+        "application_id", columns.id,
+        "task_id", columns.task_id,
+        "volunteer_id", columns.volunteer_id,
+        "status", columns.status,
+    )
+
+
+def application_event_column(event_type: str, columns):
+    """
+    Select-list expression that sends one NOTIFY per returned row whose id is
+    not NULL. Embedding it in the write statement keeps the write and its
+    event in one round trip; PostgreSQL delivers the NOTIFY on commit only.
+    """
+    return case(
+        (columns.id.isnot(None), func.pg_notify(APPLICATION_CHANNEL, cast(_payload(event_type, columns), Text)))
+    ).label("notified")
+
+
+def application_event_statement(event_type: str, application):
+    """Standalone NOTIFY for an application already loaded in Python"""
+    payload = {
+        "type": event_type,
+        "application_id": str(application.id),
+        "task_id": str(application.task_id),
+        "volunteer_id": str(application.volunteer_id),
+        "status": application.status.value,
+    }
+    return select(func.pg_notify(APPLICATION_CHANNEL, json.dumps(payload)))
+
+
+class Subscription:
+    """One SSE connection: its topics and a bounded queue of pending events"""
+
+    def __init__(self, topics: List[str], max_queued: int):
+        self.topics = topics
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queued)
+        self.dropped = 0
+
+    def deliver(self, event: dict) -> bool:
+        """Queue an event without blocking; a full queue is replaced by one resync event"""
+        try:
+            self.queue.put_nowait(event)
+            return True
+        except asyncio.QueueFull:
+            self.dropped += self.queue.qsize() + 1
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC_EVENT)
+            return False
+
+
+class NotificationHub:
+    """
+    Per-worker fan-out of PostgreSQL notifications. One dedicated asyncpg
+    connection LISTENs on APPLICATION_CHANNEL; every event is routed to the
+    subscriptions of its task and volunteer topics through their bounded
+    queues, so a slow client only ever loses its own events (and gets a
+    resync) instead of holding up the listener or other subscribers.
+    """
+
+    def __init__(self, channel: str, queue_size: int):
+        self.channel = channel
+        self.queue_size = queue_size
+        self._topics: Dict[str, Set[Subscription]] = defaultdict(set)
+        self._task: Optional[asyncio.Task] = None
+        self.connected = False
+        self.received = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.reconnects = 0
+
+    def subscribe(self, topics: Iterable[str]) -> Subscription:
+        subscription = Subscription(list(topics), self.queue_size)
+        for topic in subscription.topics:
+            self._topics[topic].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        for topic in subscription.topics:
+            subscribers = self._topics.get(topic)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._topics[topic]
+
+    def publish(self, event: dict):
+        self.received += 1
+        topics = [task_topic(event.get("task_id")), volunteer_topic(event.get("volunteer_id"))]
+        for topic in topics:
+            for subscription in tuple(self._topics.get(topic, ())):
+                if subscription.deliver(event):
+                    self.delivered += 1
+                else:
+                    self.dropped += 1
+
+    def _resync_all(self):
+        for subscription in {sub for subscribers in self._topics.values() for sub in subscribers}:
+            subscription.deliver(RESYNC_EVENT)
+
+    def _on_notification(self, connection, pid, channel, payload):
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            return
+        self.publish(event)
+
+    async def _listen(self):
+        """
+        Keep one LISTEN connection open. Any failure - connect errors, the
+        server closing the connection, asyncpg InterfaceErrors - is logged
+        and followed by a reconnect after a backoff; only cancellation ends
+        the loop.
+        """
+        delay = _RECONNECT_DELAY
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(
+                    host=settings.database_hostname,
+                    port=settings.database_port,
+                    user=settings.database_username,
+                    password=settings.database_password,
+                    database=settings.database_name,
+                    ssl=ssl_context if settings.database_ssl else None,
+                )
+                closed = asyncio.Event()
+                connection.add_termination_listener(lambda _: closed.set())
+                await connection.add_listener(self.channel, self._on_notification)
+                if self.reconnects:
+                    # Events sent while we were disconnected are lost
+                    self._resync_all()
+                self.connected = True
+                delay = _RECONNECT_DELAY
+                await closed.wait()
+                print(f"Notification listener: connection closed, reconnecting in {delay:.0f} s")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Notification listener: {e!r}, reconnecting in {delay:.0f} s")
+            finally:
+                if self.connected:
+                    self.connected = False
+                    self.reconnects += 1
+                if connection is not None and not connection.is_closed():
+                    try:
+                        await connection.close()
+                    except Exception:
+                        connection.terminate()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, _RECONNECT_MAX_DELAY)
+
+    def _on_listener_exit(self, task: asyncio.Task):
+        """Done-callback of the listener task: it should only ever end by being cancelled"""
+        self.connected = False
+        if not task.cancelled():
+            print(f"Notification listener stopped unexpectedly: {task.exception()!r}")
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._listen())
+            self._task.add_done_callback(self._on_listener_exit)
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "listening": self.connected,
+            "topics": len(self._topics),
+            "subscriptions": len({sub for subscribers in self._topics.values() for sub in subscribers}),
+            "received": self.received,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "reconnects": self.reconnects,
+        }
+
+
+notification_hub = NotificationHub(APPLICATION_CHANNEL, settings.notification_queue_size)
+
+
+async def event_stream(request, subscription: Subscription, heartbeat_seconds: float):
+    """
+    Server-sent events for one subscription. A comment line is sent every
+    heartbeat_seconds of silence so proxies keep the connection open; the
+    subscription is dropped when the client goes away.
+    """
+    try:
+        yield "retry: 5000\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), heartbeat_seconds)
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    break
+                yield ": keepalive\n\n"
+                continue
+            yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+    finally:
+        notification_hub.unsubscribe(subscription)
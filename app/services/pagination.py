@@ -0,0 +1,23 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+from uuid import UUID
+from fastapi import HTTPException
+
+def encode_cursor(timestamp: datetime, row_id: UUID) -> str:
+    """Opaque keyset cursor for a (timestamp, id) ordering"""
+    raw = json.dumps([timestamp.isoformat(), str(row_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, UUID]]:
+    """Decode a cursor produced by encode_cursor; raises 400 if it was tampered with"""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        timestamp, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(timestamp), UUID(row_id)
+    except (ValueError, TypeError, binascii.Error, UnicodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
@@ -0,0 +1,95 @@
+from functools import lru_cache
+from typing import Dict
+from sqlalchemy import delete, func, insert, text, true
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from ..models.user import User, Roles
+from ..models.volunteer_task import VolunteerTask
+from ..models.applications import Application, ApplicationStatus
+from ..models.platform_counter import PlatformCounter
+
+# Every DashboardStats count is a counter of that name (see models/platform_counter.py)
+COUNTER_NAMES = (
+    "total_users", "total_volunteers", "total_ngos", "total_admins",
+    "total_tasks", "active_tasks",
+    "total_applications", "pending_applications", "accepted_applications", "rejected_applications",
+)
+
+@lru_cache(maxsize=None)
+def counters_query():
+    """Every counter's value: the sum of its shard rows"""
+    return (
+        select(PlatformCounter.name, func.sum(PlatformCounter.value).label("value"))
+        .group_by(PlatformCounter.name)
+    )
+
+@lru_cache(maxsize=None)
+def recount_query():
+    """
+    The counters recomputed from the source tables in one statement: one
+    aggregate per table, each reading its table once with COUNT(*) FILTER
+    (WHERE ...) per figure
+    """
+    users = select(
+        func.count().label("total_users"),
+        func.count().filter(User.role == Roles.volunteer).label("total_volunteers"),
+        func.count().filter(User.role == Roles.ngo).label("total_ngos"),
+        func.count().filter(User.role == Roles.admin).label("total_admins"),
+    ).subquery("user_counts")
+    tasks = select(
+        func.count().label("total_tasks"),
+        func.count().filter(VolunteerTask.is_active == True).label("active_tasks"),
+    ).subquery("task_counts")
+    applications = select(
+        func.count().label("total_applications"),
+        func.count().filter(Application.status == ApplicationStatus.pending).label("pending_applications"),
+        func.count().filter(Application.status == ApplicationStatus.accepted).label("accepted_applications"),
+        func.count().filter(Application.status == ApplicationStatus.rejected).label("rejected_applications"),
+    ).subquery("application_counts")
+    # Three one-row subqueries: joining them ON true yields a single row
+    return select(*users.c, *tasks.c, *applications.c).select_from(
+        users.join(tasks, true()).join(applications, true())
+    )
+
+@lru_cache(maxsize=None)
+def drift_query():
+    """The recount plus the counters as a JSON object, in one statement so both read the same snapshot"""
+    recount = recount_query().subquery("recount")
+    counters = counters_query().subquery("counters")
+    counted = select(func.jsonb_object_agg(counters.c.name, counters.c.value, type_=JSONB)).scalar_subquery()
+    return select(*recount.c, counted.label("counted"))
+
+async def read_counters(db: AsyncSession) -> Dict[str, int]:
+    """Counter values by name; counters no write has reached yet are 0"""
+    counts = dict.fromkeys(COUNTER_NAMES, 0)
+    counts.update((row.name, int(row.value)) for row in await db.execute(counters_query()))
+    return counts
+
+async def reconcile_counters(db: AsyncSession, repair: bool = False) -> dict:
+    """
+    Recount users, tasks and applications and report every counter's drift
+    (counted - actual). With repair, drifted counters are rewritten from the
+    recount and the transaction is committed. The table lock taken first
+    makes writes to the counted tables wait (their triggers write to
+    platform_counters) until the rewrite commits, so none is lost.
+    """
+    if repair:
+        await db.execute(text("LOCK TABLE platform_counters IN SHARE ROW EXCLUSIVE MODE"))
+    row = (await db.execute(drift_query())).one()._asdict()
+    counted = row.pop("counted") or {}
+    counters = [
+        {"name": name, "counted": int(counted.get(name, 0)), "actual": row[name],
+         "drift": int(counted.get(name, 0)) - row[name]}
+        for name in COUNTER_NAMES
+    ]
+    drifted = sum(1 for counter in counters if counter["drift"])
+    if repair:
+        if drifted:
+            await db.execute(delete(PlatformCounter))
+            await db.execute(
+                insert(PlatformCounter),
+                [{"name": counter["name"], "shard": 0, "value": counter["actual"]} for counter in counters],
+            )
+        await db.commit()
+    return {"counters": counters, "drifted": drifted, "repaired": repair and drifted > 0}
@@ -0,0 +1,286 @@
+import asyncio
+import time
+from datetime import datetime
+from typing import Iterable, List, Optional, Set
+from uuid import UUID
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from ..models.volunteer_task import VolunteerTask
+from ..config import settings
+from .skill_catalog import skill_key
+
+_WORD_BITS = 64
+_ONE = np.uint64(1)
+
+
+def _location_key(location: Optional[str]) -> Optional[str]:
+    return location.strip().lower() if location and location.strip() else None
+
+
+class TaskSkillIndex:
+    """
+    In-memory inverted index from skill to the active tasks requiring it.
+
+    Every active task owns a slot; each skill maps to a bitset (uint64 words)
+    with one bit per slot, so ranking a volunteer's skills is a handful of
+    vectorized NumPy passes instead of a scan over the tasks.
+    Kept per worker: writes made through this worker are applied
+    incrementally, and the whole index is rebuilt from the database every
+    `refresh_seconds` to pick up changes made by other workers.
+    """
+
+    def __init__(self, refresh_seconds: float, capacity: int = 1024):
+        self.refresh_seconds = refresh_seconds
+        self.loaded_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self._pending: Optional[list] = None
+        self._reset(capacity)
+
+    def _reset(self, capacity: int):
+        self._capacity = capacity
+        self._skill_bits: dict[str, np.ndarray] = {}
+        self._slots: dict[UUID, int] = {}
+        self._slot_task_ids: List[Optional[UUID]] = [None] * capacity
+        self._slot_skills: List[tuple] = [()] * capacity
+        # Locations are interned to small integer codes (0 = none) for vectorized matching
+        self._location_codes: dict[str, int] = {}
+        self._slot_locations = np.zeros(capacity, dtype=np.int32)
+        self._created_ts = np.zeros(capacity, dtype=np.float64)
+        self._free_slots: List[int] = []
+        self._next_slot = 0
+
+    # ---------- maintenance ----------
+
+    def _words(self) -> int:
+        return (self._capacity + _WORD_BITS - 1) // _WORD_BITS
+
+    def _grow(self):
+        capacity = self._capacity * 2
+        words = (capacity + _WORD_BITS - 1) // _WORD_BITS
+        for key, bits in self._skill_bits.items():
+            grown = np.zeros(words, dtype="<u8")
+            grown[: len(bits)] = bits
+            self._skill_bits[key] = grown
+        self._slot_task_ids.extend([None] * (capacity - self._capacity))
+        self._slot_skills.extend([()] * (capacity - self._capacity))
+        slot_locations = np.zeros(capacity, dtype=np.int32)
+        slot_locations[: self._capacity] = self._slot_locations
+        self._slot_locations = slot_locations
+        created_ts = np.zeros(capacity, dtype=np.float64)
+        created_ts[: self._capacity] = self._created_ts
+        self._created_ts = created_ts
+        self._capacity = capacity
+
+    def _location_code(self, location: Optional[str]) -> int:
+        key = _location_key(location)
+        if key is None:
+            return 0
+        return self._location_codes.setdefault(key, len(self._location_codes) + 1)
+
+    def _allocate_slot(self) -> int:
+        if self._free_slots:
+            return self._free_slots.pop()
+        if self._next_slot >= self._capacity:
+            self._grow()
+        slot = self._next_slot
+        self._next_slot += 1
+        return slot
+
+    def _set_bit(self, key: str, slot: int):
+        bits = self._skill_bits.get(key)
+        if bits is None:
+            bits = self._skill_bits[key] = np.zeros(self._words(), dtype="<u8")
+        bits[slot // _WORD_BITS] |= _ONE << np.uint64(slot % _WORD_BITS)
+
+    def _clear_bit(self, key: str, slot: int):
+        bits = self._skill_bits[key]
+        bits[slot // _WORD_BITS] &= ~(_ONE << np.uint64(slot % _WORD_BITS))
+        if not bits.any():
+            del self._skill_bits[key]
+
+    def _add(self, task_id: UUID, skills: Optional[Iterable[str]], location: Optional[str], created_at: Optional[datetime]):
+        keys = tuple(dict.fromkeys(skill_key(name) for name in (skills or []) if skill_key(name)))
+        if not keys:
+            return
+        slot = self._allocate_slot()
+        self._slots[task_id] = slot
+        self._slot_task_ids[slot] = task_id
+        self._slot_skills[slot] = keys
+        self._slot_locations[slot] = self._location_code(location)
+        self._created_ts[slot] = created_at.timestamp() if created_at else time.time()
+        for key in keys:
+            self._set_bit(key, slot)
+
+    def _remove(self, task_id: UUID):
+        slot = self._slots.pop(task_id, None)
+        if slot is None:
+            return
+        for key in self._slot_skills[slot]:
+            self._clear_bit(key, slot)
+        self._slot_task_ids[slot] = None
+        self._slot_skills[slot] = ()
+        self._slot_locations[slot] = 0
+        self._free_slots.append(slot)
+
+    def upsert_task(self, task: VolunteerTask):
+        """Apply a created/updated task; inactive tasks are dropped from the index"""
+        self.upsert(task.id, task.is_active, task.skills_required, task.location, task.created_at)
+
+    def upsert(self, task_id: UUID, is_active: bool, skills, location: Optional[str], created_at: Optional[datetime]):
+        if self._pending is not None:
+            self._pending.append(("upsert", task_id, is_active, list(skills or []), location, created_at))
+        self._apply_upsert(task_id, is_active, skills, location, created_at)
+
+    def remove_task(self, task_id: UUID):
+        if self._pending is not None:
+            self._pending.append(("remove", task_id))
+        self._remove(task_id)
+
+    def _apply_upsert(self, task_id, is_active, skills, location, created_at):
+        self._remove(task_id)
+        if is_active:
+            self._add(task_id, skills, location, created_at)
+
+    def load(self, rows: Iterable[tuple]):
+        """Rebuild from (id, skills_required, location, created_at) rows of active tasks"""
+        rows = list(rows)
+        capacity = 1024
+        while capacity < len(rows):
+            capacity *= 2
+        self._reset(capacity)
+
+        skill_slots: dict[str, List[int]] = {}
+        keys_by_name: dict[str, str] = {}  # skill_key is a regex; the vocabulary is small
+        created_ts, location_codes = [], []
+        for task_id, skills, location, created_at in rows:
+            keys = []
+            for name in skills or []:
+                key = keys_by_name.get(name)
+                if key is None:
+                    key = keys_by_name[name] = skill_key(name)
+                if key and key not in keys:
+                    keys.append(key)
+            if not keys:
+                continue
+            slot = self._next_slot
+            self._next_slot += 1
+            self._slots[task_id] = slot
+            self._slot_task_ids[slot] = task_id
+            self._slot_skills[slot] = tuple(keys)
+            location_codes.append(self._location_code(location))
+            created_ts.append(created_at.timestamp() if created_at else time.time())
+            for key in keys:
+                skill_slots.setdefault(key, []).append(slot)
+        self._created_ts[: len(created_ts)] = created_ts
+        self._slot_locations[: len(location_codes)] = location_codes
+
+        # One packbits per skill instead of setting bits one at a time
+        for key, slots in skill_slots.items():
+            flags = np.zeros(self._words() * _WORD_BITS, dtype=bool)
+            flags[slots] = True
+            self._skill_bits[key] = np.packbits(flags, bitorder="little").view("<u8")
+        self.loaded_at = time.monotonic()
+
+    async def ensure_fresh(self, db: AsyncSession):
+        """Load on first use and rebuild once the snapshot is older than refresh_seconds"""
+        if self.loaded_at is not None and time.monotonic() - self.loaded_at < self.refresh_seconds:
+            return
+        async with self._lock:
+            if self.loaded_at is not None and time.monotonic() - self.loaded_at < self.refresh_seconds:
+                return
+            # Writes that land while the rows are being fetched are replayed afterwards
+            self._pending = []
+            try:
+                result = await db.execute(
+                    select(
+                        VolunteerTask.id,
+                        VolunteerTask.skills_required,
+                        VolunteerTask.location,
+                        VolunteerTask.created_at,
+                    ).where(VolunteerTask.is_active == True, VolunteerTask.skills_required != [])
+                )
+                self.load(result.all())
+                for op in self._pending:
+                    if op[0] == "upsert":
+                        self._apply_upsert(*op[1:])
+                    else:
+                        self._remove(op[1])
+            finally:
+                self._pending = None
+
+    # ---------- ranking ----------
+
+    def rank(
+        self,
+        skills: Iterable[str],
+        limit: int = 20,
+        location: Optional[str] = None,
+        recency_weight: float = 0.0,
+        location_weight: float = 0.0,
+        half_life_days: float = 7.0,
+        exclude: Optional[Set[UUID]] = None,
+        now: Optional[float] = None,
+    ) -> List[tuple]:
+        """
+        Best matching tasks as (task_id, score, matched skill count), highest first.
+        score = number of the volunteer's skills the task requires
+                + recency_weight * 0.5 ** (age_days / half_life_days)
+                + location_weight if the task is in the volunteer's location
+        Only tasks sharing at least one skill are returned.
+        """
+        bitsets = [self._skill_bits[key] for key in {skill_key(name) for name in skills} if key in self._skill_bits]
+        if not bitsets or limit <= 0:
+            return []
+
+        size = self._next_slot
+        matched = np.zeros(size, dtype=np.uint16)
+        for bits in bitsets:
+            matched += np.unpackbits(bits.view(np.uint8), bitorder="little", count=size)
+
+        if exclude:
+            for task_id in exclude:
+                slot = self._slots.get(task_id)
+                if slot is not None:
+                    matched[slot] = 0
+
+        candidates = np.flatnonzero(matched)
+        if candidates.size == 0:
+            return []
+
+        scores = matched[candidates].astype(np.float64)
+        created_ts = self._created_ts[candidates]
+        if recency_weight:
+            age_days = np.maximum((now or time.time()) - created_ts, 0.0) / 86400.0
+            scores += recency_weight * np.exp2(-age_days / half_life_days)
+        location_code = self._location_codes.get(_location_key(location) or "")
+        if location_weight and location_code:
+            scores += location_weight * (self._slot_locations[candidates] == location_code)
+
+        if candidates.size > limit:
+            # Everything above the limit-th best score, then the newest of the tasks tied with it
+            threshold = np.partition(scores, candidates.size - limit)[candidates.size - limit]
+            above = np.flatnonzero(scores > threshold)
+            tied = np.flatnonzero(scores == threshold)
+            needed = limit - above.size
+            if tied.size > needed:
+                tied = tied[np.argpartition(-created_ts[tied], needed - 1)[:needed]]
+            top = np.concatenate((above, tied))
+            candidates, scores, created_ts = candidates[top], scores[top], created_ts[top]
+        # Highest score first, newest first on ties
+        order = np.lexsort((-created_ts, -scores))
+        return [
+            (self._slot_task_ids[candidates[i]], float(scores[i]), int(matched[candidates[i]]))
+            for i in order
+        ]
+
+    def stats(self) -> dict:
+        return {
+            "tasks": len(self._slots),
+            "skills": len(self._skill_bits),
+            "capacity": self._capacity,
+            "age_seconds": round(time.monotonic() - self.loaded_at, 1) if self.loaded_at is not None else None,
+        }
+
+
+task_skill_index = TaskSkillIndex(refresh_seconds=settings.recommendation_refresh_seconds)
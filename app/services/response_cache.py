@@ -0,0 +1,96 @@
+import hashlib
+from typing import Hashable, Iterable, Optional
+from uuid import UUID
+from fastapi import Request, Response
+from .cache import TTLCache
+from ..config import settings
+
+# Serialized task reads: task id -> (etag, body) and feed key -> (etag, body).
+# Writes made through this worker invalidate immediately; changes made by
+# other workers become visible once the entries expire.
+task_response_cache = TTLCache(
+    max_size=settings.task_response_cache_max_size,
+    ttl_seconds=settings.task_response_cache_ttl_seconds,
+)
+feed_response_cache = TTLCache(
+    max_size=settings.task_response_cache_max_size,
+    ttl_seconds=settings.task_response_cache_ttl_seconds,
+)
+
+# Part of every feed cache key, so a write retires all cached pages at once
+_feed_version = 0
+
+
+def feed_cache_key(*params: Hashable) -> tuple:
+    return (_feed_version, *params)
+
+
+def current_version() -> int:
+    return _feed_version
+
+
+def cache_task_response(task_id: UUID, value: tuple, read_version: int):
+    """
+    Store a serialized task unless a task write landed while it was being read,
+    which would otherwise leave the pre-write body cached until it expires.
+    """
+    if read_version == _feed_version:
+        task_response_cache.set(task_id, value)
+
+
+def invalidate_task(task_id: UUID):
+    """Drop the cached task and every cached feed page after a task write"""
+    global _feed_version
+    task_response_cache.invalidate(task_id)
+    _feed_version += 1
+
+
+def invalidate_feed():
+    """Retire all cached feed pages (bulk writes that only add new tasks)"""
+    global _feed_version
+    _feed_version += 1
+
+
+def make_etag(*parts) -> str:
+    """Strong ETag over the given values (ids, row versions, cursors...)"""
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def task_etag(task) -> str:
+    return make_etag("task", task.id, task.version)
+
+
+def feed_etag(tasks: Iterable, next_cursor: Optional[str]) -> str:
+    return make_etag("feed", next_cursor, *(f"{task.id}:{task.version}" for task in tasks))
+
+
+def body_etag(kind: str, body: bytes) -> str:
+    """ETag for responses assembled from several tables, where no single row version covers the body"""
+    return make_etag(kind, hashlib.sha1(body).hexdigest())
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match comparison (weak comparison, as RFC 9110 requires for this header)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+def conditional_response(request: Request, etag: str, body: bytes) -> Response:
+    """304 when the client already has this version, otherwise the serialized body"""
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def stats() -> dict:
+    return {
+        "feed_version": _feed_version,
+        "tasks": task_response_cache.stats(),
+        "feed": feed_response_cache.stats(),
+    }
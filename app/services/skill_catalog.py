@@ -0,0 +1,484 @@
+import asyncio
+import bisect
+import re
+import time
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+import numpy as np
+from sqlalchemy import String, all_, any_, bindparam, delete, event, exists, func
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.orm import Session
+from ..config import settings
+from ..database import AsyncSessionLocal
+from ..models.skill import Skill, VolunteerSkill
+
+_SEPARATORS = re.compile(r"[\s_\-]+")
+
+# Sorts after every character a key can contain: prefix + _LAST_CHAR bounds a prefix range
+_LAST_CHAR = "\U0010ffff"
+# SkillCatalog score offset of matches on a later word (twice that: typo matches)
+_WORD_MATCH = 1 << 32
+# Session.info key of the names a transaction wrote to the skills table
+_PENDING_NAMES = "skill_catalog_pending"
+
+def skill_key(name: str) -> str:
+    """Comparison key: case-insensitive, with spaces, '-' and '_' treated alike ("First-Aid" == "first aid")"""
+    return _SEPARATORS.sub(" ", name).strip().casefold()
+
+def skill_key_sql(column):
+    """SQL equivalent of skill_key for matching against the skills table"""
+    return func.lower(func.trim(func.regexp_replace(column, r"[\s_-]+", " ", "g")))
+
+def clean_skill_name(name: str) -> str:
+    return " ".join(name.split())
+
+def _wanted_names(names: Iterable[str]) -> Dict[str, str]:
+    """skill_key -> first cleaned spelling, skipping blanks"""
+    wanted = {}
+    for name in names:
+        key = skill_key(name)
+        if key and key not in wanted:
+            wanted[key] = clean_skill_name(name)
+    return wanted
+
+def add_on_commit(db: AsyncSession, names: Iterable[str]):
+    """
+    Add names written in db's transaction to skill_catalog once it commits.
+    A rollback drops them, so the catalog never lists a name the skills
+    table does not have.
+    """
+    db.info.setdefault(_PENDING_NAMES, []).extend(names)
+
+@event.listens_for(Session, "after_commit")
+def _add_committed_names(session: Session):
+    names = session.info.pop(_PENDING_NAMES, None)
+    if names:
+        skill_catalog.add(names)
+
+@event.listens_for(Session, "after_transaction_end")
+def _drop_uncommitted_names(session: Session, transaction):
+    # Runs after after_commit, which has already taken the committed names
+    if transaction.parent is None:
+        session.info.pop(_PENDING_NAMES, None)
+
+async def register_skill_names(db: AsyncSession, names: Optional[Iterable[str]]):
+    """
+    Insert the names this worker's catalog does not know into the skills
+    table (existing rows are skipped); they join the catalog on commit
+    """
+    unknown = [name for name in (names or ()) if skill_catalog.lookup(skill_key(name)) is None]
+    if unknown:
+        await db.execute(
+            insert(Skill).values([{"name": name} for name in unknown]).on_conflict_do_nothing(index_elements=["name"])
+        )
+        add_on_commit(db, unknown)
+
+async def catalog_names(db: AsyncSession, names: Iterable[str], register: bool = False) -> Dict[str, str]:
+    """
+    Map the skill_key of every name to its catalog spelling. Keys the
+    in-memory skill_catalog knows are resolved without a query; the rest
+    take one query. Unknown names map to themselves (whitespace cleaned);
+    with register=True they are inserted into the skills table and join the
+    catalog when the transaction commits (used when tasks are written, so
+    later filters resolve to the same spelling).
+    """
+    canonical = _wanted_names(names)
+    if not canonical:
+        return {}
+
+    matched = set()
+    for key in canonical:
+        name = skill_catalog.lookup(key)
+        if name is not None:
+            canonical[key] = name
+            matched.add(key)
+    if len(matched) == len(canonical):
+        return canonical
+
+    result = await db.execute(
+        select(Skill.name)
+        .where(skill_key_sql(Skill.name).in_([key for key in canonical if key not in matched]))
+        .order_by(Skill.name)
+    )
+    for name in result.scalars():
+        key = skill_key(name)
+        if key in canonical and key not in matched:
+            canonical[key] = name
+            matched.add(key)
+
+    if register:
+        await register_skill_names(db, [name for key, name in canonical.items() if key not in matched])
+    return canonical
+
+def apply_catalog_names(names: Optional[List[str]], canonical: Dict[str, str]) -> Optional[List[str]]:
+    """Rewrite names with a catalog_names() mapping, dropping blanks and duplicates"""
+    if names is None:
+        return None
+    keys = dict.fromkeys(key for key in map(skill_key, names) if key)
+    return [canonical[key] for key in keys]
+
+async def canonicalize_skills(
+    db: AsyncSession, names: Optional[List[str]], register: bool = False
+) -> Optional[List[str]]:
+    """
+    Map skill names to the spelling used in the skills catalog, so tasks and
+    filters agree with volunteers' skills. Unknown names are kept (whitespace
+    cleaned) and duplicates are dropped, preserving order.
+    """
+    if names is None:
+        return None
+    return apply_catalog_names(names, await catalog_names(db, names, register))
+
+@lru_cache(maxsize=None)
+def register_skills_statement():
+    """
+    Resolve skill names to catalog rows, creating the missing ones, in one statement:
+
+        WITH existing AS (SELECT id, name, key(name) FROM skills WHERE key(name) = ANY(:keys)),
+             inserted AS (INSERT INTO skills SELECT ... FROM unnest(:names, :keys) AS wanted(name, key)
+                          WHERE NOT EXISTS (SELECT FROM existing WHERE key = wanted.key)
+                          ON CONFLICT (name) DO NOTHING RETURNING id, name)
+        SELECT id, name FROM existing UNION ALL SELECT id, name FROM inserted
+
+    The catalog is scanned once; NOT EXISTS probes the CTE instead of
+    evaluating the key expression over the whole catalog per wanted name.
+    Built once; execute with {"names": [...], "keys": [...]} (parallel arrays).
+    """
+    keys = bindparam("keys", type_=ARRAY(String))
+    wanted = (
+        func.unnest(bindparam("names", type_=ARRAY(String)), keys)
+        .table_valued("name", "key")
+        .render_derived(name="wanted")
+    )
+    existing = (
+        select(Skill.id, Skill.name, skill_key_sql(Skill.name).label("key"))
+        .where(skill_key_sql(Skill.name) == any_(keys))
+        .cte("existing")
+    )
+    inserted = (
+        insert(Skill)
+        .from_select(
+            ["id", "name", "created_at"],
+            select(func.gen_random_uuid(), wanted.c.name, func.now()).where(
+                ~exists().where(existing.c.key == wanted.c.key)
+            ),
+        )
+        .on_conflict_do_nothing(index_elements=["name"])
+        .returning(Skill.id, Skill.name)
+        .cte("inserted")
+    )
+    return select(existing.c.id, existing.c.name).union_all(select(inserted.c.id, inserted.c.name))
+
+@lru_cache(maxsize=None)
+def link_skills_statement():
+    """
+    Link a volunteer to every skill in :skill_ids that is not linked yet
+    (the unique constraint skips the others). Execute with
+    {"volunteer_id": ..., "skill_ids": [...]}.
+    """
+    skill_ids = func.unnest(bindparam("skill_ids", type_=ARRAY(PG_UUID(as_uuid=True))))
+    volunteer_id = bindparam("volunteer_id", type_=PG_UUID(as_uuid=True))
+    # The Core table: an ORM insert executed with parameters would take the bulk INSERT path
+    return (
+        insert(VolunteerSkill.__table__)
+        .from_select(
+            ["id", "user_id", "skill_id", "created_at"],
+            select(func.gen_random_uuid(), volunteer_id, skill_ids, func.now()),
+        )
+        .on_conflict_do_nothing(constraint="uq_volunteer_skills_user_skill")
+    )
+
+@lru_cache(maxsize=None)
+def unlink_skills_statement():
+    """
+    Remove a volunteer's links to every skill not in :skill_ids. Execute with
+    {"volunteer_id": ..., "skill_ids": [...]}; an empty array removes them all.
+    """
+    return delete(VolunteerSkill).where(
+        VolunteerSkill.user_id == bindparam("volunteer_id", type_=PG_UUID(as_uuid=True)),
+        VolunteerSkill.skill_id != all_(bindparam("skill_ids", type_=ARRAY(PG_UUID(as_uuid=True)))),
+    )
+
+async def register_skill_ids(db: AsyncSession, names: Iterable[str]) -> Dict[str, Tuple[UUID, str]]:
+    """
+    Map the skill_key of every name to its catalog (id, name), adding unknown
+    names to the skills table with register_skills_statement (and to
+    skill_catalog on commit). A name inserted
+    concurrently by another transaction is not visible to that statement;
+    those keys are looked up once more afterwards.
+    """
+    wanted = _wanted_names(names)
+    if not wanted:
+        return {}
+
+    result = await db.execute(register_skills_statement(), {"names": list(wanted.values()), "keys": list(wanted)})
+    resolved: Dict[str, Tuple[UUID, str]] = {}
+    # Several legacy spellings may share a key; keep the first by name like catalog_names
+    for skill_id, name in sorted(result.all(), key=lambda row: row[1]):
+        resolved.setdefault(skill_key(name), (skill_id, name))
+
+    missing = [key for key in wanted if key not in resolved]
+    if missing:
+        result = await db.execute(
+            select(Skill.id, Skill.name).where(skill_key_sql(Skill.name).in_(missing)).order_by(Skill.name)
+        )
+        for skill_id, name in result.all():
+            resolved.setdefault(skill_key(name), (skill_id, name))
+    add_on_commit(db, (name for _, name in resolved.values()))
+    return resolved
+
+async def save_volunteer_skills(
+    db: AsyncSession, user_id: UUID, names: Iterable[str], replace: bool = False
+) -> List[str]:
+    """
+    Link a volunteer to the given skills (registering unknown names) with
+    set-based statements: one to resolve/create the skills, one DELETE of
+    the links no longer wanted (replace=True only) and one INSERT of the
+    missing links. Returns the catalog names requested. The caller commits.
+    """
+    resolved = await register_skill_ids(db, names)
+    params = {"volunteer_id": user_id, "skill_ids": [skill_id for skill_id, _ in resolved.values()]}
+    if replace:
+        await db.execute(unlink_skills_statement(), params)
+    if resolved:
+        await db.execute(link_skills_statement(), params)
+    return [name for _, name in resolved.values()]
+
+
+class SkillCatalog:
+    """
+    Per-worker copy of the skills catalog for autocomplete and name lookups.
+
+    Entries are keyed by skill_key, so legacy spellings that only differ in
+    case or separators ("First Aid", "first-aid") collapse into one entry
+    named like catalog_names would pick. Every word start of every key is an
+    entry in one sorted array of key suffixes, so the names matching a
+    prefix are one bisected slice ("aid" finds "first aid"), and a parallel
+    NumPy array of rank scores picks the best of a slice without sorting it.
+    The sorted array doubles as an implicit trie for typo tolerance: the
+    suffixes one edit away from a prefix are found by walking the children
+    of the prefix's own path instead of scanning the catalog.
+    Names registered through this worker are added when their transaction
+    commits (see add_on_commit); the whole
+    catalog is reloaded in the background every `refresh_seconds` to pick up
+    other workers' inserts and the volunteer counts used for ranking.
+    """
+
+    def __init__(self, refresh_seconds: float, max_suggestions: int = 50):
+        self.refresh_seconds = refresh_seconds
+        self.max_suggestions = max_suggestions
+        self.loaded_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._pending: Optional[list] = None
+        self._names: Dict[str, str] = {}
+        self._volunteers: Dict[str, int] = {}
+        self._build()
+        # Memoized suggestions per (normalized prefix, limit); cleared whenever the catalog changes
+        self._suggestions: Dict[Tuple[str, int], List[str]] = {}
+
+    # ---------- maintenance ----------
+
+    @staticmethod
+    def _word_starts(key: str) -> List[int]:
+        return [0] + [i + 1 for i, char in enumerate(key) if char == " "]
+
+    def _rank(self, key: str) -> tuple:
+        """Most volunteers first, then shorter names, then alphabetical"""
+        return -self._volunteers[key], len(key), key
+
+    def _build(self):
+        """Derive the sorted index and the rank scores from _names/_volunteers"""
+        self._ranks = sorted(map(self._rank, self._names))
+        self._ranked = [rank[2] for rank in self._ranks]
+        position = {key: i for i, key in enumerate(self._ranked)}
+        entries = sorted((key[start:], start, key) for key in self._names for start in self._word_starts(key))
+        self._suffixes = [suffix for suffix, _, _ in entries]
+        self._entry_keys = [key for _, _, key in entries]
+        # Names starting with the prefix beat names with a later word starting with it
+        self._entry_scores = np.array(
+            [position[key] + (_WORD_MATCH if start else 0) for _, start, key in entries], dtype=np.int64
+        )
+        self._suggestions = {}
+
+    def _insert(self, key: str):
+        """Add one key without rebuilding: O(catalog) list and array inserts"""
+        rank = self._rank(key)
+        position = bisect.bisect_left(self._ranks, rank)
+        self._ranks.insert(position, rank)
+        self._ranked.insert(position, key)
+        self._entry_scores[self._entry_scores % _WORD_MATCH >= position] += 1
+        for start in self._word_starts(key):
+            i = bisect.bisect_left(self._suffixes, key[start:])
+            self._suffixes.insert(i, key[start:])
+            self._entry_keys.insert(i, key)
+            self._entry_scores = np.insert(self._entry_scores, i, position + (_WORD_MATCH if start else 0))
+
+    def load(self, rows: Iterable[tuple]):
+        """Rebuild from (name, volunteer count) rows ordered by name"""
+        names: Dict[str, str] = {}
+        volunteers: Dict[str, int] = {}
+        for name, count in rows:
+            key = skill_key(name)
+            if not key:
+                continue
+            names.setdefault(key, name)
+            volunteers[key] = volunteers.get(key, 0) + (count or 0)
+        self._names, self._volunteers = names, volunteers
+        self._build()
+        self.loaded_at = time.monotonic()
+
+    def add(self, names: Iterable[str]):
+        """Register names written to the skills table by this worker"""
+        names = list(names)
+        if self._pending is not None:
+            self._pending.extend(names)
+        for name in names:
+            key = skill_key(name)
+            if key and key not in self._names:
+                self._names[key] = clean_skill_name(name)
+                self._volunteers[key] = 0
+                self._insert(key)
+                self._suggestions = {}
+
+    async def _reload(self):
+        # Names added while the rows are being fetched are replayed afterwards
+        self._pending = []
+        try:
+            async with AsyncSessionLocal() as db:
+                result = await db.execute(
+                    select(Skill.name, func.count(VolunteerSkill.id))
+                    .outerjoin(VolunteerSkill, VolunteerSkill.skill_id == Skill.id)
+                    .group_by(Skill.id, Skill.name)
+                    .order_by(Skill.name)
+                )
+                rows = result.all()
+            pending, self._pending = self._pending, None
+            self.load(rows)
+            self.add(pending)
+        finally:
+            self._pending = None
+
+    async def refresh(self):
+        async with self._lock:
+            await self._reload()
+
+    async def ensure_loaded(self):
+        """
+        Load on first use; afterwards an expired snapshot keeps serving while
+        a background task reloads it, so lookups never wait for Postgres
+        """
+        if self.loaded_at is None:
+            async with self._lock:
+                if self.loaded_at is None:
+                    await self._reload()
+        elif time.monotonic() - self.loaded_at >= self.refresh_seconds and (
+            self._refresh_task is None or self._refresh_task.done()
+        ):
+            self._refresh_task = asyncio.create_task(self.refresh())
+
+    # ---------- lookups ----------
+
+    def lookup(self, key: str) -> Optional[str]:
+        """Catalog spelling for a skill_key, None if this worker has not seen it"""
+        return self._names.get(key)
+
+    def _range(self, prefix: str, low: int = 0) -> Tuple[int, int]:
+        low = bisect.bisect_left(self._suffixes, prefix, low)
+        return low, bisect.bisect_left(self._suffixes, prefix + _LAST_CHAR, low)
+
+    def _children(self, prefix: str) -> Iterable[str]:
+        """Distinct characters following prefix in the index, one bisect each"""
+        position, end = self._range(prefix)
+        depth = len(prefix)
+        while position < end:
+            suffix = self._suffixes[position]
+            if len(suffix) == depth:
+                position += 1
+                continue
+            child = suffix[depth]
+            yield child
+            position = bisect.bisect_left(self._suffixes, prefix + child + _LAST_CHAR, position)
+
+    def _typo_ranges(self, query: str) -> List[Tuple[int, int]]:
+        """
+        Index slices whose suffixes start with a string one edit (substitution,
+        insertion, deletion or swap of neighbours) away from query. The first
+        letter is trusted for substitutions and insertions, which keeps the
+        walk to the few children along the query's own path.
+        """
+        variants = set()
+        for i in range(len(query)):
+            head = query[:i]
+            variants.add(head + query[i + 1:])
+            if i + 1 < len(query):
+                variants.add(head + query[i + 1] + query[i] + query[i + 2:])
+            if i:
+                for child in self._children(head):
+                    variants.add(head + child + query[i:])
+                    if child != query[i]:
+                        variants.add(head + child + query[i + 1:])
+        variants.discard(query)
+        return [span for span in map(self._range, variants) if span[0] < span[1]]
+
+    def _best(self, spans: List[Tuple[int, int, int]], limit: int) -> List[str]:
+        """Best `limit` distinct keys of the (low, high, score offset) index slices"""
+        if not spans:
+            return []
+        scores = np.concatenate([self._entry_scores[low:high] + offset for low, high, offset in spans])
+        entries = np.concatenate([np.arange(low, high) for low, high, _ in spans])
+        # A key has one entry per word and may sit in several slices; over-fetch, then dedupe
+        fetch = min(len(scores), limit * 4)
+        if fetch < len(scores):
+            top = np.argpartition(scores, fetch - 1)[:fetch]
+            order = top[np.argsort(scores[top], kind="stable")]
+        else:
+            order = np.argsort(scores, kind="stable")
+        keys = list(dict.fromkeys(self._entry_keys[entries[i]] for i in order))
+        if len(keys) < limit and fetch < len(scores):
+            order = np.argsort(scores, kind="stable")
+            keys = list(dict.fromkeys(self._entry_keys[entries[i]] for i in order))
+        return keys[:limit]
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[Tuple[str, int]]:
+        """
+        Up to `limit` (name, volunteer count) pairs for an autocomplete prefix,
+        best first: exact name, names starting with the prefix, names with a
+        later word starting with it, then (prefixes of 4+ characters) names
+        one typo away. Within a group the skills most volunteers have come
+        first, then shorter names.
+        """
+        query = skill_key(prefix)
+        limit = min(limit, self.max_suggestions)
+        if not query:
+            keys = self._ranked[:limit]
+        else:
+            keys = self._suggestions.get((query, limit))
+            if keys is None:
+                low, high = self._range(query)
+                keys = self._best([(low, high, 0)], limit)
+                if query in self._names:
+                    keys = [query] + [key for key in keys if key != query][: limit - 1]
+                if len(keys) < limit and len(query) >= 4:
+                    # Typo matches rank after every exact match
+                    spans = [(low, high, 2 * _WORD_MATCH) for low, high in self._typo_ranges(query)]
+                    typos = self._best(spans, limit)
+                    keys += [key for key in typos if key not in keys][: limit - len(keys)]
+                if len(self._suggestions) >= 10000:
+                    self._suggestions.clear()
+                self._suggestions[(query, limit)] = keys
+        return [(self._names[key], self._volunteers[key]) for key in keys]
+
+    def stats(self) -> dict:
+        return {
+            "skills": len(self._names),
+            "index_entries": len(self._suffixes),
+            "cached_prefixes": len(self._suggestions),
+            "age_seconds": round(time.monotonic() - self.loaded_at, 1) if self.loaded_at is not None else None,
+        }
+
+
+skill_catalog = SkillCatalog(settings.skill_catalog_refresh_seconds)
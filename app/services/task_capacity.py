@@ -0,0 +1,199 @@
+from functools import lru_cache
+from typing import List
+from uuid import UUID
+from sqlalchemy import bindparam, case, func, or_, update
+from sqlalchemy.future import select
+from ..models.applications import Application, ApplicationStatus
+from ..models.volunteer_task import VolunteerTask
+from .notifications import application_event_column
+
+
+def status_change_statement(criteria: List, status: ApplicationStatus):
+    """
+    Change the status of the applications matching criteria (which may refer
+    to VolunteerTask, joined on the application's task) and keep
+    volunteer_tasks.accepted_count in step, in one statement:
+
+        WITH target   AS (SELECT applications matching criteria, +1/-1/0 slot delta
+                          ORDER BY id FOR UPDATE OF applications),
+             capacity AS (SELECT free slots of tasks gaining acceptances FOR UPDATE),
+             granted  AS (targets whose acceptance fits: row_number() <= free slots),
+             slots    AS (UPDATE volunteer_tasks SET accepted_count += sum(delta) ...),
+             updated  AS (UPDATE applications SET status FROM granted RETURNING ...)
+        SELECT target.id, updated.*, pg_notify(...) FROM target LEFT JOIN updated
+
+    Only the tasks involved are row-locked, never the table, and the locks
+    return the latest committed counts, so concurrent acceptances cannot
+    overfill a task; the CHECK constraint on volunteer_tasks backs this up.
+    Rows come back for every matched application; updated columns are NULL
+    where the task had no free slot left. Acceptances are granted oldest
+    application first. Every changed application is announced on the
+    notification channel once the transaction commits.
+    """
+    accepted = ApplicationStatus.accepted
+    if status == accepted:
+        delta = case((Application.status != accepted, 1), else_=0)
+    else:
+        delta = case((Application.status == accepted, -1), else_=0)
+
+    target = (
+        select(Application.id, Application.task_id, Application.applied_at, delta.label("delta"))
+        .join(VolunteerTask, VolunteerTask.id == Application.task_id)
+        .where(*criteria)
+        .order_by(Application.id)
+        .with_for_update(of=Application)
+        .cte("target")
+    )
+    capacity = (
+        select(VolunteerTask.id, (VolunteerTask.max_volunteers - VolunteerTask.accepted_count).label("free"))
+        .where(VolunteerTask.id.in_(select(target.c.task_id).where(target.c.delta > 0)))
+        .order_by(VolunteerTask.id)
+        .with_for_update()
+        .cte("capacity")
+    )
+    position = func.row_number().over(
+        partition_by=target.c.task_id, order_by=(target.c.applied_at, target.c.id)
+    )
+    ranked = (
+        select(target.c.id, target.c.task_id, target.c.delta, position.label("position"))
+        .where(target.c.delta > 0)
+        .subquery("ranked")
+    )
+    granted = (
+        select(target.c.id, target.c.task_id, target.c.delta)
+        .where(target.c.delta <= 0)
+        .union_all(
+            select(ranked.c.id, ranked.c.task_id, ranked.c.delta)
+            .join(capacity, capacity.c.id == ranked.c.task_id)
+            .where(or_(capacity.c.free.is_(None), ranked.c.position <= capacity.c.free))
+        )
+        .cte("granted")
+    )
+    per_task = (
+        select(granted.c.task_id, func.sum(granted.c.delta).label("delta"))
+        .group_by(granted.c.task_id)
+        .having(func.sum(granted.c.delta) != 0)
+        .subquery("per_task")
+    )
+    slots = (
+        update(VolunteerTask)
+        .where(VolunteerTask.id == per_task.c.task_id)
+        .values(
+            accepted_count=VolunteerTask.accepted_count + per_task.c.delta,
+            version=VolunteerTask.version + 1,
+            # Spelled out: Python-side onupdate defaults are not applied inside a CTE
+            updated_at=func.now(),
+        )
+        .returning(VolunteerTask.id)
+        .cte("slots")
+    )
+    columns = ["id", "task_id", "volunteer_id", "status", "applied_at"]
+    updated = (
+        update(Application)
+        .where(Application.id == granted.c.id)
+        .values(status=status)
+        .returning(*[Application.__table__.c[name] for name in columns])
+        .cte("updated")
+    )
+    return (
+        select(
+            target.c.id.label("target_id"),
+            target.c.task_id.label("target_task_id"),
+            *updated.c,
+            application_event_column("application.status_changed", updated.c),
+        )
+        .select_from(target.outerjoin(updated, updated.c.id == target.c.id))
+        # Nothing reads slots; add_cte still emits it and PostgreSQL always runs it
+        .add_cte(slots)
+    )
+
+
+@lru_cache(maxsize=None)
+def application_status_statement(status: ApplicationStatus, owned: bool):
+    """
+    Status change of one application, the hot path when many reviewers
+    accept volunteers for the same task at once:
+
+        WITH target  AS (SELECT the application, +1/-1/0 slot delta FOR UPDATE OF applications),
+             slot    AS (UPDATE volunteer_tasks SET accepted_count = accepted_count + delta
+                         WHERE id = target.task_id AND (delta < 0 OR accepted_count < max_volunteers)
+                         RETURNING id),
+             updated AS (UPDATE applications SET status ... WHERE delta = 0 OR EXISTS (SELECT FROM slot))
+        SELECT target.id, updated.*, pg_notify(...) FROM target LEFT JOIN updated
+
+    Unlike the set-based statement it never locks the task up front: the
+    conditional UPDATE re-checks the capacity on the latest row version, and
+    once a task is full the check fails on the visible row without waiting
+    for anyone's lock. Built once per (status, owned); execute with
+    {"application_id": ...} plus {"owner_id": ...} when owned (bind names must
+    not match a column of the updated tables, which would make them SET values).
+    """
+    accepted = ApplicationStatus.accepted
+    if status == accepted:
+        delta = case((Application.status != accepted, 1), else_=0)
+    else:
+        delta = case((Application.status == accepted, -1), else_=0)
+    criteria = [Application.id == bindparam("application_id")]
+    if owned:
+        criteria.append(VolunteerTask.posted_by_id == bindparam("owner_id"))
+
+    target = (
+        select(Application.id, Application.task_id, delta.label("delta"))
+        .join(VolunteerTask, VolunteerTask.id == Application.task_id)
+        .where(*criteria)
+        .with_for_update(of=Application)
+        .cte("target")
+    )
+    slot = (
+        update(VolunteerTask)
+        .where(
+            VolunteerTask.id == target.c.task_id,
+            target.c.delta != 0,
+            or_(
+                target.c.delta < 0,
+                VolunteerTask.max_volunteers.is_(None),
+                VolunteerTask.accepted_count < VolunteerTask.max_volunteers,
+            ),
+        )
+        .values(
+            accepted_count=VolunteerTask.accepted_count + target.c.delta,
+            version=VolunteerTask.version + 1,
+            # Spelled out: Python-side onupdate defaults are not applied inside a CTE
+            updated_at=func.now(),
+        )
+        .returning(VolunteerTask.id)
+        .cte("slot")
+    )
+    columns = ["id", "task_id", "volunteer_id", "status", "applied_at"]
+    updated = (
+        update(Application)
+        .where(
+            Application.id == target.c.id,
+            or_(target.c.delta == 0, select(slot.c.id).exists()),
+        )
+        .values(status=status)
+        .returning(*[Application.__table__.c[name] for name in columns])
+        .cte("updated")
+    )
+    return (
+        select(
+            target.c.id.label("target_id"),
+            target.c.task_id.label("target_task_id"),
+            *updated.c,
+            application_event_column("application.status_changed", updated.c),
+        )
+        .select_from(target.outerjoin(updated, updated.c.id == target.c.id))
+    )
+
+
+def release_slot_statement(task_id: UUID):
+    """Give back the slot of an accepted application that is being removed"""
+    return (
+        update(VolunteerTask)
+        .where(VolunteerTask.id == task_id)
+        .values(
+            accepted_count=VolunteerTask.accepted_count - 1,
+            version=VolunteerTask.version + 1,
+            updated_at=func.now(),
+        )
+    )
@@ -0,0 +1,199 @@
+import codecs
+import csv
+import io
+import json
+import uuid
+from datetime import datetime, timezone
+from typing import AsyncIterator, List, Optional, Tuple
+from fastapi import HTTPException, status
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..config import settings
+from ..schemas.task import TaskCreate
+from ..models.volunteer_task import VolunteerTask
+from .skill_catalog import catalog_names, apply_catalog_names
+
+# Columns written by COPY; version, search_vector etc. come from the table defaults
+COPY_COLUMNS = [
+    "id", "title", "description", "location", "skills_required", "max_volunteers",
+    "posted_by_id", "is_active", "created_at", "updated_at",
+]
+
+# Separators accepted inside the CSV skills_required column
+_CSV_SKILL_SEPARATORS = (";", "|")
+
+
+def _line_too_long(max_line_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Lines and CSV records are limited to {max_line_bytes} bytes",
+    )
+
+
+async def iter_lines(
+    chunks: AsyncIterator[bytes], max_line_bytes: int = settings.bulk_import_max_line_bytes
+) -> AsyncIterator[str]:
+    """
+    Decode a byte stream as UTF-8 and yield it line by line (newline kept).
+    Raises 413 once a line grows past max_line_bytes, so a body without
+    newlines is never buffered whole.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buffered = b""
+    async for chunk in chunks:
+        buffered += chunk
+        # b"\n" never occurs inside a multi-byte UTF-8 sequence
+        *lines, buffered = buffered.split(b"\n")
+        for line in lines:
+            if len(line) > max_line_bytes:
+                raise _line_too_long(max_line_bytes)
+            yield decoder.decode(line + b"\n")
+        if len(buffered) > max_line_bytes:
+            raise _line_too_long(max_line_bytes)
+    last = decoder.decode(buffered, final=True)
+    if last:
+        yield last
+
+
+async def ndjson_records(lines: AsyncIterator[str]) -> AsyncIterator[Tuple[int, Optional[dict], Optional[str]]]:
+    """(row number, record, parse error) for every non-blank line"""
+    row = 0
+    async for line in lines:
+        if not line.strip():
+            continue
+        row += 1
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield row, None, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(record, dict):
+            yield row, None, "Each line must be a JSON object"
+            continue
+        yield row, record, None
+
+
+def _split_skills(value: str) -> List[str]:
+    for separator in _CSV_SKILL_SEPARATORS:
+        value = value.replace(separator, ",")
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+async def csv_records(
+    lines: AsyncIterator[str], max_record_bytes: int = settings.bulk_import_max_line_bytes
+) -> AsyncIterator[Tuple[int, Optional[dict], Optional[str]]]:
+    """
+    (row number, record, parse error) for every data row after the header.
+    Quoted fields may span lines, up to max_record_bytes per record (413
+    beyond); empty cells become None and skills_required is split on ',',
+    ';' or '|'.
+    """
+    header = None
+    record_text = ""
+    record_bytes = 0
+    row = 0
+    async for line in lines:
+        record_text += line
+        record_bytes += len(line.encode("utf-8"))
+        # An odd number of quotes means a quoted field continues on the next line
+        if record_text.count('"') % 2:
+            if record_bytes > max_record_bytes:
+                raise _line_too_long(max_record_bytes)
+            continue
+        text, record_text, record_bytes = record_text, "", 0
+        if not text.strip():
+            continue
+        try:
+            values = next(csv.reader(io.StringIO(text)))
+        except csv.Error as e:
+            values, error = None, f"Invalid CSV: {e}"
+        else:
+            error = None
+
+        if header is None:
+            if values is None:
+                raise ValueError(error)
+            header = [name.strip().lower() for name in values]
+            if "title" not in header or "description" not in header:
+                raise ValueError("CSV header must include title and description")
+            continue
+
+        row += 1
+        if values is None:
+            yield row, None, error
+            continue
+        if len(values) != len(header):
+            yield row, None, f"Expected {len(header)} columns, got {len(values)}"
+            continue
+        record = {name: (value.strip() or None) for name, value in zip(header, values)}
+        if record.get("skills_required") is not None:
+            record["skills_required"] = _split_skills(record["skills_required"])
+        yield row, record, None
+
+    if record_text.strip():
+        yield row + 1, None, "Invalid CSV: unterminated quoted field"
+
+
+class TaskImport:
+    """
+    Validates records against TaskCreate in chunks and COPYs the valid ones
+    into volunteer_tasks inside the caller's transaction.
+    """
+
+    def __init__(self, db: AsyncSession, posted_by_id: uuid.UUID, max_errors: int = 100):
+        self.db = db
+        self.posted_by_id = posted_by_id
+        self.max_errors = max_errors
+        self.received = 0
+        self.errors: List[dict] = []
+        self.error_count = 0
+        self.inserted: List[tuple] = []
+
+    def _error(self, row: int, message: str):
+        self.error_count += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"row": row, "error": message})
+
+    async def add_chunk(self, records: List[Tuple[int, Optional[dict], Optional[str]]]):
+        self.received += len(records)
+        valid: List[TaskCreate] = []
+        for row, record, error in records:
+            if error:
+                self._error(row, error)
+                continue
+            try:
+                valid.append(TaskCreate.model_validate(record))
+            except ValidationError as e:
+                self._error(row, "; ".join(
+                    f"{'.'.join(str(part) for part in err['loc']) or 'row'}: {err['msg']}" for err in e.errors()
+                ))
+        if not valid:
+            return
+
+        # One catalog lookup for the whole chunk
+        canonical = await catalog_names(
+            self.db, [name for task in valid for name in (task.skills_required or [])], register=True
+        )
+        now = datetime.now(timezone.utc)
+        records_to_copy = [
+            (
+                uuid.uuid4(), task.title, task.description, task.location,
+                apply_catalog_names(task.skills_required, canonical), task.max_volunteers,
+                self.posted_by_id, True, now, now,
+            )
+            for task in valid
+        ]
+        connection = await self.db.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            VolunteerTask.__tablename__, records=records_to_copy, columns=COPY_COLUMNS
+        )
+        self.inserted.extend(records_to_copy)
+
+    def report(self) -> dict:
+        return {
+            "received": self.received,
+            "inserted": len(self.inserted),
+            "failed": self.error_count,
+            "errors": self.errors,
+        }
@@ -0,0 +1,59 @@
+from typing import Optional
+from sqlalchemy import func
+from sqlalchemy.future import select
+from ..models.volunteer_task import VolunteerTask
+
+SEARCH_CONFIG = "english"
+HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxWords=35, MinWords=15, MaxFragments=2"
+
+def parse_search_query(search: str):
+    """Web-style query: quoted phrases, OR and -exclusions are supported"""
+    return func.websearch_to_tsquery(SEARCH_CONFIG, search)
+
+def search_match(search: str):
+    """WHERE clause served by the GIN index on search_vector"""
+    return VolunteerTask.search_vector.bool_op("@@")(parse_search_query(search))
+
+def search_rank(search: str):
+    return func.ts_rank(VolunteerTask.search_vector, parse_search_query(search))
+
+# HTML-escaped before ts_headline, so the only markup in a highlight is <mark>
+HTML_ESCAPES = (("&", "&amp;"), ("<", "&lt;"), (">", "&gt;"), ('"', "&quot;"), ("'", "&#39;"))
+
+def escape_html(column):
+    for character, entity in HTML_ESCAPES:
+        column = func.replace(column, character, entity)
+    return column
+
+def highlight(column, search: str):
+    """ts_headline fragments of the escaped column, safe to render as HTML"""
+    return func.ts_headline(SEARCH_CONFIG, escape_html(column), parse_search_query(search), HEADLINE_OPTIONS)
+
+def task_search_query(search: str, skip: int = 0, limit: int = 20, is_active: Optional[bool] = True):
+    """
+    Ranked full-text search over tasks.
+    Matching and ranking run over the whole result set first; the costly
+    ts_headline snippets are only built for the rows on the requested page.
+    Rows are (VolunteerTask, rank, title_highlight, snippet).
+    """
+    rank = search_rank(search).label("rank")
+    matches = select(VolunteerTask.id, rank).where(search_match(search))
+    if is_active is not None:
+        matches = matches.where(VolunteerTask.is_active == is_active)
+    matches = (
+        matches.order_by(rank.desc(), VolunteerTask.id)
+        .offset(skip)
+        .limit(limit)
+        .subquery()
+    )
+
+    return (
+        select(
+            VolunteerTask,
+            matches.c.rank,
+            highlight(VolunteerTask.title, search).label("title_highlight"),
+            highlight(VolunteerTask.description, search).label("snippet"),
+        )
+        .join(matches, matches.c.id == VolunteerTask.id)
+        .order_by(matches.c.rank.desc(), VolunteerTask.id)
+    )
@@ -0,0 +1,152 @@
+"""
+Admin Task Listing Benchmark for Dovol
+
+This script seeds tasks with applications and compares two ways of building
+a page of GET /admin/tasks: the previous one (load the page, then one
+SELECT count(*) per task) and the single statement it runs now
+(admin_task_listing_query: page subquery plus a LATERAL count per status).
+It times the newest-first listing, the listing sorted by application count
+and a full-text search, and checks the counts against the per-task queries.
+
+    python benchmark_admin_task_listing.py [--tasks 5000] [--applications 100000] [--limit 100]
+
+Seeded rows are deleted at the end.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from sqlalchemy import desc, func, text
+from sqlalchemy.future import select
+from app.database import AsyncSessionLocal, engine
+from app.models.user import User  # noqa: F401 - registers the mapper used by VolunteerTask.posted_by
+from app.models.volunteer_task import VolunteerTask
+from app.models.applications import Application, ApplicationStatus
+from app.routers.admin import admin_task_listing_query
+from app.services.task_search import task_search_query
+
+WORDS = ["river", "cleanup", "tutoring", "garden", "shelter", "library", "kitchen", "clinic"]
+
+async def seed(db, ngo_id, tasks, applications):
+    prefix = f"bench-admin-tasks-{ngo_id}-"
+    volunteers = max(1, applications // tasks * 2)
+    await db.execute(text("""
+        INSERT INTO users (id, full_name, email, password_hash, role, is_active, created_at, updated_at)
+        SELECT CASE WHEN g = 0 THEN CAST(:ngo AS uuid) ELSE gen_random_uuid() END, 'Benchmark user',
+               :prefix || g || '@example.org', 'x',
+               CAST(CASE WHEN g = 0 THEN 'ngo' ELSE 'volunteer' END AS roles), true, now(), now()
+        FROM generate_series(0, :n) AS g
+    """), {"ngo": ngo_id, "prefix": prefix, "n": volunteers})
+    await db.execute(text("""
+        INSERT INTO volunteer_tasks (id, title, description, posted_by_id, is_active, created_at, updated_at)
+        SELECT gen_random_uuid(), 'Task ' || g || ' ' || (CAST(:words AS text[]))[1 + g % 8],
+               'Help with the ' || (CAST(:words AS text[]))[1 + g % 8] || ' and the '
+               || (CAST(:words AS text[]))[1 + g % 5] || ' this weekend',
+               :ngo, g % 4 <> 0, now() - g * interval '1 minute', now()
+        FROM generate_series(1, :n) AS g
+    """), {"ngo": ngo_id, "n": tasks, "words": WORDS})
+    volunteer_ids = (await db.execute(
+        text("SELECT id FROM users WHERE email LIKE :prefix || '%' AND role = 'volunteer'"), {"prefix": prefix}
+    )).scalars().all()
+    task_ids = (await db.execute(
+        text("SELECT id FROM volunteer_tasks WHERE posted_by_id = :ngo"), {"ngo": ngo_id}
+    )).scalars().all()
+    # Skewed: task k gets applications from the first (k % volunteers) volunteers, capped by the total
+    await db.execute(text("""
+        INSERT INTO applications (id, task_id, volunteer_id, status, applied_at)
+        SELECT gen_random_uuid(), t.id, (CAST(:volunteers AS uuid[]))[v],
+               CAST(CASE v % 3 WHEN 0 THEN 'pending' WHEN 1 THEN 'accepted' ELSE 'rejected' END AS application_status),
+               now()
+        FROM unnest(CAST(:tasks AS uuid[])) WITH ORDINALITY AS t(id, k)
+        CROSS JOIN LATERAL generate_series(1, (k % :n_volunteers)::int) AS v
+        LIMIT :n
+    """), {"tasks": list(task_ids), "volunteers": list(volunteer_ids),
+           "n_volunteers": len(volunteer_ids), "n": applications})
+    await db.commit()
+    await db.execute(text("ANALYZE users, volunteer_tasks, applications"))
+
+async def cleanup(db, ngo_id):
+    await db.execute(text("""
+        DELETE FROM applications WHERE task_id IN (SELECT id FROM volunteer_tasks WHERE posted_by_id = :ngo)
+    """), {"ngo": ngo_id})
+    await db.execute(text("DELETE FROM volunteer_tasks WHERE posted_by_id = :ngo"), {"ngo": ngo_id})
+    await db.execute(text("DELETE FROM users WHERE email LIKE :prefix || '%'"),
+                     {"prefix": f"bench-admin-tasks-{ngo_id}-"})
+    await db.commit()
+
+async def per_task_counts(db, limit, search):
+    """The previous get_all_tasks body: the page, then a count query per task"""
+    if search:
+        tasks = [row.VolunteerTask for row in (await db.execute(task_search_query(search, 0, limit, None))).all()]
+    else:
+        tasks = (await db.execute(
+            select(VolunteerTask).order_by(desc(VolunteerTask.created_at)).limit(limit)
+        )).scalars().all()
+    counts = {}
+    for task in tasks:
+        counts[task.id] = (await db.execute(
+            select(func.count(Application.id)).where(Application.task_id == task.id)
+        )).scalar()
+    return counts
+
+async def one_statement(db, limit, search, sort=None):
+    rows = (await db.execute(admin_task_listing_query(0, limit, None, search, sort))).all()
+    return {row.id: row.application_count for row in rows}, rows
+
+async def timed(load, repeats):
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        result = await load()
+        timings.append((time.perf_counter() - started) * 1000)
+    return result, statistics.median(timings)
+
+async def main(tasks, applications, limit, repeats=10):
+    ngo_id = uuid.uuid4()
+    async with AsyncSessionLocal() as db:
+        await seed(db, ngo_id, tasks, applications)
+    ok = True
+    try:
+        print("="*60)
+        print("DOVOL ADMIN TASK LISTING BENCHMARK")
+        print(f"{tasks} tasks, {applications} applications, pages of {limit}")
+        print("="*60)
+        async with AsyncSessionLocal() as db:
+            for label, search in (("newest first", None), ("search 'river'", "river")):
+                old_counts, old = await timed(lambda: per_task_counts(db, limit, search), repeats)
+                (new_counts, rows), new = await timed(lambda: one_statement(db, limit, search), repeats)
+                by_status = all(
+                    row.application_count
+                    == row.pending_applications + row.accepted_applications + row.rejected_applications
+                    for row in rows
+                )
+                same = new_counts == old_counts and by_status
+                ok &= same
+                print(f"{'✓' if same else '✗'} {label:<16} {len(old_counts) + 1:>4} queries {old:>8.1f} ms"
+                      f"  ->  1 statement {new:>7.1f} ms  ({old / new:.1f}x)")
+
+            (sorted_counts, rows), elapsed = await timed(lambda: one_statement(db, limit, None, "applications"), repeats)
+            expected = (await db.execute(text("""
+                SELECT count(*) FROM applications GROUP BY task_id ORDER BY count(*) DESC LIMIT :limit
+            """), {"limit": limit})).scalars().all()
+            ordered = [row.application_count for row in rows] == expected
+            ok &= ordered
+            print(f"{'✓' if ordered else '✗'} {'most applications':<16} {'':>4}         {'':>8}"
+                  f"      1 statement {elapsed:>7.1f} ms  (top {rows[0].application_count})")
+    finally:
+        async with AsyncSessionLocal() as db:
+            await cleanup(db, ngo_id)
+    print("="*60)
+    print("Counts match" if ok else "Count mismatch")
+    return ok
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tasks", type=int, default=5000)
+    parser.add_argument("--applications", type=int, default=100000)
+    parser.add_argument("--limit", type=int, default=100)
+    args = parser.parse_args()
+    engine.echo = False
+    raise SystemExit(0 if asyncio.run(main(args.tasks, args.applications, args.limit)) else 1)
@@ -0,0 +1,112 @@
+"""
+Bulk Task Import Benchmark for Dovol
+
+This script compares the throughput of creating tasks one at a time the way
+POST /tasks/ does (canonicalize skills, INSERT, commit, refresh) with the
+chunked NDJSON + COPY path behind POST /tasks/bulk.
+
+    python benchmark_bulk_import.py [--single 1000] [--bulk 20000]
+
+Rows belong to a throwaway NGO user and are deleted at the end.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from sqlalchemy import text
+from app.config import settings
+from app.database import AsyncSessionLocal, engine
+from app.models.user import User  # noqa: F401 - registers the mapper VolunteerTask refers to
+from app.models.volunteer_task import VolunteerTask
+from app.services.skill_catalog import canonicalize_skills
+from app.services.task_import import TaskImport, iter_lines, ndjson_records
+
+def make_task(i):
+    return {
+        "title": f"Imported task {i}",
+        "description": "Help sort donations at the community centre. " * 4,
+        "location": f"City {i % 50}",
+        "skills_required": [f"Benchmark skill {i % 30}", f"Benchmark skill {i % 7}"],
+    }
+
+async def create_owner(db, owner_id):
+    await db.execute(text("""
+        INSERT INTO users (id, full_name, email, password_hash, role, is_active, created_at, updated_at)
+        VALUES (:id, 'Benchmark NGO', :email, 'x', 'ngo', true, now(), now())
+    """), {"id": owner_id, "email": f"bench-{owner_id}@example.org"})
+    await db.commit()
+
+async def cleanup(db, owner_id):
+    await db.execute(text("DELETE FROM volunteer_tasks WHERE posted_by_id = :owner"), {"owner": owner_id})
+    await db.execute(text("DELETE FROM users WHERE id = :owner"), {"owner": owner_id})
+    await db.execute(text("DELETE FROM skills WHERE name LIKE 'Benchmark skill %'"))
+    await db.commit()
+
+async def one_by_one(db, owner_id, rows):
+    for i in range(rows):
+        task = make_task(i)
+        new_task = VolunteerTask(
+            title=task["title"],
+            description=task["description"],
+            location=task["location"],
+            skills_required=await canonicalize_skills(db, task["skills_required"], register=True),
+            posted_by_id=owner_id,
+        )
+        db.add(new_task)
+        await db.commit()
+        await db.refresh(new_task)
+
+async def ndjson_body(rows, chunk_bytes=64 * 1024):
+    """Simulates request.stream(): the NDJSON upload in fixed-size byte chunks"""
+    body = "".join(json.dumps(make_task(i)) + "\n" for i in range(rows)).encode()
+    for start in range(0, len(body), chunk_bytes):
+        yield body[start:start + chunk_bytes]
+
+async def bulk(db, owner_id, rows):
+    importer = TaskImport(db, owner_id)
+    chunk = []
+    async for record in ndjson_records(iter_lines(ndjson_body(rows))):
+        chunk.append(record)
+        if len(chunk) >= settings.bulk_import_chunk_size:
+            await importer.add_chunk(chunk)
+            chunk = []
+    if chunk:
+        await importer.add_chunk(chunk)
+    await db.commit()
+    return importer.report()
+
+async def timed(label, fn, rows):
+    started = time.perf_counter()
+    await fn()
+    elapsed = time.perf_counter() - started
+    print(f"{label:<28} {rows:>7,} rows {elapsed:>8.2f} s {rows / elapsed:>10,.0f} rows/s")
+    return rows / elapsed
+
+async def main(single_rows, bulk_rows):
+    owner_id = uuid.uuid4()
+    print("="*60)
+    print("DOVOL BULK TASK IMPORT BENCHMARK")
+    print("="*60)
+    async with AsyncSessionLocal() as db:
+        await create_owner(db, owner_id)
+        try:
+            single = await timed("one by one (POST /tasks/)", lambda: one_by_one(db, owner_id, single_rows), single_rows)
+            report = {}
+            async def run_bulk():
+                report.update(await bulk(db, owner_id, bulk_rows))
+            copied = await timed("NDJSON + COPY (bulk)", run_bulk, bulk_rows)
+            print("="*60)
+            print(f"Bulk report: inserted={report['inserted']} failed={report['failed']}")
+            print(f"Speed-up: {copied / single:.0f}x")
+        finally:
+            await cleanup(db, owner_id)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--single", type=int, default=1000)
+    parser.add_argument("--bulk", type=int, default=20000)
+    args = parser.parse_args()
+    engine.echo = False
+    asyncio.run(main(args.single, args.bulk))
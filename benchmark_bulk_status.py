@@ -0,0 +1,109 @@
+"""
+Bulk Application Review Benchmark for Dovol
+
+This script compares reviewing every applicant of a task with one
+PATCH /applications/{id}/status call per application against a single
+PATCH /applications/bulk-status call. Requests run in-process through
+httpx ASGITransport, so the numbers are app + database time without network.
+
+    python benchmark_bulk_status.py [--applications 500]
+
+Fixture users, the task and its applications are deleted at the end.
+Requires httpx.
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+import httpx
+from sqlalchemy import text
+from app.main import app
+from app.database import AsyncSessionLocal, engine
+from app.models.user import Roles
+from app.auth.jwt_handler import create_token_pair
+from app.auth.dependencies import TokenUser
+
+def volunteer_prefix(task_id):
+    return f"bench-review-{task_id}-"
+
+async def seed(db, ngo_id, task_id, applications):
+    await db.execute(text("""
+        INSERT INTO users (id, full_name, email, password_hash, role, is_active, created_at, updated_at)
+        VALUES (:id, 'Benchmark NGO', :email, 'x', 'ngo', true, now(), now())
+    """), {"id": ngo_id, "email": f"bench-{ngo_id}@example.org"})
+    await db.execute(text("""
+        INSERT INTO volunteer_tasks (id, title, description, posted_by_id, is_active, created_at, updated_at)
+        VALUES (:id, 'Benchmark review task', 'd', :ngo, true, now(), now())
+    """), {"id": task_id, "ngo": ngo_id})
+    await db.execute(text("""
+        INSERT INTO users (id, full_name, email, password_hash, role, is_active, created_at, updated_at)
+        SELECT gen_random_uuid(), 'Benchmark volunteer', :prefix || g || '@example.org',
+               'x', 'volunteer', true, now(), now()
+        FROM generate_series(1, :n) AS g
+    """), {"n": applications, "prefix": volunteer_prefix(task_id)})
+    result = await db.execute(text("""
+        INSERT INTO applications (id, task_id, volunteer_id, status, applied_at)
+        SELECT gen_random_uuid(), :task, id, 'pending', now()
+        FROM users WHERE email LIKE :prefix || '%'
+        RETURNING id
+    """), {"task": task_id, "prefix": volunteer_prefix(task_id)})
+    ids = [str(row[0]) for row in result]
+    await db.commit()
+    return ids
+
+async def cleanup(db, ngo_id, task_id):
+    await db.execute(text("DELETE FROM applications WHERE task_id = :task"), {"task": task_id})
+    await db.execute(text("DELETE FROM volunteer_tasks WHERE id = :task"), {"task": task_id})
+    await db.execute(
+        text("DELETE FROM users WHERE id = :id OR email LIKE :prefix || '%'"),
+        {"id": ngo_id, "prefix": volunteer_prefix(task_id)},
+    )
+    await db.commit()
+
+async def main(applications):
+    ngo_id, task_id = uuid.uuid4(), uuid.uuid4()
+    headers = {"Authorization": "Bearer " + create_token_pair(TokenUser(id=ngo_id, role=Roles.ngo, is_active=True))["access_token"]}
+    async with AsyncSessionLocal() as db:
+        ids = await seed(db, ngo_id, task_id, applications)
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+            print("="*60)
+            print(f"DOVOL BULK APPLICATION REVIEW BENCHMARK ({len(ids)} applications)")
+            print("="*60)
+
+            started = time.perf_counter()
+            for application_id in ids:
+                response = await client.patch(f"/applications/{application_id}/status", params={"status": "accepted"}, headers=headers)
+                assert response.status_code == 200, response.text
+            single = time.perf_counter() - started
+            print(f"{'N single PATCH calls':<28} {single * 1000:>10.1f} ms  ({len(ids)} requests)")
+
+            started = time.perf_counter()
+            response = await client.patch(
+                "/applications/bulk-status", json={"status": "rejected", "application_ids": ids}, headers=headers
+            )
+            bulk = time.perf_counter() - started
+            assert response.status_code == 200 and response.json()["updated"] == len(ids), response.text
+            print(f"{'one bulk-status call (ids)':<28} {bulk * 1000:>10.1f} ms  (1 request)")
+
+            started = time.perf_counter()
+            response = await client.patch(
+                "/applications/bulk-status", json={"status": "accepted", "task_id": str(task_id)}, headers=headers
+            )
+            by_task = time.perf_counter() - started
+            assert response.status_code == 200 and response.json()["updated"] == len(ids), response.text
+            print(f"{'one bulk-status call (task)':<28} {by_task * 1000:>10.1f} ms  (1 request)")
+            print("="*60)
+            print(f"Speed-up: {single / bulk:.0f}x")
+    finally:
+        async with AsyncSessionLocal() as db:
+            await cleanup(db, ngo_id, task_id)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--applications", type=int, default=500)
+    args = parser.parse_args()
+    engine.echo = False
+    asyncio.run(main(args.applications))
@@ -0,0 +1,202 @@
+"""
+Dashboard Statistics Benchmark for Dovol
+
+This script seeds users, tasks and applications and compares three ways of
+answering GET /admin/dashboard/stats: the ten separate COUNT(*) queries it
+used to run, the single COUNT(*) FILTER recount the counter reconciliation
+runs, and the platform_counters read it runs now, checking all three return
+the same numbers. It then changes application statuses from many concurrent
+sessions, checks that the counters kept up (no drift), and sends a burst of
+concurrent dashboard requests at an expired snapshot, reporting how many
+counter reads actually ran.
+
+    python benchmark_dashboard_stats.py [--users 20000] [--tasks 5000] [--applications 100000]
+                                        [--writers 20] [--writes 50] [--burst 200]
+
+Seeded rows are deleted at the end.
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+import uuid
+from sqlalchemy import func, text
+from sqlalchemy.future import select
+from app.database import AsyncSessionLocal, engine
+from app.models.user import User, Roles
+from app.models.volunteer_task import VolunteerTask
+from app.models.applications import Application, ApplicationStatus
+from app.services.platform_counters import read_counters, recount_query, reconcile_counters
+from app.services.cache import SnapshotCache
+
+async def seed(db, ngo_id, users, tasks, applications):
+    prefix = f"bench-dashboard-{ngo_id}-"
+    await db.execute(text("""
+        INSERT INTO users (id, full_name, email, password_hash, role, is_active, created_at, updated_at)
+        SELECT CASE WHEN g = 1 THEN CAST(:ngo AS uuid) ELSE gen_random_uuid() END, 'Benchmark user',
+               :prefix || g || '@example.org', 'x',
+               CAST(CASE WHEN g = 1 OR g % 20 = 0 THEN 'ngo' WHEN g % 500 = 0 THEN 'admin' ELSE 'volunteer' END AS roles),
+               true, now(), now()
+        FROM generate_series(1, :n) AS g
+    """), {"ngo": ngo_id, "prefix": prefix, "n": users})
+    await db.execute(text("""
+        INSERT INTO volunteer_tasks (id, title, description, posted_by_id, is_active, created_at, updated_at)
+        SELECT gen_random_uuid(), 'Dashboard task ' || g, 'd', :ngo, g % 4 <> 0, now(), now()
+        FROM generate_series(1, :n) AS g
+    """), {"ngo": ngo_id, "n": tasks})
+    volunteer_ids = (await db.execute(
+        text("SELECT id FROM users WHERE email LIKE :prefix || '%' AND role = 'volunteer'"), {"prefix": prefix}
+    )).scalars().all()
+    task_ids = (await db.execute(
+        text("SELECT id FROM volunteer_tasks WHERE posted_by_id = :ngo"), {"ngo": ngo_id}
+    )).scalars().all()
+    # Task g % tasks with volunteer g / tasks keeps every (task_id, volunteer_id) pair unique
+    await db.execute(text("""
+        INSERT INTO applications (id, task_id, volunteer_id, status, applied_at)
+        SELECT gen_random_uuid(),
+               (CAST(:tasks AS uuid[]))[1 + g % :n_tasks],
+               (CAST(:volunteers AS uuid[]))[1 + (g / :n_tasks) % :n_volunteers],
+               CAST(CASE g % 3 WHEN 0 THEN 'pending' WHEN 1 THEN 'accepted' ELSE 'rejected' END AS application_status),
+               now()
+        FROM generate_series(0, :n - 1) AS g
+    """), {
+        "tasks": list(task_ids), "n_tasks": len(task_ids),
+        "volunteers": list(volunteer_ids), "n_volunteers": len(volunteer_ids), "n": applications,
+    })
+    await db.commit()
+    await db.execute(text("ANALYZE users, volunteer_tasks, applications"))
+
+async def cleanup(db, ngo_id):
+    prefix = f"bench-dashboard-{ngo_id}-"
+    await db.execute(text("""
+        DELETE FROM applications WHERE task_id IN (SELECT id FROM volunteer_tasks WHERE posted_by_id = :ngo)
+    """), {"ngo": ngo_id})
+    await db.execute(text("DELETE FROM volunteer_tasks WHERE posted_by_id = :ngo"), {"ngo": ngo_id})
+    await db.execute(text("DELETE FROM users WHERE email LIKE :prefix || '%'"), {"prefix": prefix})
+    await db.commit()
+
+async def ten_queries(db) -> dict:
+    """The previous get_dashboard_stats body"""
+    async def count(column, *criteria):
+        return (await db.execute(select(func.count(column)).where(*criteria))).scalar()
+    return {
+        "total_users": await count(User.id),
+        "total_volunteers": await count(User.id, User.role == Roles.volunteer),
+        "total_ngos": await count(User.id, User.role == Roles.ngo),
+        "total_admins": await count(User.id, User.role == Roles.admin),
+        "total_tasks": await count(VolunteerTask.id),
+        "active_tasks": await count(VolunteerTask.id, VolunteerTask.is_active == True),
+        "total_applications": await count(Application.id),
+        "pending_applications": await count(Application.id, Application.status == ApplicationStatus.pending),
+        "accepted_applications": await count(Application.id, Application.status == ApplicationStatus.accepted),
+        "rejected_applications": await count(Application.id, Application.status == ApplicationStatus.rejected),
+    }
+
+async def one_statement(db) -> dict:
+    return (await db.execute(recount_query())).one()._asdict()
+
+async def drifted():
+    async with AsyncSessionLocal() as db:
+        return (await reconcile_counters(db))["drifted"]
+
+async def concurrent_writes(ngo_id, writers, writes):
+    """`writers` sessions each committing `writes` single-row status changes"""
+    async with AsyncSessionLocal() as db:
+        ids = (await db.execute(text("""
+            SELECT a.id FROM applications a JOIN volunteer_tasks t ON t.id = a.task_id
+            WHERE t.posted_by_id = :ngo LIMIT :n
+        """), {"ngo": ngo_id, "n": writers * writes})).scalars().all()
+    statuses = [status.value for status in ApplicationStatus]
+
+    async def writer(chunk, rng):
+        async with AsyncSessionLocal() as db:
+            for application_id in chunk:
+                await db.execute(
+                    text("UPDATE applications SET status = CAST(:status AS application_status) WHERE id = :id"),
+                    {"id": application_id, "status": rng.choice(statuses)},
+                )
+                await db.commit()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(writer(ids[i::writers], random.Random(i)) for i in range(writers)))
+    return len(ids), (time.perf_counter() - started) * 1000
+
+async def time_strategy(load, repeats):
+    timings = []
+    async with AsyncSessionLocal() as db:
+        counts = await load(db)
+        for _ in range(repeats):
+            started = time.perf_counter()
+            await load(db)
+            timings.append((time.perf_counter() - started) * 1000)
+    return counts, timings
+
+async def burst(size):
+    """`size` concurrent dashboard reads of one expired snapshot, each with its own session"""
+    snapshot = SnapshotCache(ttl_seconds=60)
+    reads = 0
+
+    async def request():
+        async with AsyncSessionLocal() as db:
+            async def load():
+                nonlocal reads
+                reads += 1
+                return await read_counters(db)
+            await snapshot.get(load)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(request() for _ in range(size)))
+    return reads, (time.perf_counter() - started) * 1000, snapshot.stats()
+
+async def main(users, tasks, applications, writers, writes, burst_size, repeats=10):
+    ngo_id = uuid.uuid4()
+    async with AsyncSessionLocal() as db:
+        await seed(db, ngo_id, users, tasks, applications)
+    try:
+        print("="*60)
+        print("DOVOL DASHBOARD STATISTICS BENCHMARK")
+        print(f"{users} seeded users, {tasks} tasks, {applications} applications")
+        print("="*60)
+        expected, old = await time_strategy(ten_queries, repeats)
+        recounted, recount = await time_strategy(one_statement, repeats)
+        counted, counters = await time_strategy(read_counters, repeats)
+        same = recounted == expected and counted == expected
+        print(f"{'10 COUNT(*) queries':<26} median {statistics.median(old):>8.2f} ms")
+        for label, timings in (("1 COUNT(*) FILTER query", recount), ("platform_counters read", counters)):
+            print(f"{label:<26} median {statistics.median(timings):>8.2f} ms"
+                  f"  ({statistics.median(old) / statistics.median(timings):.1f}x)")
+        print(f"{'same counts':<26} {'yes' if same else 'NO'}")
+        seed_drift = await drifted()
+        changed, elapsed = await concurrent_writes(ngo_id, writers, writes)
+        write_drift = await drifted()
+        print(f"{'concurrent status changes':<26} {changed} by {writers} sessions, {elapsed:.1f} ms, "
+              f"{changed / elapsed * 1000:.0f}/s")
+        print(f"{'drifted counters':<26} {seed_drift} after seeding, {write_drift} after the writes")
+        reads, elapsed, stats = await burst(burst_size)
+        print(f"{'burst of ' + str(burst_size) + ' requests':<26} {reads} counter read(s), "
+              f"{stats['coalesced']} waited for it, {elapsed:.1f} ms")
+    finally:
+        async with AsyncSessionLocal() as db:
+            await cleanup(db, ngo_id)
+    cleanup_drift = await drifted()
+    print(f"{'drifted after cleanup':<26} {cleanup_drift}")
+    print("="*60)
+    ok = same and reads == 1 and seed_drift == write_drift == cleanup_drift == 0
+    print("Counters consistent" if ok else "Counter check failed")
+    return ok
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=20000)
+    parser.add_argument("--tasks", type=int, default=5000)
+    parser.add_argument("--applications", type=int, default=100000)
+    parser.add_argument("--writers", type=int, default=20)
+    parser.add_argument("--writes", type=int, default=50)
+    parser.add_argument("--burst", type=int, default=200)
+    args = parser.parse_args()
+    engine.echo = False
+    raise SystemExit(0 if asyncio.run(
+        main(args.users, args.tasks, args.applications, args.writers, args.writes, args.burst)
+    ) else 1)
@@ -0,0 +1,45 @@
+"""
+JWT Decode Benchmark for Dovol
+
+This script compares the throughput of a full python-jose decode with the
+verified-token cache used by get_current_user.
+Run it from the project root (it reads SECRET_KEY etc. from your .env).
+"""
+
+import time
+from app.auth.jwt_handler import (
+    create_access_token,
+    decode_access_token,
+    decode_access_token_uncached,
+    verified_token_cache,
+)
+
+ITERATIONS = 50000
+
+def run(label, decode, token, iterations=ITERATIONS):
+    started = time.perf_counter()
+    for _ in range(iterations):
+        decode(token)
+    elapsed = time.perf_counter() - started
+    per_call_us = elapsed / iterations * 1_000_000
+    print(f"{label:<12} {iterations / elapsed:>14,.0f} decodes/s   {per_call_us:>8.2f} µs/decode")
+    return elapsed
+
+def main():
+    print("="*60)
+    print("DOVOL JWT DECODE BENCHMARK")
+    print("="*60)
+
+    token = create_access_token({"sub": "00000000-0000-0000-0000-000000000001"})
+    verified_token_cache.clear()
+
+    uncached = run("uncached", decode_access_token_uncached, token)
+    decode_access_token(token)  # warm the cache
+    cached = run("cached", decode_access_token, token)
+
+    print("="*60)
+    print(f"Speed-up: {uncached / cached:.1f}x")
+    print(f"Cache stats: {verified_token_cache.stats()}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Application Notification Fan-out Benchmark for Dovol
+
+This script starts the per-worker notification listener (one LISTEN
+connection), registers thousands of in-process subscriptions spread over a
+set of task topics, sends application events with pg_notify from a normal
+pooled connection and measures how long they take to reach every queue.
+Subscribers drain their queues concurrently, except one that never reads and
+must end up with a bounded queue holding a resync event instead of an
+unbounded backlog.
+
+    python benchmark_notifications.py [--subscribers 5000] [--tasks 100] [--events 2000]
+
+Nothing is written to the database.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from sqlalchemy import func
+from sqlalchemy.future import select
+from app.config import settings
+from app.database import AsyncSessionLocal, engine
+from app.services.notifications import APPLICATION_CHANNEL, RESYNC_EVENT, notification_hub, task_topic
+
+async def drain(subscription, counts, index):
+    while True:
+        await subscription.queue.get()
+        counts[index] += 1
+
+async def main(subscribers, tasks, events):
+    task_ids = [uuid.uuid4() for _ in range(tasks)]
+    notification_hub.start()
+    while not notification_hub.connected:
+        await asyncio.sleep(0.05)
+
+    subscriptions = [notification_hub.subscribe([task_topic(task_ids[i % tasks])]) for i in range(subscribers)]
+    # Watches every task and never reads: must overflow into a single resync
+    stalled = notification_hub.subscribe([task_topic(task_id) for task_id in task_ids])
+    counts = [0] * subscribers
+    drainers = [asyncio.create_task(drain(sub, counts, i)) for i, sub in enumerate(subscriptions)]
+    per_task = [len(range(k, subscribers, tasks)) for k in range(tasks)]
+    expected = sum(per_task[i % tasks] for i in range(events))
+
+    print("="*60)
+    print("DOVOL NOTIFICATION FAN-OUT BENCHMARK")
+    print(f"{subscribers} subscribers on {tasks} tasks, {events} events, queue size {settings.notification_queue_size}")
+    print("="*60)
+    started = time.perf_counter()
+    async with AsyncSessionLocal() as db:
+        # One transaction: PostgreSQL delivers all notifications on commit
+        for i in range(events):
+            payload = {
+                "type": "application.created",
+                "application_id": str(uuid.uuid4()),
+                "task_id": str(task_ids[i % tasks]),
+                "volunteer_id": str(uuid.uuid4()),
+                "status": "pending",
+            }
+            await db.execute(select(func.pg_notify(APPLICATION_CHANNEL, json.dumps(payload))))
+        await db.commit()
+    committed = time.perf_counter()
+    while sum(counts) < expected and time.perf_counter() - committed < 30:
+        await asyncio.sleep(0.005)
+    delivered_at = time.perf_counter()
+
+    for drainer in drainers:
+        drainer.cancel()
+    await notification_hub.stop()
+
+    delivered = sum(counts)
+    stalled_events = [stalled.queue.get_nowait() for _ in range(stalled.queue.qsize())]
+    print(f"{'send (one transaction)':<32} {(committed - started) * 1000:>10.1f} ms")
+    print(f"{'commit -> all queues':<32} {(delivered_at - committed) * 1000:>10.1f} ms")
+    print(f"{'deliveries':<32} {delivered:>10,} of {expected:,}")
+    print(f"{'deliveries/s':<32} {delivered / (delivered_at - committed):>10,.0f}")
+    print(f"{'stalled subscriber queue':<32} {len(stalled_events):>10} event(s), dropped {stalled.dropped}")
+    print("="*60)
+    # A bounded backlog that starts with (or contains) a resync marker
+    ok = delivered == expected and RESYNC_EVENT in stalled_events \
+        and len(stalled_events) <= settings.notification_queue_size
+    print("Fan-out complete" if ok else "Fan-out incomplete")
+    return ok
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--subscribers", type=int, default=5000)
+    parser.add_argument("--tasks", type=int, default=100)
+    parser.add_argument("--events", type=int, default=2000)
+    args = parser.parse_args()
+    engine.echo = False
+    raise SystemExit(0 if asyncio.run(main(args.subscribers, args.tasks, args.events)) else 1)
@@ -0,0 +1,88 @@
+"""
+Task Recommendation Benchmark for Dovol
+
+This script builds the in-memory skill index behind GET /tasks/recommended
+from synthetic tasks and compares its ranking time with a plain Python scan
+over the same tasks. No database is needed.
+Run it from the project root (settings are read from your .env).
+"""
+
+import random
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from app.services.recommendations import TaskSkillIndex
+from app.services.skill_catalog import skill_key
+
+TASKS = 100_000
+SKILLS = 500
+VOLUNTEER_SKILLS = 5
+QUERIES = 200
+LIMIT = 20
+
+def make_tasks():
+    rng = random.Random(42)
+    now = datetime.now(timezone.utc)
+    locations = ["Pune", "Mumbai", "Goa", "Delhi", None]
+    return [
+        (
+            uuid.uuid4(),
+            [f"Skill {rng.randrange(SKILLS)}" for _ in range(rng.randint(1, 5))],
+            rng.choice(locations),
+            now - timedelta(minutes=rng.randrange(60 * 24 * 90)),
+        )
+        for _ in range(TASKS)
+    ]
+
+def python_rank(tasks, skills, limit):
+    """Baseline: count overlaps task by task"""
+    wanted = {skill_key(name) for name in skills}
+    scored = []
+    for task_id, task_skills, _, created_at in tasks:
+        matched = len(wanted & {skill_key(name) for name in task_skills})
+        if matched:
+            scored.append((matched, created_at, task_id))
+    scored.sort(reverse=True)
+    return scored[:limit]
+
+def timed(label, fn, queries):
+    started = time.perf_counter()
+    for skills in queries:
+        fn(skills)
+    elapsed = time.perf_counter() - started
+    print(f"{label:<28} {elapsed / len(queries) * 1000:>9.2f} ms/ranking")
+    return elapsed
+
+def main():
+    print("="*60)
+    print("DOVOL TASK RECOMMENDATION BENCHMARK")
+    print("="*60)
+
+    tasks = make_tasks()
+    rng = random.Random(7)
+    queries = [[f"Skill {rng.randrange(SKILLS)}" for _ in range(VOLUNTEER_SKILLS)] for _ in range(QUERIES)]
+
+    index = TaskSkillIndex(refresh_seconds=300)
+    started = time.perf_counter()
+    index.load(tasks)
+    print(f"Index build ({TASKS:,} tasks):  {(time.perf_counter() - started) * 1000:.0f} ms  {index.stats()}")
+    print("-"*60)
+
+    baseline = timed("python scan", lambda skills: python_rank(tasks, skills, LIMIT), queries[:20]) / 20
+    bitsets = timed("bitset index", lambda skills: index.rank(skills, LIMIT), queries) / QUERIES
+    timed(
+        "bitset index + weights",
+        lambda skills: index.rank(skills, LIMIT, location="Pune", recency_weight=1.0, location_weight=0.5),
+        queries,
+    )
+
+    started = time.perf_counter()
+    for task_id, skills, location, created_at in tasks[:1000]:
+        index.upsert(task_id, True, skills[::-1], location, created_at)
+    print(f"{'incremental update':<28} {(time.perf_counter() - started) * 1000:>9.4f} ms/1000 tasks")
+
+    print("="*60)
+    print(f"Speed-up over python scan: {baseline / bitsets:.0f}x")
+
+if __name__ == "__main__":
+    main()
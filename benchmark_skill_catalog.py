@@ -0,0 +1,151 @@
+"""
+Skill Catalog Autocomplete Benchmark for Dovol
+
+This script fills the skills table with a few thousand generated names,
+loads the per-worker SkillCatalog behind GET /skills/catalog from it and
+measures suggestion latency for typed prefixes (1-8 characters, some with a
+typo), first with the suggestion cache cleared before every lookup and then
+with every prefix already memoized. For
+comparison it runs the same prefix searches as a query on the skills
+table (key(name) LIKE 'prefix%' ORDER BY volunteers LIMIT 10).
+
+    python benchmark_skill_catalog.py [--skills 5000] [--queries 2000]
+
+Only the generated skills are deleted at the end.
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from sqlalchemy import func, text
+from sqlalchemy.future import select
+from app.database import AsyncSessionLocal, engine
+from app.models.user import User  # noqa: F401 - registers the table volunteer_skills refers to
+from app.models.skill import Skill, VolunteerSkill
+from app.services.skill_catalog import SkillCatalog, skill_key, skill_key_sql
+
+FIELDS = [
+    "Community", "Youth", "Elder", "Animal", "Disaster", "Food", "Medical", "Digital", "Legal", "Mental Health",
+    "Environmental", "Sports", "Music", "Language", "Financial", "Housing", "Literacy", "Refugee", "Event", "Arts",
+]
+ACTIVITIES = [
+    "Care", "Support", "Teaching", "Outreach", "Logistics", "Design", "Coaching", "Counselling", "Fundraising",
+    "Translation", "Photography", "Research", "Cooking", "Driving", "First Aid", "Mentoring", "Planning",
+    "Administration", "Marketing", "Development", "Writing", "Cleanup", "Repair", "Tutoring", "Advocacy",
+]
+
+def generated_names(count):
+    names = [f"{field} {activity}" for field in FIELDS for activity in ACTIVITIES]
+    level = 2
+    while len(names) < count:
+        names.extend(f"{field} {activity} Level {level}" for field in FIELDS for activity in ACTIVITIES)
+        level += 1
+    return names[:count]
+
+def typed_prefixes(names, count, rng):
+    """What users type: 1-8 leading characters of a name or of a later word, every fifth with a typo"""
+    prefixes = []
+    for i in range(count):
+        words = rng.choice(names).lower().split()
+        word_start = " ".join(words[rng.randrange(len(words)):])
+        prefix = word_start[:rng.randint(1, 8)]
+        if i % 5 == 0 and len(prefix) >= 5:
+            j = rng.randrange(1, len(prefix) - 1)
+            prefix = prefix[:j] + prefix[j + 1] + prefix[j] + prefix[j + 2:]
+        prefixes.append(prefix)
+    return prefixes
+
+def percentiles(samples):
+    samples = sorted(samples)
+    return (statistics.median(samples), samples[int(len(samples) * 0.99)], samples[-1])
+
+def report(label, samples):
+    p50, p99, worst = percentiles(samples)
+    print(f"{label:<34} p50 {p50 * 1000:>8.1f} µs  p99 {p99 * 1000:>8.1f} µs  max {worst * 1000:>8.1f} µs")
+
+async def seed(db, names):
+    result = await db.execute(text("""
+        INSERT INTO skills (id, name, created_at)
+        SELECT gen_random_uuid(), name, now() FROM unnest(CAST(:names AS varchar[])) AS name
+        ON CONFLICT (name) DO NOTHING
+        RETURNING id
+    """), {"names": names})
+    ids = [row[0] for row in result]
+    await db.commit()
+    return ids
+
+async def sql_suggest(db, prefix, limit=10):
+    key = skill_key_sql(Skill.name)
+    volunteers = (
+        select(func.count(VolunteerSkill.id)).where(VolunteerSkill.skill_id == Skill.id).scalar_subquery()
+    )
+    result = await db.execute(
+        select(Skill.name)
+        .where(key.like(skill_key(prefix) + "%"))
+        .order_by(volunteers.desc(), func.length(Skill.name), Skill.name)
+        .limit(limit)
+    )
+    return result.scalars().all()
+
+async def main(skills, queries):
+    rng = random.Random(7)
+    names = generated_names(skills)
+    prefixes = typed_prefixes(names, queries, rng)
+    async with AsyncSessionLocal() as db:
+        seeded = await seed(db, names)
+    catalog = SkillCatalog(refresh_seconds=300)
+    try:
+        started = time.perf_counter()
+        await catalog.refresh()
+        load_seconds = time.perf_counter() - started
+
+        print("="*60)
+        print("DOVOL SKILL CATALOG AUTOCOMPLETE BENCHMARK")
+        print(f"{catalog.stats()['skills']} skills, {catalog.stats()['index_entries']} index entries, "
+              f"{queries} prefixes, catalog load {load_seconds * 1000:.1f} ms")
+        print("="*60)
+
+        cold = []
+        for prefix in prefixes:
+            catalog._suggestions.clear()  # a prefix nobody has typed since the last change
+            started = time.perf_counter_ns()
+            catalog.suggest(prefix)
+            cold.append((time.perf_counter_ns() - started) / 1e6)
+        for prefix in prefixes:
+            catalog.suggest(prefix)
+        warm = []
+        for prefix in prefixes:
+            started = time.perf_counter_ns()
+            catalog.suggest(prefix)
+            warm.append((time.perf_counter_ns() - started) / 1e6)
+
+        sql = []
+        async with AsyncSessionLocal() as db:
+            for prefix in prefixes[: min(queries, 500)]:
+                started = time.perf_counter_ns()
+                await sql_suggest(db, prefix)
+                sql.append((time.perf_counter_ns() - started) / 1e6)
+
+        report("in-memory, suggestion cache cold", cold)
+        report("in-memory, suggestion cache warm", warm)
+        report("SQL prefix query", sql)
+        answered = sum(1 for prefix in prefixes if catalog.suggest(prefix))
+        print(f"{'prefixes with suggestions':<34} {answered} of {queries}")
+    finally:
+        async with AsyncSessionLocal() as db:
+            await db.execute(text("DELETE FROM skills WHERE id = ANY(:ids)"), {"ids": seeded})
+            await db.commit()
+    print("="*60)
+    ok = percentiles(cold)[1] < 1.0
+    print("p99 under 1 ms" if ok else "p99 over 1 ms")
+    return ok
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--skills", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+    engine.echo = False
+    raise SystemExit(0 if asyncio.run(main(args.skills, args.queries)) else 1)
@@ -0,0 +1,138 @@
+"""
+Volunteer Skill Upsert Benchmark for Dovol
+
+This script replaces a volunteer's skill profile the way PUT /skills used to
+(delete every link, commit, then SELECT the skill, maybe INSERT it, SELECT
+the link and INSERT it, name by name) and the way it does now
+(save_volunteer_skills: one upsert of the catalog names, one DELETE and one
+INSERT of the link difference). Every replacement keeps half of the
+previous profile and adds as many brand-new skill names, so both paths have
+to register skills, add links and remove links each time. It reports the
+statements sent per replacement and the latency against profile size.
+
+    python benchmark_skill_upsert.py [--sizes 5,10,30,60] [--repeats 20]
+
+The volunteer and the benchmark skills are deleted at the end.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from sqlalchemy import event, text
+from sqlalchemy.future import select
+from app.database import AsyncSessionLocal, engine
+from app.models.user import User  # noqa: F401 - registers the table volunteer_skills refers to
+from app.models.skill import Skill, VolunteerSkill
+from app.services.skill_catalog import save_volunteer_skills
+
+SKILL_PREFIX = "Benchmark upsert skill"
+
+class StatementCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+async def create_volunteer(db, user_id):
+    await db.execute(text("""
+        INSERT INTO users (id, full_name, email, password_hash, role, is_active, created_at, updated_at)
+        VALUES (:id, 'Benchmark volunteer', :email, 'x', 'volunteer', true, now(), now())
+    """), {"id": user_id, "email": f"bench-{user_id}@example.org"})
+    await db.commit()
+
+async def cleanup(db, user_id):
+    await db.execute(text("DELETE FROM users WHERE id = :id"), {"id": user_id})
+    await db.execute(text("DELETE FROM skills WHERE name LIKE :prefix || '%'"), {"prefix": SKILL_PREFIX})
+    await db.commit()
+
+async def replace_per_name(db, user_id, names):
+    """The previous PUT /skills: wipe, commit, then two or four statements per name"""
+    await db.execute(text("DELETE FROM volunteer_skills WHERE user_id = :id"), {"id": user_id})
+    await db.commit()
+    for skill_name in names:
+        skill = (await db.execute(select(Skill).where(Skill.name == skill_name))).scalars().first()
+        if not skill:
+            skill = Skill(name=skill_name)
+            db.add(skill)
+            await db.flush()
+        link = await db.execute(
+            select(VolunteerSkill).where(VolunteerSkill.user_id == user_id, VolunteerSkill.skill_id == skill.id)
+        )
+        if not link.scalars().first():
+            db.add(VolunteerSkill(user_id=user_id, skill_id=skill.id))
+    await db.commit()
+
+async def replace_set_based(db, user_id, names):
+    await save_volunteer_skills(db, user_id, names, replace=True)
+    await db.commit()
+
+STRATEGIES = [("per-name loop", replace_per_name), ("set-based", replace_set_based)]
+
+def profiles(label, size, repeats):
+    """repeats + 1 profiles, each keeping half of the previous one plus fresh names"""
+    fresh = (f"{SKILL_PREFIX} {label} {i}" for i in range(size * (repeats + 2)))
+    current = [next(fresh) for _ in range(size)]
+    result = [current]
+    for _ in range(repeats):
+        current = current[size // 2:] + [next(fresh) for _ in range(size - len(current[size // 2:]))]
+        result.append(current)
+    return result
+
+async def run(replace, user_id, sequence, counter):
+    latencies, statements = [], []
+    async with AsyncSessionLocal() as db:
+        await replace(db, user_id, sequence[0])
+        for names in sequence[1:]:
+            counter.count = 0
+            started = time.perf_counter()
+            await replace(db, user_id, names)
+            latencies.append((time.perf_counter() - started) * 1000)
+            statements.append(counter.count)
+        linked = set((await db.execute(
+            select(Skill.name).join(VolunteerSkill, VolunteerSkill.skill_id == Skill.id)
+            .where(VolunteerSkill.user_id == user_id)
+        )).scalars())
+    return latencies, statements, linked == set(sequence[-1])
+
+async def main(sizes, repeats):
+    user_id = uuid.uuid4()
+    counter = StatementCounter()
+    ok = True
+    async with AsyncSessionLocal() as db:
+        await create_volunteer(db, user_id)
+    event.listen(engine.sync_engine, "before_cursor_execute", counter)
+    try:
+        print("="*60)
+        print("DOVOL SKILL UPSERT BENCHMARK")
+        print(f"{repeats} profile replacements per size, half the skills new each time")
+        print("="*60)
+        for size in sizes:
+            timings = {}
+            for label, replace in STRATEGIES:
+                sequence = profiles(f"{label} {size}", size, repeats)
+                latencies, statements, correct = await run(replace, user_id, sequence, counter)
+                ok &= correct
+                timings[label] = statistics.median(latencies)
+                print(f"{'✓' if correct else '✗'} {size:>3} skills  {label:<14} "
+                      f"{statistics.mean(statements):>6.1f} statements  "
+                      f"median {timings[label]:>7.2f} ms  max {max(latencies):>7.2f} ms")
+            print(f"  Speed-up: {timings['per-name loop'] / timings['set-based']:.1f}x")
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", counter)
+        async with AsyncSessionLocal() as db:
+            await cleanup(db, user_id)
+    print("="*60)
+    print("Profiles match" if ok else "Profile mismatch")
+    return ok
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="5,10,30,60")
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+    engine.echo = False
+    sizes = [int(size) for size in args.sizes.split(",")]
+    raise SystemExit(0 if asyncio.run(main(sizes, args.repeats)) else 1)
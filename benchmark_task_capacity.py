@@ -0,0 +1,185 @@
+"""
+Task Capacity Contention Benchmark for Dovol
+
+This script fires concurrent "accept" status changes at tasks with a
+max_volunteers limit and compares two ways of enforcing it:
+
+  * conditional UPDATE - the single statement behind
+    PATCH /applications/{id}/status (row locks on the task only);
+  * table lock - LOCK TABLE applications, count accepted rows, then UPDATE,
+    the usual way to make a check-then-write safe without a counter.
+
+Each strategy runs against one hot task and against accepts spread over
+many tasks, and must end with exactly max_volunteers accepted per task and
+accepted_count matching the applications table.
+
+    python benchmark_task_capacity.py [--applications 1000] [--slots 50] [--tasks 20] [--concurrency 20]
+
+Fixture users, tasks and applications are deleted at the end.
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+from collections import Counter
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from app.database import SQLALCHEMY_DATABASE_URL, connect_args, engine
+from app.models.applications import ApplicationStatus
+from app.models.user import User  # noqa: F401 - registers the mappers the statement refers to
+from app.models.volunteer_task import VolunteerTask  # noqa: F401
+from app.services.task_capacity import application_status_statement
+
+def volunteer_prefix(ngo_id, label):
+    return f"bench-capacity-{ngo_id}-{label}-"
+
+async def create_ngo(db, ngo_id):
+    await db.execute(text("""
+        INSERT INTO users (id, full_name, email, password_hash, role, is_active, created_at, updated_at)
+        VALUES (:id, 'Benchmark NGO', :email, 'x', 'ngo', true, now(), now())
+    """), {"id": ngo_id, "email": f"bench-{ngo_id}@example.org"})
+    await db.commit()
+
+async def seed(db, ngo_id, label, applications, slots, tasks):
+    """`tasks` tasks with `slots` slots each; pending applications spread round-robin over them"""
+    result = await db.execute(text("""
+        INSERT INTO volunteer_tasks (id, title, description, posted_by_id, is_active, max_volunteers, created_at, updated_at)
+        SELECT gen_random_uuid(), 'Capacity task ' || g, 'd', :ngo, true, :slots, now(), now()
+        FROM generate_series(1, :tasks) AS g
+        RETURNING id
+    """), {"ngo": ngo_id, "slots": slots, "tasks": tasks})
+    task_ids = [row[0] for row in result]
+    await db.execute(text("""
+        INSERT INTO users (id, full_name, email, password_hash, role, is_active, created_at, updated_at)
+        SELECT gen_random_uuid(), 'Benchmark volunteer', :prefix || g || '@example.org',
+               'x', 'volunteer', true, now(), now()
+        FROM generate_series(1, :n) AS g
+    """), {"n": applications, "prefix": volunteer_prefix(ngo_id, label)})
+    result = await db.execute(text("""
+        INSERT INTO applications (id, task_id, volunteer_id, status, applied_at)
+        SELECT gen_random_uuid(), (CAST(:tasks AS uuid[]))[1 + (row_number() OVER (ORDER BY id)) % :n_tasks], id,
+               'pending', now()
+        FROM users WHERE email LIKE :prefix || '%'
+        RETURNING id
+    """), {"tasks": task_ids, "n_tasks": len(task_ids), "prefix": volunteer_prefix(ngo_id, label)})
+    application_ids = [row[0] for row in result]
+    await db.commit()
+    return task_ids, application_ids
+
+async def reset(db, task_ids):
+    await db.execute(text("UPDATE applications SET status = 'pending' WHERE task_id = ANY(:ids)"), {"ids": task_ids})
+    await db.execute(text("UPDATE volunteer_tasks SET accepted_count = 0 WHERE id = ANY(:ids)"), {"ids": task_ids})
+    await db.commit()
+
+async def cleanup(db, ngo_id):
+    await db.execute(text("""
+        DELETE FROM applications WHERE task_id IN (SELECT id FROM volunteer_tasks WHERE posted_by_id = :id)
+    """), {"id": ngo_id})
+    await db.execute(text("DELETE FROM volunteer_tasks WHERE posted_by_id = :id"), {"id": ngo_id})
+    await db.execute(
+        text("DELETE FROM users WHERE id = :id OR email LIKE :prefix || '%'"),
+        {"id": ngo_id, "prefix": f"bench-capacity-{ngo_id}-"},
+    )
+    await db.commit()
+
+async def accept_conditional(db, application_id, ngo_id) -> bool:
+    result = await db.execute(
+        application_status_statement(ApplicationStatus.accepted, owned=True),
+        {"application_id": application_id, "owner_id": ngo_id},
+    )
+    row = result.one()
+    await db.commit()
+    return row.id is not None
+
+async def accept_table_lock(db, application_id, ngo_id) -> bool:
+    await db.execute(text("LOCK TABLE applications IN SHARE ROW EXCLUSIVE MODE"))
+    row = (await db.execute(text("""
+        SELECT a.task_id, t.max_volunteers,
+               (SELECT count(*) FROM applications WHERE task_id = a.task_id AND status = 'accepted') AS accepted
+        FROM applications a JOIN volunteer_tasks t ON t.id = a.task_id
+        WHERE a.id = :id AND t.posted_by_id = :ngo
+    """), {"id": application_id, "ngo": ngo_id})).one()
+    granted = row.max_volunteers is None or row.accepted < row.max_volunteers
+    if granted:
+        await db.execute(text("UPDATE applications SET status = 'accepted' WHERE id = :id"), {"id": application_id})
+        await db.execute(
+            text("UPDATE volunteer_tasks SET accepted_count = accepted_count + 1 WHERE id = :id"), {"id": row.task_id}
+        )
+    await db.commit()
+    return granted
+
+STRATEGIES = [("conditional UPDATE", accept_conditional), ("table lock", accept_table_lock)]
+
+async def run(sessions, accept, application_ids, ngo_id, concurrency):
+    """concurrency workers, each with its own connection, draining one shared queue"""
+    queue = list(application_ids)
+    outcomes = Counter()
+
+    async def worker():
+        async with sessions() as db:
+            while queue:
+                outcomes[await accept(db, queue.pop(), ngo_id)] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return outcomes, time.perf_counter() - started
+
+async def verify(db, task_ids, expected) -> bool:
+    rows = (await db.execute(text("""
+        SELECT t.accepted_count,
+               (SELECT count(*) FROM applications WHERE task_id = t.id AND status = 'accepted') AS accepted
+        FROM volunteer_tasks t WHERE t.id = ANY(:ids)
+    """), {"ids": task_ids})).all()
+    return all(row.accepted_count == row.accepted == expected for row in rows)
+
+async def main(applications, slots, tasks, concurrency) -> bool:
+    # A dedicated pool so every worker holds its own connection
+    bench_engine = create_async_engine(
+        SQLALCHEMY_DATABASE_URL, pool_size=concurrency, max_overflow=0, connect_args=connect_args
+    )
+    sessions = async_sessionmaker(bench_engine, expire_on_commit=False)
+    ngo_id = uuid.uuid4()
+    ok = True
+    async with sessions() as db:
+        await create_ngo(db, ngo_id)
+        scenarios = [
+            ("1 hot task", *await seed(db, ngo_id, "hot", applications, slots, 1)),
+            (f"{tasks} tasks", *await seed(db, ngo_id, "spread", applications, slots, tasks)),
+        ]
+    try:
+        print("="*60)
+        print("DOVOL TASK CAPACITY CONTENTION BENCHMARK")
+        print(f"{applications} accepts per scenario, {slots} slots per task, {concurrency} connections")
+        print("="*60)
+        for scenario, task_ids, application_ids in scenarios:
+            timings = {}
+            for label, accept in STRATEGIES:
+                async with sessions() as db:
+                    await reset(db, task_ids)
+                outcomes, elapsed = await run(sessions, accept, application_ids, ngo_id, concurrency)
+                async with sessions() as db:
+                    consistent = await verify(db, task_ids, min(slots, len(application_ids) // len(task_ids)))
+                ok &= consistent
+                timings[label] = elapsed
+                print(f"{'✓' if consistent else '✗'} {scenario:<12} {label:<20} {elapsed * 1000:>8.1f} ms "
+                      f"{len(application_ids) / elapsed:>8,.0f} accepts/s  "
+                      f"granted={outcomes[True]} full={outcomes[False]}")
+            print(f"  Speed-up: {timings['table lock'] / timings['conditional UPDATE']:.1f}x")
+    finally:
+        async with sessions() as db:
+            await cleanup(db, ngo_id)
+        await bench_engine.dispose()
+    print("="*60)
+    print("Counters consistent" if ok else "Counter mismatch")
+    return ok
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--applications", type=int, default=1000)
+    parser.add_argument("--slots", type=int, default=50)
+    parser.add_argument("--tasks", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+    engine.echo = False
+    raise SystemExit(0 if asyncio.run(main(args.applications, args.slots, args.tasks, args.concurrency)) else 1)
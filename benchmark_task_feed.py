@@ -0,0 +1,97 @@
+"""
+Task Feed Pagination Benchmark for Dovol
+
+This script seeds a large number of active tasks and compares the latency
+of page 1 and a deep page of GET /tasks using keyset (cursor) pagination,
+with OFFSET pagination shown for reference.
+
+    python benchmark_task_feed.py [--pages 10000] [--page-size 20] [--keep]
+
+Seeded rows belong to a throwaway NGO user and are deleted at the end
+unless --keep is given.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from sqlalchemy import desc, text
+from sqlalchemy.future import select
+from app.database import AsyncSessionLocal, engine
+from app.models.volunteer_task import VolunteerTask
+from app.routers.task import task_feed_query
+
+REPEATS = 20
+
+async def seed(db, owner_id, rows):
+    await db.execute(text("""
+        INSERT INTO users (id, full_name, email, password_hash, role, is_active, created_at, updated_at)
+        VALUES (:id, 'Benchmark NGO', :email, 'x', 'ngo', true, now(), now())
+    """), {"id": owner_id, "email": f"bench-{owner_id}@example.org"})
+    await db.execute(text("""
+        INSERT INTO volunteer_tasks (id, title, description, location, skills_required,
+                                     posted_by_id, is_active, created_at, updated_at)
+        SELECT gen_random_uuid(), 'Benchmark task ' || g, repeat('lorem ipsum ', 40), 'City ' || (g % 50),
+               ARRAY['Skill ' || (g % 30)], :owner, true,
+               now() - (g || ' seconds')::interval, now()
+        FROM generate_series(1, :rows) AS g
+    """), {"owner": owner_id, "rows": rows})
+    await db.commit()
+    await db.execute(text("ANALYZE volunteer_tasks"))
+
+async def cleanup(db, owner_id):
+    await db.execute(text("DELETE FROM volunteer_tasks WHERE posted_by_id = :owner"), {"owner": owner_id})
+    await db.execute(text("DELETE FROM users WHERE id = :owner"), {"owner": owner_id})
+    await db.commit()
+
+async def time_query(db, query):
+    samples = []
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        result = await db.execute(query)
+        result.scalars().all()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+async def main(pages, page_size, keep):
+    owner_id = uuid.uuid4()
+    rows = pages * page_size
+    async with AsyncSessionLocal() as db:
+        print(f"Seeding {rows:,} tasks...")
+        await seed(db, owner_id, rows)
+        try:
+            # Cursor pointing at the last row of page (pages - 1), found once with OFFSET
+            boundary = (await db.execute(
+                select(VolunteerTask.created_at, VolunteerTask.id)
+                .where(VolunteerTask.is_active == True)
+                .order_by(desc(VolunteerTask.created_at), desc(VolunteerTask.id))
+                .offset((pages - 1) * page_size - 1).limit(1)
+            )).one()
+
+            first_page = await time_query(db, task_feed_query(None, page_size))
+            deep_page = await time_query(db, task_feed_query(tuple(boundary), page_size))
+            offset_page = await time_query(
+                db,
+                select(VolunteerTask).where(VolunteerTask.is_active == True)
+                .order_by(desc(VolunteerTask.created_at), desc(VolunteerTask.id))
+                .offset((pages - 1) * page_size).limit(page_size)
+            )
+
+            print("="*60)
+            print(f"{'keyset page 1':<28} {first_page:>8.2f} ms")
+            print(f"{f'keyset page {pages:,}':<28} {deep_page:>8.2f} ms")
+            print(f"{f'OFFSET page {pages:,}':<28} {offset_page:>8.2f} ms")
+            print("="*60)
+        finally:
+            if not keep:
+                await cleanup(db, owner_id)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=10000)
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--keep", action="store_true")
+    args = parser.parse_args()
+    engine.echo = False
+    asyncio.run(main(args.pages, args.page_size, args.keep))
@@ -0,0 +1,110 @@
+"""
+Task Search Benchmark for Dovol
+
+This script seeds a large task table and compares the old admin search
+(title/description ILIKE '%term%') with the full-text search used by
+GET /tasks/search and GET /admin/tasks?search=.
+
+    python benchmark_task_search.py [--rows 1000000] [--keep]
+
+Seeded rows belong to a throwaway NGO user and are deleted at the end
+unless --keep is given. Seeding a million rows takes a few minutes.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from sqlalchemy import desc, or_, text
+from sqlalchemy.future import select
+from app.database import AsyncSessionLocal, engine
+from app.models.user import User  # noqa: F401 - registers the mapper used by VolunteerTask.posted_by
+from app.models.volunteer_task import VolunteerTask
+from app.services.task_search import task_search_query
+
+REPEATS = 10
+TERMS = ["tutoring", "medical camp", "river cleanup", "zzznomatch"]
+
+async def seed(db, owner_id, rows):
+    await db.execute(text("""
+        INSERT INTO users (id, full_name, email, password_hash, role, is_active, created_at, updated_at)
+        VALUES (:id, 'Benchmark NGO', :email, 'x', 'ngo', true, now(), now())
+    """), {"id": owner_id, "email": f"bench-{owner_id}@example.org"})
+    # Mostly filler words, with each real word appearing in a few percent of rows,
+    # so multi-word searches are selective the way real ones are
+    await db.execute(text("""
+        WITH words AS (
+            SELECT ARRAY['community','tutoring','medical','camp','river','cleanup','food','drive',
+                         'elderly','care','library','coding','workshop','animal','shelter','tree',
+                         'planting','blood','donation','school','painting','disaster','relief',
+                         'weekend','children','volunteers','needed','help','local','city'] AS w
+        )
+        INSERT INTO volunteer_tasks (id, title, description, location, skills_required,
+                                     posted_by_id, is_active, created_at, updated_at)
+        SELECT gen_random_uuid(),
+               w[1 + (random() * 29)::int] || ' ' || w[1 + (random() * 29)::int] || ' task ' || g,
+               (SELECT string_agg(
+                    CASE WHEN random() < 0.03 THEN w[1 + (random() * 29)::int]
+                         ELSE 'filler' || (random() * 20000)::int END, ' ' ORDER BY i)
+                FROM generate_series(1, 40 + g % 1) AS i),
+               'City ' || (g % 50), ARRAY['Skill ' || (g % 30)], :owner, true,
+               now() - (g || ' seconds')::interval, now()
+        FROM generate_series(1, :rows) AS g, words
+    """), {"owner": owner_id, "rows": rows})
+    await db.commit()
+    # VACUUM cannot run inside a transaction; it also clears dead rows left by earlier runs
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("VACUUM ANALYZE volunteer_tasks"))
+
+async def cleanup(db, owner_id):
+    await db.execute(text("DELETE FROM volunteer_tasks WHERE posted_by_id = :owner"), {"owner": owner_id})
+    await db.execute(text("DELETE FROM users WHERE id = :owner"), {"owner": owner_id})
+    await db.commit()
+
+def ilike_query(term, limit=50):
+    """The admin search before full-text search"""
+    return (
+        select(VolunteerTask)
+        .where(or_(VolunteerTask.title.ilike(f"%{term}%"), VolunteerTask.description.ilike(f"%{term}%")))
+        .order_by(desc(VolunteerTask.created_at))
+        .limit(limit)
+    )
+
+async def time_query(db, query):
+    samples = []
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        result = await db.execute(query)
+        result.all()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+async def main(rows, keep):
+    owner_id = uuid.uuid4()
+    async with AsyncSessionLocal() as db:
+        print(f"Seeding {rows:,} tasks...")
+        started = time.perf_counter()
+        await seed(db, owner_id, rows)
+        print(f"Seeded in {time.perf_counter() - started:.1f}s")
+        try:
+            print("="*60)
+            print(f"{'term':<16} {'ILIKE (ms)':>12} {'full-text (ms)':>16}")
+            print("="*60)
+            for term in TERMS:
+                ilike_ms = await time_query(db, ilike_query(term))
+                fts_ms = await time_query(db, task_search_query(term, 0, 50, None))
+                print(f"{term:<16} {ilike_ms:>12.2f} {fts_ms:>16.2f}")
+            print("="*60)
+        finally:
+            if not keep:
+                await cleanup(db, owner_id)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--keep", action="store_true")
+    args = parser.parse_args()
+    engine.echo = False
+    asyncio.run(main(args.rows, args.keep))
@@ -0,0 +1,114 @@
+"""
+Apply Concurrency Check for Dovol
+
+This script fires hundreds of simultaneous POST /applications/ requests
+in-process (httpx ASGITransport, no server needed) and verifies that:
+
+  1. one volunteer double-clicking "apply" N times gets exactly one
+     application (one 200, the rest 400 "Already applied");
+  2. N different volunteers applying to the same task at once all succeed.
+
+    python check_apply_concurrency.py [--requests 300]
+
+Fixture users and the task are deleted afterwards. Requires httpx.
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+from collections import Counter
+import httpx
+from sqlalchemy import func, text
+from sqlalchemy.future import select
+from app.main import app
+from app.database import AsyncSessionLocal, engine
+from app.models.user import User, Roles
+from app.models.volunteer_task import VolunteerTask
+from app.models.applications import Application
+from app.auth.jwt_handler import create_token_pair
+
+
+def make_user(role, label):
+    return User(
+        full_name=f"Apply check {label}",
+        email=f"apply-check-{label}-{uuid.uuid4().hex[:8]}@example.org",
+        password_hash="x",
+        role=role,
+        is_active=True,
+    )
+
+
+def auth(user):
+    return {"Authorization": f"Bearer {create_token_pair(user)['access_token']}"}
+
+
+async def count_applications(task_id) -> int:
+    async with AsyncSessionLocal() as db:
+        return await db.scalar(select(func.count()).select_from(Application).where(Application.task_id == task_id))
+
+
+async def fire(client, requests):
+    started = time.perf_counter()
+    responses = await asyncio.gather(*(
+        client.post("/applications/", json={"task_id": str(task_id), "volunteer_id": str(volunteer_id)}, headers=headers)
+        for task_id, volunteer_id, headers in requests
+    ))
+    elapsed = time.perf_counter() - started
+    return Counter(response.status_code for response in responses), elapsed
+
+
+async def main(n) -> bool:
+    ngo = make_user(Roles.ngo, "ngo")
+    volunteers = [make_user(Roles.volunteer, f"volunteer-{i}") for i in range(n)]
+    async with AsyncSessionLocal() as db:
+        db.add_all([ngo, *volunteers])
+        await db.flush()
+        tasks = [
+            VolunteerTask(title=f"Apply check {i}", description="d", posted_by_id=ngo.id) for i in range(2)
+        ]
+        db.add_all(tasks)
+        await db.commit()
+    same_task, shared_task = tasks[0].id, tasks[1].id
+    user_ids = [ngo.id, *(volunteer.id for volunteer in volunteers)]
+
+    ok = True
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://checks", timeout=120) as client:
+            print("="*60)
+            print(f"DOVOL APPLY CONCURRENCY CHECK ({n} simultaneous requests)")
+            print("="*60)
+
+            volunteer = volunteers[0]
+            statuses, elapsed = await fire(client, [(same_task, volunteer.id, auth(volunteer))] * n)
+            stored = await count_applications(same_task)
+            passed = statuses == Counter({200: 1, 400: n - 1}) and stored == 1
+            ok &= passed
+            print(f"{'✓' if passed else '✗'} same volunteer x{n}: {dict(statuses)}, "
+                  f"{stored} stored, {elapsed:.2f} s")
+
+            statuses, elapsed = await fire(client, [(shared_task, v.id, auth(v)) for v in volunteers])
+            stored = await count_applications(shared_task)
+            passed = statuses == Counter({200: n}) and stored == n
+            ok &= passed
+            print(f"{'✓' if passed else '✗'} {n} volunteers, one task: {dict(statuses)}, "
+                  f"{stored} stored, {elapsed:.2f} s")
+    finally:
+        async with AsyncSessionLocal() as db:
+            await db.execute(text("DELETE FROM applications WHERE task_id = ANY(:ids)"), {"ids": [same_task, shared_task]})
+            await db.execute(text("DELETE FROM volunteer_tasks WHERE posted_by_id = :id"), {"id": ngo.id})
+            await db.execute(text("DELETE FROM users WHERE id = ANY(:ids)"), {"ids": user_ids})
+            await db.commit()
+
+    print("="*60)
+    print("All checks passed" if ok else "Check failed")
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=300)
+    args = parser.parse_args()
+    engine.echo = False
+    raise SystemExit(0 if asyncio.run(main(args.requests)) else 1)
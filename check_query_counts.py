@@ -0,0 +1,189 @@
+"""
+Query Count Checks for Dovol
+
+This script calls write endpoints in-process (httpx ASGITransport, no
+server needed) and counts the SQL statements each request sends, failing
+when an endpoint exceeds its budget. It locks in the single-statement
+write paths (UPDATE/INSERT ... RETURNING) and the joined application and
+admin task listings, and checks that a password reset revokes the tokens
+issued before it.
+Run it after `alembic upgrade head`:
+
+    python check_query_counts.py
+
+Fixture users, tasks and applications are created for the run and deleted
+afterwards. Requires httpx (pip install httpx).
+"""
+
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+import httpx
+from sqlalchemy import event, text
+from app.main import app
+from app.database import AsyncSessionLocal, engine
+from app.models.user import User, Roles
+from app.models.volunteer_task import VolunteerTask
+from app.models.applications import Application
+from app.models.password_reset import PasswordResetOTP, OTPType
+from app.auth.jwt_handler import create_token_pair
+
+
+class QueryCounter:
+    """before_cursor_execute listener recording every statement sent to PostgreSQL"""
+
+    def __init__(self):
+        self.statements = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(" ".join(statement.split()))
+
+
+async def create_fixtures(db) -> dict:
+    users = {
+        role: User(
+            full_name=f"Query count {role.value}",
+            email=f"query-count-{role.value}-{uuid.uuid4().hex[:8]}@example.org",
+            password_hash="x",
+            role=role,
+            is_active=True,
+        )
+        for role in (Roles.admin, Roles.ngo, Roles.volunteer)
+    }
+    users["target"] = User(
+        full_name="Query count target",
+        email=f"query-count-target-{uuid.uuid4().hex[:8]}@example.org",
+        password_hash="x",
+        role=Roles.volunteer,
+        is_active=True,
+    )
+    db.add_all(users.values())
+    await db.flush()
+    task = VolunteerTask(title="Query count task", description="d", posted_by_id=users[Roles.ngo].id)
+    db.add(task)
+    await db.flush()
+    application = Application(task_id=task.id, volunteer_id=users[Roles.volunteer].id)
+    db.add(application)
+    # A verified password reset OTP for the volunteer (POST /users/reset-password)
+    db.add(PasswordResetOTP(
+        email=users[Roles.volunteer].email,
+        otp_code="123456",
+        otp_type=OTPType.password_reset,
+        is_verified=True,
+        expires_at=datetime.now(timezone.utc) + timedelta(minutes=10),
+    ))
+    await db.commit()
+    return {
+        "users": users,
+        "task_id": task.id,
+        "application_id": application.id,
+        "tokens": {
+            key: {"Authorization": f"Bearer {create_token_pair(user)['access_token']}"}
+            for key, user in users.items()
+        },
+    }
+
+
+async def delete_fixtures(db, fixtures):
+    user_ids = [user.id for user in fixtures["users"].values()]
+    await db.execute(text("DELETE FROM applications WHERE volunteer_id = ANY(:ids)"), {"ids": user_ids})
+    await db.execute(text("DELETE FROM volunteer_tasks WHERE posted_by_id = ANY(:ids)"), {"ids": user_ids})
+    await db.execute(text("DELETE FROM users WHERE id = ANY(:ids)"), {"ids": user_ids})
+    await db.execute(text("DELETE FROM password_reset_otps WHERE email = ANY(:emails)"),
+                     {"emails": [user.email for user in fixtures["users"].values()]})
+    await db.execute(text("DELETE FROM skills WHERE name LIKE 'Query count skill %'"))
+    await db.commit()
+
+
+def build_checks(f) -> list:
+    """(description, method, path, request kwargs, expected status, max statements)"""
+    task, application, target = f["task_id"], f["application_id"], f["users"]["target"].id
+    admin, ngo, volunteer = f["tokens"][Roles.admin], f["tokens"][Roles.ngo], f["tokens"][Roles.volunteer]
+    return [
+        ("PUT /tasks/{id}", "PUT", f"/tasks/{task}",
+         {"json": {"title": "Renamed", "description": "d"}, "headers": ngo}, 200, 1),
+        ("POST /applications/", "POST", "/applications/",
+         {"json": {"task_id": str(task), "volunteer_id": str(target)}, "headers": f["tokens"]["target"]}, 200, 1),
+        ("GET /applications/me", "GET", "/applications/me",
+         {"params": {"status": "pending"}, "headers": volunteer}, 200, 1),
+        ("GET /applications/task/{id}", "GET", f"/applications/task/{task}",
+         {"params": {"include": "volunteer,skills"}, "headers": ngo}, 200, 1),
+        ("PATCH /applications/{id}/status", "PATCH", f"/applications/{application}/status",
+         {"params": {"status": "accepted"}, "headers": ngo}, 200, 1),
+        ("PATCH /applications/bulk-status", "PATCH", "/applications/bulk-status",
+         {"json": {"status": "pending", "task_id": str(task)}, "headers": ngo}, 200, 1),
+        ("POST /skills/", "POST", "/skills/",
+         {"json": {"skills": ["Query count skill A", "Query count skill B"]}, "headers": volunteer}, 200, 2),
+        ("PUT /skills/", "PUT", "/skills/",
+         {"json": {"skills": ["Query count skill B", "Query count skill C"]}, "headers": volunteer}, 200, 3),
+        ("PATCH /users/me", "PATCH", "/users/me",
+         {"json": {"full_name": "Renamed", "location": "Pune"}, "headers": volunteer}, 200, 1),
+        ("GET /admin/dashboard/stats", "GET", "/admin/dashboard/stats", {"headers": admin}, 200, 1),
+        ("GET /admin/tasks", "GET", "/admin/tasks", {"headers": admin}, 200, 1),
+        ("GET /admin/tasks?sort=applications", "GET", "/admin/tasks",
+         {"params": {"sort": "applications", "is_active": True}, "headers": admin}, 200, 1),
+        ("GET /admin/tasks?search=", "GET", "/admin/tasks",
+         {"params": {"search": "query count"}, "headers": admin}, 200, 1),
+        ("GET /admin/system/health", "GET", "/admin/system/health", {"headers": admin}, 200, 1),
+        ("PATCH /admin/users/{id}/status", "PATCH", f"/admin/users/{target}/status",
+         {"json": {"is_active": True}, "headers": admin}, 200, 1),
+        ("PATCH /admin/users/{id}/role", "PATCH", f"/admin/users/{target}/role",
+         {"json": {"role": "volunteer"}, "headers": admin}, 200, 1),
+        ("PATCH /admin/tasks/{id}/status", "PATCH", f"/admin/tasks/{task}/status",
+         {"json": {"is_active": True}, "headers": admin}, 200, 1),
+        ("PATCH /admin/applications/{id}/status", "PATCH", f"/admin/applications/{application}/status",
+         {"json": {"status": "rejected"}, "headers": admin}, 200, 1),
+        ("DELETE /tasks/{id}", "DELETE", f"/tasks/{task}", {"headers": ngo}, 204, 1),
+        ("DELETE /admin/tasks/{id}", "DELETE", f"/admin/tasks/{task}", {"headers": admin}, 204, 1),
+        ("DELETE /admin/users/{id}", "DELETE", f"/admin/users/{target}", {"headers": admin}, 204, 1),
+        # OTP lookup, password UPDATE ... RETURNING (bumps token_version), OTP flush
+        ("POST /users/reset-password", "POST", "/users/reset-password",
+         {"json": {"email": f["users"][Roles.volunteer].email, "otp": "123456", "new_password": "new-password-1"}},
+         200, 3),
+        # The volunteer's token predates the reset: rejected from the token version cache, no query
+        ("GET /users/me after password reset", "GET", "/users/me", {"headers": volunteer}, 401, 0),
+    ]
+
+
+async def run_checks() -> bool:
+    async with AsyncSessionLocal() as db:
+        fixtures = await create_fixtures(db)
+
+    counter = QueryCounter()
+    failures = 0
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://checks") as client:
+            # Warm the authenticated-user cache like a client that has been active
+            for headers in fixtures["tokens"].values():
+                await client.get("/users/me", headers=headers)
+
+            checks = build_checks(fixtures)
+            event.listen(engine.sync_engine, "before_cursor_execute", counter)
+            try:
+                for description, method, path, kwargs, expected_status, budget in checks:
+                    counter.statements.clear()
+                    response = await client.request(method, path, **kwargs)
+                    used = len(counter.statements)
+                    ok = response.status_code == expected_status and used <= budget
+                    failures += 0 if ok else 1
+                    print(f"{'✓' if ok else '✗'} {description:<40} {used} statement(s), budget {budget}"
+                          f"  [HTTP {response.status_code}]")
+                    if not ok:
+                        for statement in counter.statements:
+                            print(f"      {statement[:110]}")
+            finally:
+                event.remove(engine.sync_engine, "before_cursor_execute", counter)
+    finally:
+        async with AsyncSessionLocal() as db:
+            await delete_fixtures(db, fixtures)
+
+    print("="*60)
+    print(f"{len(checks) - failures}/{len(checks)} checks passed")
+    return failures == 0
+
+
+if __name__ == "__main__":
+    engine.echo = False
+    ok = asyncio.run(run_checks())
+    raise SystemExit(0 if ok else 1)
@@ -0,0 +1,223 @@
+"""
+Query Plan Checks for Dovol
+
+This script runs EXPLAIN on the listing queries that each migration is
+meant to speed up and verifies that PostgreSQL picks the expected index.
+Run it after `alembic upgrade head`:
+
+    python check_query_plans.py
+
+Sequential scans are disabled for the check (SET LOCAL enable_seqscan = off)
+so the result does not depend on how much data the database holds - on a
+tiny table the planner would rightly prefer a seq scan.
+"""
+
+import asyncio
+import json
+import uuid
+from datetime import datetime, timezone
+from sqlalchemy import desc, text
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+from sqlalchemy.future import select
+from app.database import AsyncSessionLocal, engine
+from app.models.user import User
+from app.models.volunteer_task import VolunteerTask
+from app.models.applications import Application
+from app.models.skill import VolunteerSkill
+from app.routers.task import task_feed_query
+from app.routers.application import applicant_listing_query, my_applications_query
+from app.routers.admin import admin_task_listing_query
+from app.services.task_search import search_match
+
+SAMPLE_ID = uuid.UUID("00000000-0000-0000-0000-000000000001")
+
+# Some indexes only win once the table has a realistic value distribution.
+# These statements run inside the check's transaction, which is rolled back.
+SAMPLE_SKILLED_TASKS = [
+    """INSERT INTO users (id, full_name, email, password_hash, role, is_active)
+       VALUES ('00000000-0000-0000-0000-000000000001', 'Plan check', 'plan-check@example.org', 'x', 'ngo', true)""",
+    """INSERT INTO volunteer_tasks (id, title, description, skills_required, posted_by_id, is_active, created_at)
+       SELECT gen_random_uuid(), 'Task ' || g, 'Description', ARRAY['Skill ' || (g % 500), 'Skill ' || (g % 37)],
+              '00000000-0000-0000-0000-000000000001', true, now()
+       FROM generate_series(1, 20000) AS g""",
+    "ANALYZE volunteer_tasks",
+]
+
+SAMPLE_APPLICATIONS = [
+    SAMPLE_SKILLED_TASKS[0],
+    """INSERT INTO volunteer_tasks (id, title, description, posted_by_id, is_active, created_at)
+       SELECT gen_random_uuid(), 'Task ' || g, 'Description', '00000000-0000-0000-0000-000000000001', true, now()
+       FROM generate_series(1, 20) AS g""",
+    """INSERT INTO users (id, full_name, email, password_hash, role, is_active)
+       SELECT gen_random_uuid(), 'Plan check ' || g, 'plan-check-' || g || '@example.org', 'x', 'volunteer', true
+       FROM generate_series(1, 1000) AS g""",
+    """INSERT INTO applications (id, task_id, volunteer_id, status, applied_at)
+       SELECT gen_random_uuid(), t.id, u.id, 'pending', now() - random() * interval '30 days'
+       FROM volunteer_tasks t CROSS JOIN users u
+       WHERE t.posted_by_id = '00000000-0000-0000-0000-000000000001' AND u.email LIKE 'plan-check-%'""",
+    "ANALYZE applications",
+]
+
+# (revision, description, query, indexes that satisfy the check[, sample data statements])
+CHECKS = [
+    (
+        "0002_hot_path_indexes",
+        "admin user listing",
+        select(User).order_by(desc(User.created_at)).limit(50),
+        {"ix_users_created_at"},
+    ),
+    (
+        "0002_hot_path_indexes",
+        "admin task listing filtered by is_active",
+        admin_task_listing_query(limit=50, is_active=True),
+        {"ix_volunteer_tasks_is_active_created_at", "ix_volunteer_tasks_active_feed"},
+        SAMPLE_SKILLED_TASKS,
+    ),
+    (
+        "0002_hot_path_indexes",
+        "application counts per status on the admin task listing",
+        admin_task_listing_query(limit=50, is_active=True),
+        {"ix_applications_task_id_status", "ix_applications_task_id_applied_at"},
+        SAMPLE_APPLICATIONS,
+    ),
+    (
+        "0002_hot_path_indexes",
+        "public task feed, page after a cursor",
+        task_feed_query((datetime(2026, 1, 1, tzinfo=timezone.utc), SAMPLE_ID), 20),
+        {"ix_volunteer_tasks_active_feed"},
+        SAMPLE_SKILLED_TASKS,
+    ),
+    (
+        "0002_hot_path_indexes",
+        "tasks posted by an NGO",
+        select(VolunteerTask).where(VolunteerTask.posted_by_id == SAMPLE_ID)
+        .order_by(desc(VolunteerTask.created_at)),
+        {"ix_volunteer_tasks_posted_by_id_created_at"},
+    ),
+    (
+        "0002_hot_path_indexes",
+        "admin application listing",
+        select(Application).order_by(desc(Application.applied_at)).limit(50),
+        {"ix_applications_applied_at"},
+    ),
+    (
+        "0002_hot_path_indexes",
+        "applications for a task",
+        select(Application).where(Application.task_id == SAMPLE_ID),
+        {"uq_applications_task_volunteer", "ix_applications_task_id_status", "ix_applications_task_id_applied_at"},
+        SAMPLE_APPLICATIONS,
+    ),
+    (
+        "0002_hot_path_indexes",
+        "applications of a volunteer",
+        select(Application).where(Application.volunteer_id == SAMPLE_ID)
+        .order_by(desc(Application.applied_at)),
+        {"ix_applications_volunteer_id_applied_at"},
+        SAMPLE_APPLICATIONS,
+    ),
+    (
+        "0008_my_applications_keyset",
+        "a volunteer's applications with task summaries, page after a cursor",
+        my_applications_query(SAMPLE_ID, (datetime(2026, 1, 1, tzinfo=timezone.utc), SAMPLE_ID), 20),
+        {"ix_applications_volunteer_id_applied_at"},
+        SAMPLE_APPLICATIONS,
+    ),
+    (
+        "0002_hot_path_indexes",
+        "skills of a volunteer",
+        select(VolunteerSkill).where(VolunteerSkill.user_id == SAMPLE_ID),
+        {"uq_volunteer_skills_user_skill"},
+    ),
+    (
+        "0002_hot_path_indexes",
+        "volunteers with a skill",
+        select(VolunteerSkill).where(VolunteerSkill.skill_id == SAMPLE_ID),
+        {"ix_volunteer_skills_skill_id"},
+    ),
+    (
+        "0003_task_search",
+        "full-text task search",
+        select(VolunteerTask.id).where(search_match("river cleanup")),
+        {"ix_volunteer_tasks_search_vector"},
+    ),
+    (
+        "0004_task_skill_filter",
+        "active tasks requiring any of several skills",
+        select(VolunteerTask.id).where(
+            VolunteerTask.is_active == True,
+            VolunteerTask.skills_required.overlap(["First Aid", "Teaching"])
+        ),
+        {"ix_volunteer_tasks_skills_required"},
+        SAMPLE_SKILLED_TASKS,
+    ),
+    (
+        "0004_task_skill_filter",
+        "active tasks requiring all of several skills",
+        select(VolunteerTask.id).where(
+            VolunteerTask.is_active == True,
+            VolunteerTask.skills_required.contains(["First Aid", "Teaching"])
+        ),
+        {"ix_volunteer_tasks_skills_required"},
+        SAMPLE_SKILLED_TASKS,
+    ),
+    (
+        "0006_applicant_listing",
+        "applicants of a task with profiles and skills, page after a cursor",
+        applicant_listing_query(
+            SAMPLE_ID, SAMPLE_ID, (datetime(2026, 1, 1, tzinfo=timezone.utc), SAMPLE_ID), 20,
+            include=frozenset({"volunteer", "skills"}),
+        ),
+        {"ix_applications_task_id_applied_at"},
+        SAMPLE_APPLICATIONS,
+    ),
+]
+
+def collect_indexes(plan: dict, found: set):
+    if "Index Name" in plan:
+        found.add(plan["Index Name"])
+    for child in plan.get("Plans", []):
+        collect_indexes(child, found)
+    return found
+
+class Explain(Executable, ClauseElement):
+    """EXPLAIN wrapper that keeps the statement's bound parameters"""
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+@compiles(Explain, "postgresql")
+def compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+async def explain(db, query) -> dict:
+    await db.execute(text("SET LOCAL enable_seqscan = off"))
+    result = await db.execute(Explain(query))
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]
+
+async def run_checks(checks=CHECKS) -> bool:
+    failures = 0
+    async with AsyncSessionLocal() as db:
+        for revision, description, query, expected, *sample_data in checks:
+            async with db.begin():
+                for statement in (sample_data[0] if sample_data else []):
+                    await db.execute(text(statement))
+                plan = await explain(db, query)
+                await db.rollback()
+            used = collect_indexes(plan, set())
+            ok = bool(used & expected)
+            failures += 0 if ok else 1
+            print(f"{'✓' if ok else '✗'} [{revision}] {description}: "
+                  f"{plan['Node Type']} using {', '.join(sorted(used)) or 'no index'}")
+    print("="*60)
+    print(f"{len(checks) - failures}/{len(checks)} checks passed")
+    return failures == 0
+
+if __name__ == "__main__":
+    engine.echo = False
+    ok = asyncio.run(run_checks())
+    raise SystemExit(0 if ok else 1)
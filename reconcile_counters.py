@@ -0,0 +1,46 @@
+"""
+Platform Counter Reconciliation for Dovol
+
+This script recounts users, tasks and applications from their tables and
+compares the result with the platform_counters the triggers maintain (what
+GET /admin/dashboard/stats and /admin/system/health read). It prints every
+counter's drift and exits with status 1 when any counter has drifted, so it
+can run from cron; with --repair the drifted counters are rewritten from the
+recount instead (writes to the counted tables wait for the rewrite).
+
+    python reconcile_counters.py [--repair]
+
+The same check is available as POST /admin/system/counters/reconcile.
+"""
+
+import argparse
+import asyncio
+from app.database import AsyncSessionLocal, engine
+from app.services.platform_counters import reconcile_counters
+
+async def main(repair):
+    async with AsyncSessionLocal() as db:
+        report = await reconcile_counters(db, repair=repair)
+
+    print("="*60)
+    print("DOVOL PLATFORM COUNTER RECONCILIATION")
+    print("="*60)
+    print(f"{'Counter':<24} {'Counted':>10} {'Actual':>10} {'Drift':>8}")
+    for counter in report["counters"]:
+        print(f"{'✓' if not counter['drift'] else '✗'} {counter['name']:<22} "
+              f"{counter['counted']:>10,} {counter['actual']:>10,} {counter['drift']:>+8,}")
+    print("="*60)
+    if not report["drifted"]:
+        print("No drift")
+    elif report["repaired"]:
+        print(f"{report['drifted']} counter(s) drifted, repaired")
+    else:
+        print(f"{report['drifted']} counter(s) drifted, run with --repair to rewrite them")
+    return not report["drifted"] or report["repaired"]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repair", action="store_true", help="Rewrite drifted counters from the recount")
+    args = parser.parse_args()
+    engine.echo = False
+    raise SystemExit(0 if asyncio.run(main(args.repair)) else 1)